@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Archive Export - Writes a Taskcard board as browsable offline HTML or Markdown
+Kein ReportLab/PyPDF2 nötig: Spalten werden nacheinander direkt in die Datei geschrieben
+"""
+
+import html
+import os
+import shutil
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from attachment_store import card_attachment_files, index_downloaded_files
+
+COPY_BUFFER_SIZE = 1024 * 1024
+# Link targets taken over from the board; anything else (javascript:, data:, file:) is shown as text
+SAFE_SCHEMES = ('http', 'https', 'mailto')
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; max-width: 60em; margin: 2em auto; padding: 0 1em; color: #222; }}
+h1 {{ color: #1a73e8; text-align: center; }}
+h2 {{ color: #34a853; border-bottom: 1px solid #ddd; padding-bottom: .2em; margin-top: 2em; }}
+h3 {{ color: #ea4335; margin-left: .5em; }}
+.card {{ margin-left: 1em; }}
+.meta, .attachment, .caption {{ color: #666; font-size: .9em; }}
+.caption {{ text-align: center; font-style: italic; }}
+img {{ max-width: 100%; max-height: 30em; display: block; margin: .5em auto; }}
+</style>
+</head>
+<body>
+"""
+
+
+def place_asset(source, assets_dir):
+    """Makes source available inside assets_dir and returns its filename
+
+    Files that already live in assets_dir are used as-is. Otherwise a hard
+    link is tried first (no data copied), then a streamed chunked copy.
+    """
+    source = Path(source)
+    assets_dir = Path(assets_dir)
+    if source.parent.resolve() == assets_dir.resolve():
+        return source.name
+
+    target = assets_dir / source.name
+    counter = 1
+    while target.exists():
+        if target.stat().st_size == source.stat().st_size and os.path.samefile(target, source):
+            return target.name
+        target = assets_dir / f"{source.stem}_{counter}{source.suffix}"
+        counter += 1
+
+    try:
+        os.link(source, target)
+    except OSError:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+    return target.name
+
+
+def _place_record(record, assets_dir):
+    """Places a downloaded file record into the archive, None if it is missing"""
+    if record and os.path.exists(record['file_path']):
+        return place_asset(record['file_path'], assets_dir)
+    return None
+
+
+def safe_url(url):
+    """url if it is http(s), mailto or relative, otherwise None"""
+    url = str(url or '').strip()
+    if not url:
+        return None
+    # Browsers ignore control characters and whitespace inside the scheme ("java\tscript:")
+    scheme = urlsplit(''.join(c for c in url if ord(c) > 0x20)).scheme.lower()
+    return url if not scheme or scheme in SAFE_SCHEMES else None
+
+
+class _ArchiveRenderer:
+    """Base renderer: subclasses emit markup, the writer handles files and assets"""
+
+    index_name = None
+
+    def __init__(self, out):
+        self.out = out
+
+    def asset_url(self, filename):
+        return 'assets/' + quote(filename)
+
+
+class _HtmlRenderer(_ArchiveRenderer):
+    index_name = 'index.html'
+
+    @staticmethod
+    def _esc(text):
+        return html.escape(str(text or ''))
+
+    def header(self, board_title, meta_lines, columns):
+        self.out.write(HTML_HEAD.format(title=self._esc(board_title)))
+        self.out.write(f"<h1>{self._esc(board_title)}</h1>\n")
+        for line in meta_lines:
+            self.out.write(f'<p class="meta" style="text-align:center">{self._esc(line)}</p>\n')
+        self.out.write("<h2>Inhaltsverzeichnis</h2>\n<ol>\n")
+        for col_idx, column in enumerate(columns):
+            card_count = len(column.get('cards', []))
+            col_title = column.get('title') or f'Spalte {col_idx + 1}'
+            self.out.write(f'<li><a href="#spalte-{col_idx + 1}">{self._esc(col_title)}</a> '
+                           f'({card_count} Karte{"n" if card_count != 1 else ""})</li>\n')
+        self.out.write("</ol>\n")
+
+    def column(self, col_idx, title):
+        self.out.write(f'<h2 id="spalte-{col_idx + 1}">{col_idx + 1}. {self._esc(title)}</h2>\n')
+
+    def empty_column(self):
+        self.out.write('<p class="meta"><i>Keine Karten vorhanden</i></p>\n')
+
+    def card(self, number, title, description):
+        self.out.write(f'<div class="card">\n<h3>{number} {self._esc(title)}</h3>\n')
+        lines = [line.strip() for line in (description or '').split('\n') if line.strip()]
+        if lines:
+            self.out.write('<p>' + '<br>\n'.join(self._esc(line) for line in lines) + '</p>\n')
+
+    def image(self, filename, alt):
+        self.out.write(f'<img src="{self.asset_url(filename)}" alt="{self._esc(alt)}" loading="lazy">\n')
+        if alt and alt != 'Bild':
+            self.out.write(f'<p class="caption">{self._esc(alt)}</p>\n')
+
+    def _anchor(self, url, text):
+        """Link to url, or just the text if the url is not safe to link"""
+        href = safe_url(url)
+        if href is None:
+            return self._esc(text)
+        return f'<a href="{self._esc(href)}">{self._esc(text)}</a>'
+
+    def missing_image(self, alt, src):
+        self.out.write(f'<p class="meta">🖼 {self._anchor(src, alt)} (nicht heruntergeladen)</p>\n')
+
+    def link(self, text, url):
+        self.out.write(f'<p>🔗 {self._anchor(url, text[:80])}</p>\n')
+
+    def attachment(self, info, filename):
+        if filename:
+            self.out.write(f'<p class="attachment">📎 <a href="{self.asset_url(filename)}">{self._esc(info)}</a></p>\n')
+        else:
+            self.out.write(f'<p class="attachment">📎 {self._esc(info)} (nicht heruntergeladen)</p>\n')
+
+    def end_card(self):
+        self.out.write('</div>\n')
+
+    def section(self, title):
+        self.out.write(f'<h2>{self._esc(title)}</h2>\n')
+
+    def footer(self):
+        self.out.write('</body>\n</html>\n')
+
+
+class _MarkdownRenderer(_ArchiveRenderer):
+    index_name = 'index.md'
+
+    @staticmethod
+    def _esc(text):
+        text = str(text or '')
+        for char in ('\\', '[', ']', '*', '_', '`', '#'):
+            text = text.replace(char, '\\' + char)
+        return text
+
+    @staticmethod
+    def _target(url):
+        """Link destination in angle brackets, so spaces and parentheses don't end it"""
+        for char, encoded in (('\\', '%5C'), ('<', '%3C'), ('>', '%3E'), ('\n', '%0A'), ('\r', '%0D')):
+            url = url.replace(char, encoded)
+        return f"<{url}>"
+
+    def _link(self, url, text):
+        """Markdown link to url, or just the text if the url is not safe to link"""
+        target = safe_url(url)
+        if target is None:
+            return self._esc(text)
+        return f"[{self._esc(text)}]({self._target(target)})"
+
+    def header(self, board_title, meta_lines, columns):
+        self.out.write(f"# {self._esc(board_title)}\n\n")
+        for line in meta_lines:
+            self.out.write(f"_{self._esc(line)}_\n\n")
+        self.out.write("## Inhaltsverzeichnis\n\n")
+        for col_idx, column in enumerate(columns):
+            card_count = len(column.get('cards', []))
+            col_title = column.get('title') or f'Spalte {col_idx + 1}'
+            self.out.write(f"{col_idx + 1}. {self._esc(col_title)} "
+                           f"({card_count} Karte{'n' if card_count != 1 else ''})\n")
+        self.out.write("\n")
+
+    def column(self, col_idx, title):
+        self.out.write(f"## {col_idx + 1}. {self._esc(title)}\n\n")
+
+    def empty_column(self):
+        self.out.write("_Keine Karten vorhanden_\n\n")
+
+    def card(self, number, title, description):
+        self.out.write(f"### {number} {self._esc(title)}\n\n")
+        lines = [line.strip() for line in (description or '').split('\n') if line.strip()]
+        if lines:
+            self.out.write('  \n'.join(self._esc(line) for line in lines) + "\n\n")
+
+    def image(self, filename, alt):
+        self.out.write(f"![{self._esc(alt)}]({self.asset_url(filename)})\n\n")
+
+    def missing_image(self, alt, src):
+        self.out.write(f"🖼 {self._link(src, alt)} (nicht heruntergeladen)\n\n")
+
+    def link(self, text, url):
+        self.out.write(f"- 🔗 {self._link(url, text[:80])}\n")
+
+    def attachment(self, info, filename):
+        if filename:
+            self.out.write(f"- 📎 [{self._esc(info)}]({self.asset_url(filename)})\n")
+        else:
+            self.out.write(f"- 📎 {self._esc(info)} (nicht heruntergeladen)\n")
+
+    def end_card(self):
+        self.out.write("\n")
+
+    def section(self, title):
+        self.out.write(f"## {self._esc(title)}\n\n")
+
+    def footer(self):
+        pass
+
+
+RENDERERS = {
+    'html': _HtmlRenderer,
+    'markdown': _MarkdownRenderer,
+}
+
+
+def export_archive(data, archive_dir, fmt='html', downloaded_files=None, meta_lines=()):
+    """Writes board data as a static HTML or Markdown archive
+
+    Args:
+        data: Extracted board data (board_title, columns, cards)
+        archive_dir: Target directory; receives the index file and assets/
+        fmt: 'html' or 'markdown'
+        downloaded_files: List of downloaded file records (with card/attachment ids)
+        meta_lines: Extra lines shown below the board title
+
+    Each column is written and flushed as soon as its assets are in place,
+    so the whole document never has to be held in memory.
+
+    Returns path of the index file.
+    """
+    renderer_class = RENDERERS[fmt]
+    archive_dir = Path(archive_dir)
+    assets_dir = archive_dir / 'assets'
+    assets_dir.mkdir(parents=True, exist_ok=True)
+
+    files_by_attachment, files_by_card = index_downloaded_files(downloaded_files)
+
+    columns = data.get('columns', [])
+    index_path = archive_dir / renderer_class.index_name
+
+    with open(index_path, 'w', encoding='utf-8') as out:
+        renderer = renderer_class(out)
+        renderer.header(data.get('board_title') or 'Taskcard Board', meta_lines, columns)
+
+        for col_idx, column in enumerate(columns):
+            renderer.column(col_idx, column.get('title') or f'Spalte {col_idx + 1}')
+            cards = column.get('cards', [])
+            if not cards:
+                renderer.empty_column()
+
+            for card_idx, card in enumerate(cards):
+                renderer.card(f"{col_idx + 1}.{card_idx + 1}",
+                              card.get('title') or f'Karte {card_idx + 1}',
+                              card.get('description', ''))
+
+                for img in card.get('images', []):
+                    local_path = img.get('local_path')
+                    if local_path and os.path.exists(local_path):
+                        renderer.image(place_asset(local_path, assets_dir), img.get('alt', 'Bild'))
+                    else:
+                        renderer.missing_image(img.get('alt', 'Bild'), img.get('src', ''))
+
+                for link in card.get('links', []):
+                    renderer.link(link.get('text', ''), link.get('url', ''))
+
+                attachments, unlisted = card_attachment_files(card, files_by_attachment, files_by_card)
+                for attachment, record in attachments:
+                    renderer.attachment(attachment.get('info', ''), _place_record(record, assets_dir))
+
+                # Files downloaded from this card that the extractor did not list
+                for record in unlisted:
+                    renderer.attachment(record.get('info', ''), _place_record(record, assets_dir))
+
+                renderer.end_card()
+
+            # Column done: push it to disk before starting the next one
+            out.flush()
+
+        # Downloads that could not be linked to a card
+        unassigned = [r for r in files_by_card.get(None, []) if r.get('type') != 'image']
+        if unassigned:
+            renderer.section('Weitere Anhänge')
+            for record in unassigned:
+                renderer.attachment(record.get('info', ''), _place_record(record, assets_dir))
+
+        renderer.footer()
+
+    return index_path
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Attachment Routing - Decides per downloaded file how it goes into the PDF
+PDFs werden angehängt, Bilder direkt in der Karte gezeigt, alle anderen Dateien als Dateianhang eingebettet
+"""
+
+import os
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from preflight import merge_path
+
+# Routes (see route())
+MERGE = 'merge'
+INLINE_IMAGE = 'image'
+EMBED = 'embed'
+
+# Detected types ReportLab can draw inline
+IMAGE_KINDS = ('png', 'jpeg', 'gif', 'webp')
+# Detected types that are never put into the PDF (nothing usable was downloaded)
+UNUSABLE_KINDS = ('missing', 'empty', 'html')
+# Larger files are only listed, not embedded (they would bloat the PDF)
+MAX_EMBED_SIZE = 50 * 1024 * 1024
+
+# Link target that marks where a file is to be embedded; the merge turns each
+# such link annotation into a file attachment annotation
+EMBED_SCHEME = 'taskcard-embed:'
+
+
+def route(record):
+    """merge, image, embed or None for a preflighted attachment record
+
+    Card images (type 'image') are rendered by their card and get no route.
+    Damaged or password-protected PDFs can't be merged, but are embedded,
+    so they can still be opened from the PDF.
+    """
+    if record.get('type') == 'image':
+        return None
+    if merge_path(record):
+        return MERGE
+    kind = (record.get('preflight') or {}).get('kind')
+    if kind in IMAGE_KINDS:
+        return INLINE_IMAGE
+    if kind in UNUSABLE_KINDS or not os.path.exists(record['file_path']):
+        return None
+    return EMBED
+
+
+def embed_link(record):
+    """Link target of the placeholder paragraph of an embedded file"""
+    return EMBED_SCHEME + quote(Path(record['file_path']).name)
+
+
+def embed_files(writer, records):
+    """Turns the embed links on the pages of writer into file attachment annotations
+
+    records are all downloaded file records; links are matched by file
+    name. Returns the number of embedded files.
+    """
+    from PyPDF2.generic import (DecodedStreamObject, DictionaryObject, NameObject, NumberObject,
+                                TextStringObject)
+
+    by_name = {Path(record['file_path']).name: record for record in records}
+    embedded = {}
+    count = 0
+    for page in writer.pages:
+        for annotation_ref in page.get('/Annots') or []:
+            annotation = annotation_ref.get_object()
+            action = annotation.get('/A')
+            uri = action.get_object().get('/URI') if action is not None else None
+            if not uri or not str(uri).startswith(EMBED_SCHEME):
+                continue
+            name = unquote(str(uri)[len(EMBED_SCHEME):])
+            record = by_name.get(name)
+            if record is None or not os.path.exists(record['file_path']):
+                # Leave a dead link rather than failing the whole PDF
+                del annotation['/A']
+                continue
+
+            # The same file may be referenced more than once; embed it once
+            filespec_ref = embedded.get(name)
+            if filespec_ref is None:
+                with open(record['file_path'], 'rb') as f:
+                    content = f.read()
+                stream = DecodedStreamObject()
+                stream.set_data(content)
+                stream.update({
+                    NameObject('/Type'): NameObject('/EmbeddedFile'),
+                    NameObject('/Params'): DictionaryObject({NameObject('/Size'): NumberObject(len(content))}),
+                })
+                filespec = DictionaryObject({
+                    NameObject('/Type'): NameObject('/Filespec'),
+                    NameObject('/F'): TextStringObject(name),
+                    NameObject('/UF'): TextStringObject(name),
+                    NameObject('/EF'): DictionaryObject({NameObject('/F'): writer._add_object(stream)}),
+                })
+                filespec_ref = embedded[name] = writer._add_object(filespec)
+                count += 1
+
+            del annotation['/A']
+            annotation.update({
+                NameObject('/Subtype'): NameObject('/FileAttachment'),
+                NameObject('/FS'): filespec_ref,
+                NameObject('/Name'): NameObject('/Paperclip'),
+                NameObject('/Contents'): TextStringObject(record.get('info') or name),
+            })
+    return count
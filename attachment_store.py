@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Attachment Store - Race-free storage for downloaded attachments and images
+Vergibt eindeutige Dateinamen im Speicher und schreibt Dateien atomar
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+MANIFEST_NAME = 'manifest.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+# Read once: os.umask can only be queried by setting it, which is not thread-safe
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def sanitize_filename(name, fallback):
+    """Strips characters that are unsafe in filenames, returns fallback if nothing is left"""
+    safe_name = "".join(c for c in (name or '') if c.isalnum() or c in (' ', '.', '_', '-')).strip()
+    return safe_name or fallback
+
+
+def _default_permissions(path):
+    """Gives a file the permissions a plain open() would have (mkstemp creates 0600)"""
+    os.chmod(path, 0o666 & ~_UMASK)
+
+
+def _sha256_file(path):
+    """Hashes a file in chunks without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AttachmentStore:
+    """Stores files in an attachments directory and records a manifest
+
+    Filenames are allocated from an in-memory set, so concurrent downloads
+    never race onto the same path and collisions cost no extra stat calls.
+    Every file is written to a temporary '.part' file first and renamed into
+    place, so a crash never leaves a half-written attachment behind.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest = []
+        # Optional callback(record), called on the event loop for every file
+        # stored via the async methods (e.g. Preflight.submit)
+        self.on_stored = None
+        self._lock = threading.Lock()
+        # Case-insensitive, because macOS and Windows filesystems are
+        self._taken = {MANIFEST_NAME.lower()}
+        self._taken.update(entry.name.lower() for entry in os.scandir(self.directory))
+
+    def allocate(self, filename):
+        """Reserves a unique filename in the store directory and returns its path"""
+        name, ext = os.path.splitext(filename)
+        with self._lock:
+            candidate = filename
+            counter = 1
+            while candidate.lower() in self._taken:
+                candidate = f"{name}_{counter}{ext}"
+                counter += 1
+            self._taken.add(candidate.lower())
+        return self.directory / candidate
+
+    def _temp_path(self, final_path):
+        """Creates an empty temp file next to final_path (same filesystem for os.replace)"""
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{final_path.name}.", suffix='.part')
+        os.close(fd)
+        _default_permissions(temp_name)
+        return Path(temp_name)
+
+    def _record(self, final_path, info, file_type, size, sha256, **extra):
+        """Adds a manifest entry and returns the downloaded-file record"""
+        entry = {
+            'info': info,
+            'file_path': str(final_path),
+            'type': file_type,
+            'size': size,
+            'sha256': sha256,
+        }
+        entry.update(extra)
+        with self._lock:
+            self.manifest.append(entry)
+        return entry
+
+    def write_bytes(self, filename, content, info, file_type, **extra):
+        """Writes content atomically under a unique name derived from filename"""
+        final_path = self.allocate(filename)
+        temp_path = self._temp_path(final_path)
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, final_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        return self._record(final_path, info, file_type, len(content), sha256, **extra)
+
+    async def write_bytes_async(self, filename, content, info, file_type, **extra):
+        """Same as write_bytes, but keeps the disk I/O off the event loop"""
+        record = await asyncio.to_thread(self.write_bytes, filename, content, info, file_type, **extra)
+        if self.on_stored:
+            self.on_stored(record)
+        return record
+
+    async def move_download(self, download, filename, info, file_type='file', **extra):
+        """Moves a finished Playwright download into the store
+
+        Playwright keeps finished downloads in its own temp directory. When
+        that directory is on the same filesystem, the file is renamed into
+        place instead of copied; otherwise it is saved to a temp file first.
+        """
+        final_path = self.allocate(filename)
+
+        source_path = None
+        try:
+            source_path = await download.path()
+        except Exception:
+            # Remote browsers don't expose a local path
+            pass
+
+        moved = False
+        if source_path and os.path.exists(source_path):
+            try:
+                if os.stat(source_path).st_dev == os.stat(self.directory).st_dev:
+                    _default_permissions(source_path)
+                    os.replace(source_path, final_path)
+                    moved = True
+            except OSError:
+                moved = False
+
+        if not moved:
+            temp_path = self._temp_path(final_path)
+            try:
+                await download.save_as(str(temp_path))
+                _default_permissions(temp_path)
+                os.replace(temp_path, final_path)
+            except BaseException:
+                temp_path.unlink(missing_ok=True)
+                raise
+
+        size = final_path.stat().st_size
+        sha256 = await asyncio.to_thread(_sha256_file, final_path)
+        record = self._record(final_path, info, file_type, size, sha256, **extra)
+        if self.on_stored:
+            self.on_stored(record)
+        return record
+
+    def adopt(self, records):
+        """Re-registers records from an earlier (resumed) run whose files still exist"""
+        adopted = [record for record in records if os.path.exists(record['file_path'])]
+        with self._lock:
+            self.manifest.extend(adopted)
+            self._taken.update(Path(record['file_path']).name.lower() for record in adopted)
+        return adopted
+
+    def remove_stale(self):
+        """Removes every file that was not stored by this export (call once the output is written)
+
+        Without this, a re-export into the same directory keeps the files of
+        the previous export forever. They are only removed after the new
+        output exists, so a failed re-export leaves the previous one intact.
+        Returns the number of removed entries.
+        """
+        removed = 0
+        with self._lock:
+            stored = {Path(record['file_path']).name.lower() for record in self.manifest}
+            stored.add(MANIFEST_NAME.lower())
+            for entry in os.scandir(self.directory):
+                if entry.name.lower() in stored:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.unlink(entry.path)
+                removed += 1
+            self._taken = {MANIFEST_NAME.lower()} | stored
+        return removed
+
+    def write_manifest(self):
+        """Writes the manifest (relative names, size, SHA-256) next to the stored files"""
+        manifest_path = self.directory / MANIFEST_NAME
+        entries = []
+        with self._lock:
+            for entry in self.manifest:
+                record = {key: value for key, value in entry.items() if key != 'file_path'}
+                record['file'] = Path(entry['file_path']).name
+                entries.append(record)
+
+        temp_path = self._temp_path(manifest_path)
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'files': entries}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, manifest_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return manifest_path
+
+
+def index_downloaded_files(downloaded_files):
+    """Indexes downloaded file records by their stable ids
+
+    Returns (by_attachment, by_card): attachment id -> record, and
+    card id -> list of records. Files that could not be linked to a card
+    are listed under the card id None.
+    """
+    by_attachment = {}
+    by_card = {}
+    for record in downloaded_files or []:
+        if record.get('attachment_id'):
+            by_attachment[record['attachment_id']] = record
+        by_card.setdefault(record.get('card_id'), []).append(record)
+    return by_attachment, by_card
+
+
+def card_attachment_files(card, files_by_attachment, files_by_card):
+    """Pairs the attachments of card with their downloaded records
+
+    Returns (pairs, unlisted): (attachment, record or None) per attachment,
+    and the card's downloaded files that no attachment claims. Attachments
+    without an id (exports written before ids existed) are matched by caption.
+    """
+    unlisted = [record for record in files_by_card.get(card.get('id'), [])
+                if record.get('type') != 'image' and not record.get('attachment_id')]
+    pairs = []
+    for attachment in card.get('attachments', []):
+        if attachment.get('id'):
+            record = files_by_attachment.get(attachment['id'])
+        else:
+            record = next((r for r in unlisted if r.get('info', '') == attachment.get('info', '')), None)
+            if record is not None:
+                unlisted.remove(record)
+        pairs.append((attachment, record))
+    return pairs, unlisted
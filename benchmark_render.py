@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Render Benchmark - Compares rendering the overview in one pass with the parallel per-column rendering
+Mit einem JSON-Export oder einem erzeugten Board beliebiger Größe; prüft, dass beide PDFs denselben Inhalt haben
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from attachment_store import index_downloaded_files
+from mock_board_server import make_png
+from taskcard_downloader import TaskcardDownloader
+
+# The creation time on the title page differs between two runs
+_VOLATILE = re.compile(r'Erstellt am: [\d.: ]+')
+
+
+def synthetic_board(work_dir, columns, cards, images):
+    """Board data with columns x cards cards, each with images PNGs of its own"""
+    image_dir = Path(work_dir) / 'images'
+    image_dir.mkdir(parents=True, exist_ok=True)
+    data = {'board_title': f'Benchmark {columns}x{cards}', 'extraction_strategy': 'benchmark', 'columns': []}
+    for col in range(columns):
+        column = {'id': f'c{col}', 'title': f'Spalte {col + 1}', 'cards': []}
+        for card in range(cards):
+            card_images = []
+            for img in range(images):
+                path = image_dir / f'{col}_{card}_{img}.png'
+                # Distinct images: ReportLab stores identical ones only once per PDF
+                index = (col * cards + card) * images + img
+                path.write_bytes(make_png(index, 400 + index % 97, 300))
+                card_images.append({'id': f'c{col}-k{card}-i{img}', 'src': path.name,
+                                    'local_path': str(path), 'alt': f'Bild {img + 1}'})
+            column['cards'].append({
+                'id': f'c{col}-k{card}',
+                'title': f'Karte {card + 1}',
+                'description': '\n'.join(f'Zeile {line + 1} der Karte {card + 1} in Spalte {col + 1}' for line in range(8)),
+                'links': [{'url': f'https://example.org/{col}/{card}', 'text': 'Link'}],
+                'attachments': [],
+                'images': card_images,
+            })
+        data['columns'].append(column)
+    return data, []
+
+
+def page_texts(path):
+    from PyPDF2 import PdfReader
+
+    return [_VOLATILE.sub('', page.extract_text() or '') for page in PdfReader(str(path)).pages]
+
+
+def render(downloader, files_by_card, path, workers):
+    downloader.render_workers = workers
+    started = time.perf_counter()
+    downloader._render_overview(path, files_by_card)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare the serial and the parallel per-column rendering of the overview PDF'
+    )
+    parser.add_argument(
+        'json_file',
+        nargs='?',
+        help='JSON export to render (default: a generated board)',
+        default=None
+    )
+    parser.add_argument(
+        '-a', '--attachments',
+        help='Attachments directory of the JSON export (default: <json name>_attachments)',
+        default=None
+    )
+    parser.add_argument('--columns', type=int, default=40, help='Columns of the generated board (default: 40)')
+    parser.add_argument('--cards', type=int, default=10, help='Cards per column of the generated board (default: 10)')
+    parser.add_argument('--images', type=int, default=2, help='Images per card of the generated board (default: 2)')
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        help='Processes of the parallel rendering (default: number of CPUs)',
+        default=os.cpu_count() or 1
+    )
+    parser.add_argument('--keep', help='Keep the two PDFs in the work directory', action='store_true')
+
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix='taskcard_benchmark_'))
+    try:
+        if args.json_file:
+            if not Path(args.json_file).exists():
+                print(f"❌ Datei nicht gefunden: {args.json_file}")
+                sys.exit(1)
+            downloader, downloaded_files = TaskcardDownloader.from_export(
+                args.json_file, attachments_dir=args.attachments, output_file=str(work_dir / 'out.pdf'))
+        else:
+            print(f"Erzeuge Board mit {args.columns} Spalten, {args.cards} Karten und {args.images} Bildern pro Karte...")
+            downloader = TaskcardDownloader('benchmark', str(work_dir / 'out.pdf'))
+            downloader.data, downloaded_files = synthetic_board(work_dir, args.columns, args.cards, args.images)
+        _, files_by_card = index_downloaded_files(downloaded_files)
+
+        serial_path = work_dir / 'serial.pdf'
+        parallel_path = work_dir / 'parallel.pdf'
+        serial = render(downloader, files_by_card, serial_path, None)
+        parallel = render(downloader, files_by_card, parallel_path, args.workers)
+
+        serial_pages = page_texts(serial_path)
+        parallel_pages = page_texts(parallel_path)
+        print(f"\n⏱  Ein Durchgang:   {serial:7.2f}s ({len(serial_pages)} Seiten)")
+        print(f"⏱  {args.workers} Prozesse: {parallel:7.2f}s ({len(parallel_pages)} Seiten), "
+              f"Faktor {serial / parallel if parallel else 0:.2f}")
+        if serial_pages == parallel_pages:
+            print("✅ Beide PDFs haben denselben Inhalt")
+        else:
+            differing = [i + 1 for i, (a, b) in enumerate(zip(serial_pages, parallel_pages)) if a != b]
+            print(f"❌ Inhalt unterschiedlich (Seiten: {differing[:10] or 'Seitenzahl'})")
+            sys.exit(1)
+        if args.keep:
+            print(f"   PDFs: {work_dir}")
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
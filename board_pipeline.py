@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Board Pipeline - Overlapping stages of one export and its latency report
+Bilder laden parallel zu den Anhang-Klicks, jede Spalte wird gerendert, sobald ihre Dateien da sind
+"""
+
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+
+# Latency marks (seconds since the start of the run); the report lists them by time
+LATENCY_LABELS = {
+    'extracted': 'Board geladen',
+    'attachments': 'Anhänge',
+    'images': 'Bilder',
+    'first_column': 'erste Spalte gerendert',
+    'columns': 'alle Spalten gerendert',
+    'preflight': 'Vorabprüfung',
+    'output': 'fertig',
+}
+
+
+class ColumnTracker:
+    """Counts the outstanding images and attachments of every column
+
+    A column is ready once all of its assets were downloaded, skipped or
+    failed. Ready column ids are put into `ready` exactly once, in the
+    order they complete; close() releases the remaining columns and then
+    puts None.
+    """
+
+    def __init__(self, data, images=True, attachments=True):
+        self.ready = asyncio.Queue()
+        self._pending = {}
+        for column in data.get('columns', []):
+            assets = set()
+            for card in column.get('cards', []):
+                if attachments:
+                    assets.update(('attachment', att['id']) for att in card.get('attachments', []) if att.get('id'))
+                if images:
+                    assets.update(('image', img['id']) for img in card.get('images', []) if img.get('src') and img.get('id'))
+            self._pending[column.get('id')] = assets
+        for column_id, assets in list(self._pending.items()):
+            if not assets:
+                self._release(column_id)
+
+    def _release(self, column_id):
+        if self._pending.pop(column_id, None) is not None:
+            self.ready.put_nowait(column_id)
+
+    def done(self, kind, asset_id, column_id):
+        """One image or attachment of column_id is finished (whatever the outcome)"""
+        assets = self._pending.get(column_id)
+        if assets is None:
+            return
+        assets.discard((kind, asset_id))
+        if not assets:
+            self._release(column_id)
+
+    def stage_finished(self, kind):
+        """All assets of one kind are finished (also those that were never reached)"""
+        for column_id, assets in list(self._pending.items()):
+            assets.difference_update([asset for asset in assets if asset[0] == kind])
+            if not assets:
+                self._release(column_id)
+
+    def close(self):
+        for column_id in list(self._pending):
+            self._release(column_id)
+        self.ready.put_nowait(None)
+
+
+class BoardPipeline:
+    """Tasks and intermediate files of the overlapping stages of one run"""
+
+    def __init__(self, store, preflight, render_columns=True):
+        self.store = store
+        self.preflight = preflight
+        self.render_columns = render_columns
+        self.tracker = None
+        self.image_task = None
+        self.render_task = None
+        self.fragment_dir = None
+        # Column index -> (rendered chapter PDF, page count)
+        self.fragments = {}
+
+    def make_fragment_dir(self):
+        if self.fragment_dir is None:
+            self.fragment_dir = Path(tempfile.mkdtemp(prefix='taskcard_columns_'))
+        return self.fragment_dir
+
+    async def cancel(self):
+        """Stops tasks that are still running (error, early return) and removes the fragments"""
+        for task in (self.image_task, self.render_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        if self.fragment_dir is not None:
+            shutil.rmtree(self.fragment_dir, ignore_errors=True)
+            self.fragment_dir = None
+        self.fragments = {}
+
+
+def print_latency(latency):
+    """One line with the time from the start of the run to the end of every stage"""
+    if not latency or 'output' not in latency:
+        return
+    stages = sorted((seconds, name) for name, seconds in latency.items() if name in LATENCY_LABELS and name != 'output')
+    parts = [f"{LATENCY_LABELS[name]} {seconds:.1f}s" for seconds, name in stages]
+    print(f"⏱  Durchlaufzeit: {latency['output']:.1f}s" + (f" ({', '.join(parts)})" if parts else ""))
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Board Watch - Re-exports a board only when its content changed
+Hierarchische Inhalts-Hashes (Board, Spalte, Karte) aus den extrahierten Daten, ohne Zeitstempel
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+# Bump when the hashed fields change, so old state files trigger one re-export
+HASH_VERSION = 1
+
+
+def _digest(value):
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _stable_url(url):
+    # Signed file URLs may rotate their query string without the file changing
+    if not url:
+        return ''
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+
+
+def card_hash(card):
+    """Hash over everything of a card that ends up in the output"""
+    return _digest({
+        'title': card.get('title', ''),
+        'description': card.get('description', ''),
+        'links': [[link.get('text', ''), link.get('url', '')] for link in card.get('links', [])],
+        'attachments': [[att.get('info', ''), _stable_url(att.get('url'))] for att in card.get('attachments', [])],
+        'images': [[img.get('alt', ''), _stable_url(img.get('src'))] for img in card.get('images', [])],
+    })
+
+
+def content_hash(data):
+    """Hierarchical content hash of extracted board data
+
+    Returns {'version', 'board', 'columns': {column_id: {'hash', 'title', 'cards': {card_id: hash}}}}.
+    Column hashes cover the column title and the ordered card hashes, the
+    board hash the board title and the ordered column hashes - so moving a
+    card changes the hashes of both columns, while nothing run-specific
+    (export time, local file paths) is included.
+    """
+    columns = {}
+    for column in data.get('columns', []):
+        cards = {card.get('id'): card_hash(card) for card in column.get('cards', [])}
+        columns[column.get('id')] = {
+            'title': column.get('title', ''),
+            'hash': _digest([column.get('title', ''), list(cards.values())]),
+            'cards': cards,
+        }
+    return {
+        'version': HASH_VERSION,
+        'board': _digest([data.get('board_title', ''), [column['hash'] for column in columns.values()]]),
+        'columns': columns,
+    }
+
+
+def describe_changes(old, new):
+    """Human readable list of changed, added and removed columns/cards"""
+    if not old or old.get('version') != new.get('version'):
+        return ["Erster Export"]
+    changes = []
+    old_columns = old.get('columns', {})
+    new_columns = new.get('columns', {})
+    for column_id, column in new_columns.items():
+        previous = old_columns.get(column_id)
+        if previous is None:
+            changes.append(f"+ Spalte '{column['title']}'")
+            continue
+        if previous['hash'] == column['hash']:
+            continue
+        if previous['title'] != column['title']:
+            changes.append(f"~ Spalte '{previous['title']}' umbenannt in '{column['title']}'")
+        old_cards = previous.get('cards', {})
+        added = [card_id for card_id in column['cards'] if card_id not in old_cards]
+        removed = [card_id for card_id in old_cards if card_id not in column['cards']]
+        edited = [card_id for card_id, digest in column['cards'].items()
+                  if card_id in old_cards and old_cards[card_id] != digest]
+        if added or removed or edited:
+            changes.append(f"~ Spalte '{column['title']}': {len(edited)} geändert, "
+                           f"{len(added)} neu, {len(removed)} entfernt")
+    for column_id, column in old_columns.items():
+        if column_id not in new_columns:
+            changes.append(f"- Spalte '{column['title']}'")
+    if not changes:
+        changes.append("Reihenfolge oder Board-Titel geändert")
+    return changes
+
+
+def state_path(output_file):
+    """Side file with the hashes of the last export"""
+    output_path = Path(output_file)
+    return output_path.parent / f"{output_path.stem}.hash.json"
+
+
+def load_state(output_file):
+    try:
+        with open(state_path(output_file), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(output_file, url, hashes):
+    path = state_path(output_file)
+    partial = path.with_suffix('.part')
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'exported_at': datetime.now().isoformat(timespec='seconds'), **hashes},
+                  f, ensure_ascii=False, indent=2)
+    partial.replace(path)
+
+
+def output_exists(downloader, output_format):
+    if downloader.bundle_output and output_format in ('pdf', 'json'):
+        return Path(downloader.output_file).with_suffix('.zip').exists()
+    if output_format == 'pdf':
+        return Path(downloader.output_file).exists()
+    if output_format == 'json':
+        return Path(downloader.output_file).with_suffix('.json').exists()
+    return downloader.archive_dir().exists()
+
+
+async def check_once(make_downloader, browser, include_pdf_attachments=True, output_format='pdf'):
+    """One poll: loads and extracts the board, runs the full pipeline only on changes
+
+    Returns True if the output was (re)written.
+    """
+    downloader = make_downloader()
+    # A changed board is exported into the same folder again; the files of
+    # the previous export must go, or the attachments folder grows forever
+    downloader.replace_attachments = True
+    previous = load_state(downloader.output_file)
+    if previous and previous.get('version') == HASH_VERSION and output_exists(downloader, output_format):
+        downloader.unchanged_hash = previous.get('board')
+
+    await downloader.download_and_save(
+        include_pdf_attachments=include_pdf_attachments,
+        output_format=output_format,
+        browser=browser
+    )
+    if downloader.unchanged:
+        return False
+
+    for change in describe_changes(previous, downloader.hashes):
+        print(f"  {change}")
+    save_state(downloader.output_file, downloader.url, downloader.hashes)
+    return True
+
+
+async def watch_board(make_downloader, interval, include_pdf_attachments=True, output_format='pdf', max_checks=None):
+    """Polls the board every interval seconds with one shared browser until interrupted
+
+    make_downloader() returns a fresh, configured TaskcardDownloader per poll.
+    """
+    from playwright.async_api import async_playwright
+
+    print(f"👀 Überwache Board alle {interval:g}s (Beenden mit Strg+C)")
+    checks = 0
+    exports = 0
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            while max_checks is None or checks < max_checks:
+                started = time.monotonic()
+                checks += 1
+                print(f"\n{'='*60}\n🔎 Prüfung {checks} ({datetime.now().strftime('%H:%M:%S')})\n{'='*60}")
+                try:
+                    if not browser.is_connected():
+                        browser = await p.chromium.launch(headless=True)
+                    if await check_once(make_downloader, browser, include_pdf_attachments, output_format):
+                        exports += 1
+                        print(f"🔄 Board geändert - neu exportiert ({exports} Export(e) bisher)")
+                    else:
+                        print(f"✓ Keine Änderungen seit dem letzten Export ({time.monotonic() - started:.1f}s)")
+                except Exception as e:
+                    print(f"⚠️  Prüfung fehlgeschlagen: {e}")
+
+                if max_checks is None or checks < max_checks:
+                    await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+        finally:
+            await browser.close()
+    return exports
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Browser Profile - Persistent Chromium profiles with a warm HTTP cache across runs
+Die Taskcard-Web-App, Schriften und Vorschaubilder kommen beim nächsten Lauf aus dem Festplatten-Cache
+"""
+
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+from process_memory import pid_alive
+
+MB = 1024 * 1024
+DEFAULT_CACHE_MB = 500
+DEFAULT_SLOTS = 4
+LOCK_NAME = 'profile.lock'
+STATS_NAME = 'navigation.json'
+# Chromium's HTTP cache directories inside a profile
+CACHE_DIRS = ('Default/Cache', 'Default/Code Cache', 'Default/GPUCache', 'Default/Service Worker/CacheStorage')
+# Keep this many navigation timings per profile
+NAVIGATION_HISTORY = 20
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class BrowserProfiles:
+    """A fixed number of profile slots under root, each usable by one run at a time
+
+    Chromium refuses to open a user-data directory twice, so concurrent
+    runs (GUI queue, worker farm, several CLI calls) each lock their own
+    slot via a lock file with the owner's pid. Locks of dead processes are
+    taken over. Before a slot is used, its HTTP cache is trimmed to
+    cache_limit and Chromium is told the same limit.
+    """
+
+    def __init__(self, root, slots=DEFAULT_SLOTS, cache_limit=DEFAULT_CACHE_MB * MB):
+        self.root = Path(root)
+        self.slots = slots
+        self.cache_limit = cache_limit
+
+    def slot_dir(self, index):
+        return self.root / f"slot-{index}"
+
+    def _try_lock(self, slot_dir):
+        slot_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = slot_dir / LOCK_NAME
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    pid = int(lock_path.read_text().strip() or 0)
+                except (OSError, ValueError):
+                    pid = 0
+                if pid and pid_alive(pid):
+                    return False
+                # Stale lock of a crashed run
+                lock_path.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    @contextmanager
+    def acquire(self):
+        """Locks a free slot and yields its directory, or None if all slots are busy"""
+        for index in range(self.slots):
+            slot_dir = self.slot_dir(index)
+            if self._try_lock(slot_dir):
+                try:
+                    self.trim_cache(slot_dir)
+                    yield slot_dir
+                finally:
+                    (slot_dir / LOCK_NAME).unlink(missing_ok=True)
+                return
+        yield None
+
+    def cache_size(self, slot_dir):
+        return sum(_dir_size(slot_dir / cache) for cache in CACHE_DIRS)
+
+    def trim_cache(self, slot_dir):
+        """Deletes the HTTP cache of a slot if it grew beyond the limit (slot must be locked)"""
+        if self.cache_limit and self.cache_size(slot_dir) > self.cache_limit:
+            for cache in CACHE_DIRS:
+                shutil.rmtree(slot_dir / cache, ignore_errors=True)
+            print(f"  Browser-Cache geleert (über {self.cache_limit // MB} MB): {slot_dir.name}")
+
+    def launch_args(self):
+        """Chromium flags for a persistent context of this pool"""
+        return [f'--disk-cache-size={self.cache_limit}'] if self.cache_limit else []
+
+    async def launch(self, playwright, slot_dir, headless=True):
+        """Starts Chromium with slot_dir as user-data directory; returns the persistent context"""
+        return await playwright.chromium.launch_persistent_context(
+            str(slot_dir),
+            headless=headless,
+            accept_downloads=True,
+            args=self.launch_args()
+        )
+
+    def record_navigation(self, slot_dir, seconds):
+        """Stores the navigation time and returns the median of the earlier runs (None on first use)"""
+        stats_path = slot_dir / STATS_NAME
+        try:
+            history = json.loads(stats_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            history = []
+        previous = sorted(history)[len(history) // 2] if history else None
+        history = (history + [round(seconds, 3)])[-NAVIGATION_HISTORY:]
+        try:
+            stats_path.write_text(json.dumps(history), encoding='utf-8')
+        except OSError:
+            pass
+        return previous
+
+    def clean(self):
+        """Deletes all unlocked profile slots; returns (removed slots, freed bytes, busy slots)"""
+        removed = freed = busy = 0
+        if not self.root.exists():
+            return removed, freed, busy
+        for slot_dir in sorted(self.root.glob('slot-*')):
+            if not self._try_lock(slot_dir):
+                busy += 1
+                continue
+            size = _dir_size(slot_dir)
+            shutil.rmtree(slot_dir, ignore_errors=True)
+            removed += 1
+            freed += size
+        return removed, freed, busy
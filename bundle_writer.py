@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Bundle Writer - Streams the output of one board into a single ZIP file
+PDF/JSON, Anhänge und Bilder landen in einer Datei; bereits komprimierte Medien werden nur gespeichert
+"""
+
+import os
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from preflight import sniff_type
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Detected file types whose content is compressed already (deflating them again
+# only costs CPU); zip also covers docx/xlsx/pptx/odt
+STORED_KINDS = {'pdf', 'png', 'jpeg', 'gif', 'webp', 'zip', 'mp3', 'ogg', 'flac', 'webm', 'mp4', '7z', 'rar'}
+
+
+def compression_for(path):
+    """ZIP_STORED for already-compressed media, ZIP_DEFLATED for everything else"""
+    return zipfile.ZIP_STORED if sniff_type(path) in STORED_KINDS else zipfile.ZIP_DEFLATED
+
+
+class BundleWriter:
+    """Writes files into <stem>.zip on a background thread as they complete
+
+    Files are named relative to base_dir, so unpacking the bundle next to
+    the output gives the usual layout (<stem>.pdf, <stem>_attachments/...).
+    The archive is written as <stem>.zip.part and renamed into place by
+    close(); abort() removes it. Entries are streamed in chunks and no
+    temporary copy is made.
+    """
+
+    def __init__(self, path, base_dir):
+        self.path = Path(path)
+        self.base_dir = Path(base_dir)
+        self.part_path = self.path.with_name(self.path.name + '.part')
+        self._zip = zipfile.ZipFile(self.part_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+        # One writer thread: ZipFile is not thread-safe and entries must not interleave
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bundle')
+        self._lock = threading.Lock()
+        self._added = set()
+        self._pending = []
+        self.stored_bytes = 0
+
+    def arcname(self, path):
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.base_dir.resolve()).as_posix()
+        except ValueError:
+            return path.name
+
+    def _write(self, path, arcname):
+        info = zipfile.ZipInfo.from_file(path, arcname)
+        info.compress_type = compression_for(path)
+        with open(path, 'rb') as src, self._zip.open(info, 'w', force_zip64=True) as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        self.stored_bytes += info.file_size
+
+    def add(self, path, arcname=None):
+        """Queues a finished file for the bundle (non-blocking; each path is added once)"""
+        arcname = arcname or self.arcname(path)
+        with self._lock:
+            if arcname in self._added:
+                return
+            self._added.add(arcname)
+            self._pending.append(self._executor.submit(self._write, str(path), arcname))
+
+    def add_record(self, record):
+        """AttachmentStore.on_stored hook"""
+        if record:
+            self.add(record['file_path'])
+
+    def add_bytes(self, arcname, content):
+        with self._lock:
+            if arcname in self._added:
+                return
+            self._added.add(arcname)
+            self._pending.append(self._executor.submit(self._zip.writestr, arcname, content))
+
+    def close(self):
+        """Waits for all queued files, finishes the archive and returns its path"""
+        self._executor.shutdown(wait=True)
+        try:
+            for future in self._pending:
+                future.result()
+        finally:
+            self._zip.close()
+        os.replace(self.part_path, self.path)
+        return self.path
+
+    def abort(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        try:
+            self._zip.close()
+        except Exception:
+            pass
+        self.part_path.unlink(missing_ok=True)
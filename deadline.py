@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Deadline - Overall time limit of one board, split into phase budgets
+Was bis zum Ende seiner Phase nicht fertig wird, wird übersprungen; das PDF entsteht trotzdem vollständig
+"""
+
+import time
+
+# Share of the limit after which each phase must be finished (cumulative, in order).
+# 'downloads' covers the attachment clicks and the image downloads, which run
+# side by side; 'render' is a reserve that is never cut short.
+PHASE_SHARES = (
+    ('extract', 0.3),
+    ('downloads', 0.55),
+    ('render', 0.15),
+)
+# Shortest timeout given to a step that has to run anyway (page load)
+MIN_STEP_SECONDS = 5.0
+# Don't start a download with less time than this left in its phase
+MIN_DOWNLOAD_SECONDS = 1.0
+# Measured download time needed before sizes are used to predict what can't finish
+MIN_RATE_SAMPLE_SECONDS = 0.5
+
+
+class Deadline:
+    """Absolute end time per phase, counted from the start of the run
+
+    Because each phase ends at a fixed point in time, time left over by an
+    earlier phase automatically goes to the next one.
+    """
+
+    def __init__(self, seconds, shares=PHASE_SHARES):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self._ends = {}
+        self._bytes = 0
+        self._seconds = 0.0
+        elapsed_share = 0.0
+        for name, share in shares:
+            elapsed_share += share
+            self._ends[name] = self.started + seconds * elapsed_share
+
+    def left(self, phase):
+        """Seconds until the end of phase (0 if it is over)"""
+        return max(0.0, self._ends[phase] - time.monotonic())
+
+    def expired(self, phase, margin=MIN_DOWNLOAD_SECONDS):
+        return self.left(phase) < margin
+
+    def record_transfer(self, size, seconds):
+        """Feeds the measured download rate (bytes per second) used by can_finish"""
+        if size and seconds > 0:
+            self._bytes += size
+            self._seconds += seconds
+
+    def can_finish(self, size, phase):
+        """False if a download of size bytes would not finish before the end of phase at the measured rate"""
+        if self.expired(phase):
+            return False
+        if not size or self._seconds < MIN_RATE_SAMPLE_SECONDS:
+            return True
+        return size / (self._bytes / self._seconds) <= self.left(phase)
+
+    def timeout(self, phase, default, minimum=MIN_STEP_SECONDS):
+        """default, shortened to the time left in phase (but at least minimum)"""
+        return max(minimum, min(default, self.left(phase)))
+
+    def describe(self):
+        labels = {'extract': 'Laden', 'downloads': 'Downloads', 'render': 'PDF'}
+        parts = [f"{labels.get(name, name)} bis {end - self.started:.0f}s" for name, end in self._ends.items()]
+        return f"{self.seconds:.0f}s ({', '.join(parts)})"
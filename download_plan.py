@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Download Plan - Size estimates and byte budgets for images and attachments
+Plant den Download vorab (HEAD/Content-Length, Größen aus den Anhang-Beschriftungen) und begrenzt Bytes und Plattenplatz
+"""
+
+import asyncio
+import json
+import re
+import shutil
+from pathlib import Path
+
+import aiohttp
+
+MB = 1024 * 1024
+DEFAULT_MIN_FREE_MB = 200
+PROBE_CONCURRENCY = 10
+PROBE_TIMEOUT = 15
+
+# Skip reasons (shown in the PDF and the JSON export)
+TOO_LARGE = 'Datei zu groß'
+OVER_BUDGET = 'Board-Budget erschöpft'
+DISK_FULL = 'Zu wenig freier Speicherplatz'
+OUT_OF_TIME = 'Zeitlimit des Boards erreicht'
+
+_UNITS = {'b': 1, 'byte': 1, 'bytes': 1, 'kb': 1024, 'mb': MB, 'gb': 1024 * MB}
+# "Arbeitsblatt.pdf PDF · 1,2 MB"
+_CAPTION_SIZE = re.compile(r'(\d+(?:[.,]\d+)?)\s*(bytes?|b|kb|mb|gb)\b', re.IGNORECASE)
+
+
+def parse_caption_size(text):
+    """Size in bytes from an attachment caption, None if it has none"""
+    matches = _CAPTION_SIZE.findall(text or '')
+    if not matches:
+        return None
+    number, unit = matches[-1]
+    return int(float(number.replace(',', '.')) * _UNITS[unit.lower()])
+
+
+def format_size(size):
+    if size is None:
+        return '?'
+    if size >= 1024 * MB:
+        return f"{size / (1024 * MB):.1f} GB"
+    if size >= MB:
+        return f"{size / MB:.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+
+class ByteBudget:
+    """Per-file and per-board byte limits plus a free disk space reserve
+
+    admit() is asked before every download with the expected size (None if
+    unknown) and reserves it; consume() corrects the reservation with the
+    actual size afterwards. All calls happen on the event loop.
+    """
+
+    def __init__(self, max_file=None, max_total=None, min_free=DEFAULT_MIN_FREE_MB * MB):
+        self.max_file = max_file
+        self.max_total = max_total
+        self.min_free = min_free
+        self.used = 0
+
+    def admit(self, size, directory):
+        """Returns None if the download may start, otherwise the skip reason"""
+        if size is not None and self.max_file is not None and size > self.max_file:
+            return TOO_LARGE
+        if size is not None and self.max_total is not None and self.used + size > self.max_total:
+            return OVER_BUDGET
+        if self.max_total is not None and self.used >= self.max_total:
+            return OVER_BUDGET
+        if self.min_free:
+            try:
+                free = shutil.disk_usage(directory).free
+            except OSError:
+                free = None
+            if free is not None and free - (size or 0) < self.min_free:
+                return DISK_FULL
+        self.used += size or 0
+        return None
+
+    def consume(self, expected, actual):
+        """Replaces the reserved (expected) size with the actual one"""
+        self.used += (actual or 0) - (expected or 0)
+
+    def allows_file(self, size):
+        return self.max_file is None or size <= self.max_file
+
+
+def skipped_entry(kind, label, size, reason, **ids):
+    """Record of an item that was not downloaded (data['skipped'])"""
+    return {'kind': kind, 'label': label, 'size': size, 'reason': reason, **ids}
+
+
+async def _probe_size(session, url):
+    """Content-Length via HEAD, falling back to a one-byte range request"""
+    try:
+        async with session.head(url, allow_redirects=True) as response:
+            if response.status < 400 and response.content_length is not None:
+                return response.content_length
+        async with session.get(url, headers={'Range': 'bytes=0-0'}) as response:
+            content_range = response.headers.get('Content-Range', '')
+            if response.status == 206 and '/' in content_range:
+                total = content_range.rsplit('/', 1)[1]
+                return int(total) if total.isdigit() else None
+            if response.status < 400:
+                return response.content_length
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        pass
+    return None
+
+
+async def build_plan(data):
+    """Lists every image and attachment of the extracted data with its (estimated) size
+
+    Attachment sizes come from their captions (they are only downloadable
+    by clicking); image sizes from HEAD requests. Nothing is downloaded.
+    """
+    items = []
+    for column in data.get('columns', []):
+        for card in column.get('cards', []):
+            ids = {'column_id': column.get('id'), 'card_id': card.get('id')}
+            for attachment in card.get('attachments', []):
+                size = parse_caption_size(attachment.get('info'))
+                items.append({'kind': 'attachment', 'id': attachment.get('id'), 'label': attachment.get('info', ''),
+                              'url': None, 'size': size, 'size_source': 'caption' if size is not None else None, **ids})
+            for image in card.get('images', []):
+                items.append({'kind': 'image', 'id': image.get('id'), 'label': image.get('alt', 'Bild'),
+                              'url': image.get('src'), 'size': None, 'size_source': None, **ids})
+
+    images = [item for item in items if item['kind'] == 'image' and item['url']]
+    if images:
+        print(f"\nErmittle Größen von {len(images)} Bildern (HEAD)...")
+        semaphore = asyncio.Semaphore(PROBE_CONCURRENCY)
+        timeout = aiohttp.ClientTimeout(total=PROBE_TIMEOUT)
+
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async def probe(item):
+                async with semaphore:
+                    item['size'] = await _probe_size(session, item['url'])
+                    if item['size'] is not None:
+                        item['size_source'] = 'head'
+
+            await asyncio.gather(*(probe(item) for item in images))
+    return items
+
+
+def print_plan(items, budget=None, directory=None):
+    """Prints counts, total size, the largest items and what a budget would skip"""
+    known = [item for item in items if item['size'] is not None]
+    total = sum(item['size'] for item in known)
+    attachments = sum(1 for item in items if item['kind'] == 'attachment')
+
+    print(f"\n{'='*60}")
+    print("📋 DOWNLOAD-PLAN (nichts wurde heruntergeladen)")
+    print(f"{'='*60}")
+    print(f"  Bilder: {len(items) - attachments}, Anhänge: {attachments}")
+    print(f"  Geschätzte Größe: {format_size(total)} ({len(items) - len(known)} ohne Größenangabe)")
+    if directory is not None:
+        try:
+            print(f"  Freier Speicherplatz: {format_size(shutil.disk_usage(directory).free)}")
+        except OSError:
+            pass
+
+    largest = sorted(known, key=lambda item: item['size'], reverse=True)[:10]
+    if largest:
+        print("\n  Größte Elemente:")
+        for item in largest:
+            print(f"    {format_size(item['size']):>9}  {item['kind']:<10} {item['label'][:50]}")
+
+    if budget and (budget.max_file or budget.max_total):
+        simulated = ByteBudget(budget.max_file, budget.max_total, min_free=0)
+        skipped = [item for item in items if simulated.admit(item['size'], directory or '.')]
+        print(f"\n  Mit Budget würden {len(skipped)} Element(e) übersprungen"
+              f" ({format_size(sum(item['size'] or 0 for item in skipped))})")
+
+
+def write_plan(items, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'items': items, 'total_known_size': sum(item['size'] or 0 for item in items)},
+                  f, ensure_ascii=False, indent=2)
+    return Path(path)
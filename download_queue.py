@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Download Queue - Runs many board downloads concurrently in one shared browser
+Hintergrund-Thread mit eigener Event-Loop; die GUI liest nur den Zustand der Jobs
+"""
+
+import asyncio
+import itertools
+import re
+import threading
+import time
+from pathlib import Path
+
+from stdout_router import route_stdout
+from taskcard_downloader import TaskcardDownloader
+
+# Job states (shown as-is in the GUI)
+WAITING = 'Wartend'
+RUNNING = 'Läuft'
+DONE = 'Fertig'
+FAILED = 'Fehler'
+CANCELLED = 'Abgebrochen'
+
+PHASE_LABELS = {
+    'extract': 'Lade Board',
+    'attachments': 'Anhänge',
+    'images': 'Bilder',
+    'render': 'Rendern',
+    'merge': 'Zusammenfügen',
+    'optimize': 'Optimieren',
+    'export': 'Exportieren',
+}
+
+
+class _PrefixWriter:
+    """File-like writer that prefixes every line with the job number"""
+
+    def __init__(self, target, prefix):
+        self.target = target
+        self.prefix = prefix
+        self._partial = ''
+
+    def write(self, text):
+        *lines, self._partial = (self._partial + text).split('\n')
+        for line in lines:
+            self.target.write(f"{self.prefix}{line}\n")
+        return len(text)
+
+    def flush(self):
+        if self._partial:
+            self.target.write(f"{self.prefix}{self._partial}\n")
+            self._partial = ''
+
+
+def rename_to_board_title(downloader):
+    """Renames the PDF (and its attachments folder) after the board title, if that name is free
+
+    Returns the new filename, or None if nothing was renamed.
+    """
+    board_title = downloader.data.get('board_title')
+    if not board_title:
+        return None
+    safe_title = re.sub(r'[<>:"/\\|?*]', '', board_title)[:100].strip()
+    if not safe_title:
+        return None
+
+    output_file = Path(downloader.output_file)
+    new_output_path = output_file.parent / f"{safe_title}{output_file.suffix}"
+    if new_output_path == output_file or new_output_path.exists():
+        return None
+
+    output_file.rename(new_output_path)
+    old_att_dir = output_file.parent / f"{output_file.stem}_attachments"
+    new_att_dir = new_output_path.parent / f"{new_output_path.stem}_attachments"
+    if old_att_dir.exists() and not new_att_dir.exists():
+        old_att_dir.rename(new_att_dir)
+    downloader.output_file = str(new_output_path)
+    return new_output_path.name
+
+
+class QueueJob:
+    """One queued board; attributes are written by the queue thread and only read by the GUI"""
+
+    def __init__(self, job_id, url, output_file, include_attachments, export_json):
+        self.id = job_id
+        self.url = url
+        self.output_file = output_file
+        self.include_attachments = include_attachments
+        self.export_json = export_json
+        self.title = ''
+        self._reset()
+
+    def _reset(self):
+        self.status = WAITING
+        self.phase = ''
+        self.progress = 0.0
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+
+    @property
+    def active(self):
+        return self.status in (WAITING, RUNNING)
+
+    @property
+    def elapsed(self):
+        if not self.started_at:
+            return None
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+
+class DownloadQueue:
+    """Runs queued downloads on a background event loop with a shared Chromium
+
+    At most `concurrency` jobs run at once; the limit can be changed while
+    the queue is running. The browser is launched with the first job and
+    kept until shutdown, so later jobs only open a new context.
+    """
+
+    def __init__(self, log_target, concurrency=2):
+        self.log_target = log_target
+        self.concurrency = concurrency
+        self.jobs = []
+        self._ids = itertools.count(1)
+        self._running = 0
+        self._loop = asyncio.new_event_loop()
+        self._slot_changed = None
+        self._browser = None
+        self._playwright = None
+        self._browser_lock = None
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._slot_changed = asyncio.Condition()
+        self._browser_lock = asyncio.Lock()
+        self._loop.run_forever()
+
+    # --- called from the GUI thread ---------------------------------------
+
+    def add(self, url, output_file, include_attachments=True, export_json=False):
+        job = QueueJob(next(self._ids), url, output_file, include_attachments, export_json)
+        self.jobs.append(job)
+        self._submit(job)
+        return job
+
+    def _submit(self, job):
+        def start():
+            job.task = self._loop.create_task(self._run_job(job))
+        self._loop.call_soon_threadsafe(start)
+
+    def cancel(self, job):
+        if job.active:
+            self._loop.call_soon_threadsafe(lambda: job.task and job.task.cancel())
+
+    def retry(self, job):
+        if job.active:
+            return
+        job._reset()
+        self._submit(job)
+
+    def remove(self, job):
+        if not job.active and job in self.jobs:
+            self.jobs.remove(job)
+
+    def set_concurrency(self, concurrency):
+        async def update():
+            self.concurrency = max(1, concurrency)
+            async with self._slot_changed:
+                self._slot_changed.notify_all()
+        asyncio.run_coroutine_threadsafe(update(), self._loop)
+
+    def shutdown(self, timeout=10):
+        """Cancels all jobs and closes the browser"""
+        async def stop():
+            tasks = [job.task for job in self.jobs if job.task and not job.task.done()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._browser:
+                await self._browser.close()
+            if self._playwright:
+                await self._playwright.stop()
+        try:
+            asyncio.run_coroutine_threadsafe(stop(), self._loop).result(timeout)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    # --- queue thread ------------------------------------------------------
+
+    async def _ensure_browser(self):
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            return self._browser
+
+    async def _acquire_slot(self):
+        async with self._slot_changed:
+            await self._slot_changed.wait_for(lambda: self._running < self.concurrency)
+            self._running += 1
+
+    async def _release_slot(self):
+        async with self._slot_changed:
+            self._running -= 1
+            self._slot_changed.notify_all()
+
+    def _on_progress(self, job, phase, fraction):
+        job.phase = PHASE_LABELS.get(phase, phase)
+        job.progress = max(job.progress, fraction)
+
+    async def _run_job(self, job):
+        writer = _PrefixWriter(self.log_target, f"[#{job.id}] ")
+        try:
+            await self._acquire_slot()
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+            return
+
+        job.status = RUNNING
+        job.started_at = time.monotonic()
+        try:
+            with route_stdout(writer):
+                browser = await self._ensure_browser()
+                downloader = TaskcardDownloader(job.url, job.output_file)
+                downloader.progress_callback = lambda phase, fraction: self._on_progress(job, phase, fraction)
+                downloader.render_in_thread = True
+                downloaded_files = await downloader.download_and_save(
+                    include_pdf_attachments=job.include_attachments,
+                    browser=browser
+                )
+                job.title = downloader.data.get('board_title', '')
+
+                try:
+                    new_name = rename_to_board_title(downloader)
+                    if new_name:
+                        print(f"Dateiname angepasst: {new_name}")
+                except OSError as e:
+                    print(f"⚠️  Konnte Datei nicht umbenennen: {e}")
+                job.output_file = downloader.output_file
+
+                if job.export_json:
+                    json_file = Path(job.output_file).with_suffix('.json')
+                    downloader.export_json(str(json_file), downloaded_pdfs=downloaded_files)
+
+            job.progress = 1.0
+            job.status = DONE
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+            writer.write("⚠️  Abgebrochen\n")
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            writer.write(f"❌ FEHLER: {e}\n")
+        finally:
+            writer.flush()
+            job.finished_at = time.monotonic()
+            await self._release_slot()
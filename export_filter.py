@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Export Filter - Restricts an export to selected columns, cards and file types
+Wird bereits bei der Extraktion im Browser angewendet: ausgeschlossene Inhalte werden nie geladen
+"""
+
+import re
+from pathlib import Path
+
+# Attachment captions look like "Arbeitsblatt.pdf PDF · 1.2 MB"
+_CAPTION_EXTENSION = re.compile(r'\.([A-Za-z0-9]{1,8})(?:\s|$)')
+_CAPTION_TYPE = re.compile(r'\s([A-Za-z0-9]{2,8})\s*·')
+
+
+def parse_types(value):
+    """'pdf, .DOCX' -> ['pdf', 'docx']"""
+    return [part.strip().lstrip('.').lower() for part in value.split(',') if part.strip()]
+
+
+class ExportFilter:
+    """Column/card title patterns, attachment type allowlist and an images switch
+
+    Patterns are case-insensitive regular expressions that must match
+    somewhere in the title. They are evaluated by JavaScript in the page,
+    so use the common subset of Python and JavaScript regex syntax.
+    """
+
+    def __init__(self, columns=None, cards=None, attachment_types=None, images=True):
+        self.columns = columns or None
+        self.cards = cards or None
+        self.attachment_types = [t.lower().lstrip('.') for t in attachment_types] if attachment_types is not None else None
+        self.images = images
+        # Fail early on patterns that neither side can compile
+        for pattern in (self.columns, self.cards):
+            if pattern:
+                re.compile(pattern)
+
+    @property
+    def active(self):
+        return bool(self.columns or self.cards or self.attachment_types is not None or not self.images)
+
+    def to_js(self):
+        """Argument for the extraction script in _scroll_and_harvest"""
+        return {
+            'columns': self.columns,
+            'cards': self.cards,
+            'attachment_types': self.attachment_types,
+            'images': self.images,
+        }
+
+    def attachment_allowed(self, name):
+        """Checks a caption or filename against the type allowlist"""
+        if self.attachment_types is None:
+            return True
+        name = name or ''
+        suffix = Path(name.strip()).suffix.lstrip('.').lower()
+        if suffix and suffix in self.attachment_types:
+            return True
+        match = _CAPTION_EXTENSION.search(name) or _CAPTION_TYPE.search(name)
+        return bool(match) and match.group(1).lower() in self.attachment_types
+
+    def describe(self):
+        parts = []
+        if self.columns:
+            parts.append(f"Spalten /{self.columns}/")
+        if self.cards:
+            parts.append(f"Karten /{self.cards}/")
+        if self.attachment_types is not None:
+            parts.append(f"Anhänge: {', '.join(self.attachment_types) or 'keine'}")
+        if not self.images:
+            parts.append("ohne Bilder")
+        return ', '.join(parts)
+
+    @classmethod
+    def from_args(cls, args):
+        """Builds the filter from the --columns/--cards/--attachment-types/--no-images options"""
+        export_filter = cls(
+            columns=args.columns,
+            cards=args.cards,
+            attachment_types=parse_types(args.attachment_types) if args.attachment_types is not None else None,
+            images=not args.no_images,
+        )
+        return export_filter if export_filter.active else None
+
+
+def add_filter_arguments(parser):
+    """Adds the filter options to an argparse parser"""
+    parser.add_argument(
+        '--columns',
+        metavar='REGEX',
+        help='Only export columns whose title matches REGEX (case-insensitive), e.g. "Woche 1[0-2]"',
+        default=None
+    )
+    parser.add_argument(
+        '--cards',
+        metavar='REGEX',
+        help='Only export cards whose title matches REGEX (case-insensitive)',
+        default=None
+    )
+    parser.add_argument(
+        '--attachment-types',
+        metavar='TYPES',
+        help='Only download attachments of these types, comma-separated (e.g. "pdf,docx"; empty: none)',
+        default=None
+    )
+    parser.add_argument(
+        '--no-images',
+        help='Do not download or render card images',
+        action='store_true'
+    )
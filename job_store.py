@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Job Store - Persistent SQLite job queue with per-phase checkpoints
+Nach einem Absturz wird jedes Board ab der letzten abgeschlossenen Phase fortgesetzt
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from process_memory import pid_alive, process_start_time
+
+# Phases in pipeline order; a job's phase is the last one it completed
+PHASES = ['queued', 'extracted', 'attachments', 'images', 'rendered', 'merged']
+
+# Finished jobs are kept as history for this long
+DONE_RETENTION_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    output_file TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    phase TEXT NOT NULL DEFAULT 'queued',
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner_pid INTEGER,
+    owner_started INTEGER,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (url, output_file)
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (job_id, name)
+);
+"""
+
+
+class JobStore:
+    """SQLite-backed store tracking each board through the pipeline phases
+
+    Checkpoints (extracted board data, download manifest) are written in the
+    same transaction as the phase change, so a job's phase never points at a
+    checkpoint that does not exist. WAL mode lets several worker processes
+    share one database; a running job records the pid and start time of its
+    process, so no other process resumes it while that process is alive.
+    Finished jobs are removed after DONE_RETENTION_DAYS.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(SCHEMA)
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        # Databases created before jobs recorded their owner
+        for column in ('owner_pid', 'owner_started'):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} INTEGER')
+        self.prune()
+
+    def close(self):
+        self._conn.close()
+
+    @staticmethod
+    def _now():
+        return datetime.now().isoformat(timespec='seconds')
+
+    def prune(self, days=DONE_RETENTION_DAYS):
+        """Deletes finished jobs last updated more than days ago"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status = 'done' AND updated_at < ?", (cutoff,)
+            )
+        return cursor.rowcount
+
+    def work_dir(self, job_id):
+        """Directory for intermediate files of a job (e.g. the rendered overview)"""
+        path = self.db_path.parent / 'jobs' / str(job_id)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def open_job(self, url, output_file, options=None):
+        """Returns a handle for the job (url, output_file), creating it if needed
+
+        Unfinished jobs (including failed ones) resume from their last
+        completed phase. Finished jobs, or jobs opened with different options,
+        restart from scratch.
+        """
+        output_file = str(Path(output_file).resolve())
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT * FROM jobs WHERE url = ? AND output_file = ?', (url, output_file)
+            ).fetchone()
+
+            if row is None:
+                cursor = self._conn.execute(
+                    'INSERT INTO jobs (url, output_file, options, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                    (url, output_file, json.dumps(options or {}), self._now(), self._now())
+                )
+                job_id = cursor.lastrowid
+            else:
+                job_id = row['id']
+                if row['status'] == 'done' or (options is not None and json.loads(row['options']) != options):
+                    self._conn.execute('DELETE FROM checkpoints WHERE job_id = ?', (job_id,))
+                    self._conn.execute(
+                        "UPDATE jobs SET phase = 'queued', options = ?, error = NULL WHERE id = ?",
+                        (json.dumps(options if options is not None else json.loads(row['options'])), job_id)
+                    )
+                    shutil.rmtree(self.db_path.parent / 'jobs' / str(job_id), ignore_errors=True)
+
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', owner_pid = ?, owner_started = ?, updated_at = ? WHERE id = ?",
+                (os.getpid(), process_start_time(os.getpid()), self._now(), job_id)
+            )
+        return JobHandle(self, job_id)
+
+    def get_job(self, job_id):
+        row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['options'] = json.loads(job['options'])
+        return job
+
+    def unfinished_jobs(self):
+        """Jobs that can be resumed, oldest first
+
+        Failed jobs, and jobs whose process died before they were done. A job
+        still running in a live process (another CLI call, a worker) is left
+        alone, so it never runs twice into the same output. A pid reused by
+        an unrelated process is recognized by its different start time.
+        """
+        rows = self._conn.execute(
+            "SELECT id, status, owner_pid, owner_started FROM jobs WHERE status != 'done' ORDER BY id"
+        ).fetchall()
+        return [
+            self.get_job(row['id']) for row in rows
+            if row['status'] == 'failed' or not row['owner_pid']
+            or not pid_alive(row['owner_pid'], row['owner_started'])
+        ]
+
+    def advance(self, job_id, phase, **checkpoints):
+        """Records that phase is complete, together with its checkpoints"""
+        status = 'done' if phase == PHASES[-1] else 'running'
+        with self._lock, self._conn:
+            for name, value in checkpoints.items():
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO checkpoints (job_id, name, payload) VALUES (?, ?, ?)',
+                    (job_id, name, json.dumps(value, ensure_ascii=False))
+                )
+            self._conn.execute(
+                'UPDATE jobs SET phase = ?, status = ?, error = NULL, updated_at = ? WHERE id = ?',
+                (phase, status, self._now(), job_id)
+            )
+            if status == 'done':
+                # Finished jobs keep their row as history, but not the checkpoint payloads
+                self._conn.execute('DELETE FROM checkpoints WHERE job_id = ?', (job_id,))
+        if status == 'done':
+            shutil.rmtree(self.db_path.parent / 'jobs' / str(job_id), ignore_errors=True)
+
+    def load_checkpoint(self, job_id, name, default=None):
+        row = self._conn.execute(
+            'SELECT payload FROM checkpoints WHERE job_id = ? AND name = ?', (job_id, name)
+        ).fetchone()
+        return json.loads(row['payload']) if row else default
+
+    def mark_failed(self, job_id, error):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                (str(error), self._now(), job_id)
+            )
+
+
+class JobHandle:
+    """Job-scoped view on a JobStore, passed through the download pipeline"""
+
+    def __init__(self, store, job_id):
+        self.store = store
+        self.job_id = job_id
+
+    @property
+    def phase(self):
+        return self.store.get_job(self.job_id)['phase']
+
+    def reached(self, phase):
+        """True if the job has already completed phase"""
+        return PHASES.index(self.phase) >= PHASES.index(phase)
+
+    def advance(self, phase, **checkpoints):
+        self.store.advance(self.job_id, phase, **checkpoints)
+
+    def checkpoint(self, name, default=None):
+        return self.store.load_checkpoint(self.job_id, name, default)
+
+    def fail(self, error):
+        self.store.mark_failed(self.job_id, error)
+
+    @property
+    def work_dir(self):
+        return self.store.work_dir(self.job_id)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Load Test - Sends many export jobs to taskcard_service.py and reports latency and throughput
+Standardmäßig gegen das lokale Mock-Board (mock_board_server.py)
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import aiohttp
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_one(session, service_url, board_url, fmt, timeout):
+    """Submits one job and long-polls its result; returns (seconds, bytes, error)"""
+    started = time.monotonic()
+    async with session.post(f"{service_url}/jobs", json={'url': board_url, 'format': fmt}) as response:
+        if response.status != 202:
+            return time.monotonic() - started, 0, f"HTTP {response.status}: {(await response.text())[:80]}"
+        job = await response.json()
+
+    deadline = started + timeout
+    while time.monotonic() < deadline:
+        wait = max(1, min(60, int(deadline - time.monotonic())))
+        async with session.get(f"{service_url}/jobs/{job['id']}/result", params={'wait': wait}) as response:
+            if response.status == 200:
+                size = 0
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    size += len(chunk)
+                return time.monotonic() - started, size, None
+            if response.status != 409:
+                info = await response.json()
+                return time.monotonic() - started, 0, info.get('error') or f"HTTP {response.status}"
+    return time.monotonic() - started, 0, 'Timeout'
+
+
+async def run_load_test(args):
+    results = []
+    semaphore = asyncio.Semaphore(args.clients)
+
+    async def client(index):
+        async with semaphore:
+            seconds, size, error = await run_one(session, args.service, args.board_url, args.format, args.timeout)
+            results.append((seconds, size, error))
+            status = '✓' if not error else f'❌ {error}'
+            print(f"  [{len(results)}/{args.jobs}] {seconds:6.1f}s {size / 1024:8.1f} KB {status}")
+
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=args.timeout)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        started = time.monotonic()
+        await asyncio.gather(*(client(i) for i in range(args.jobs)))
+        elapsed = time.monotonic() - started
+
+        async with session.get(f"{args.service}/metrics") as response:
+            metrics = await response.text()
+
+    latencies = [seconds for seconds, _, error in results if not error]
+    failures = [error for _, _, error in results if error]
+
+    print(f"\n{'='*60}")
+    print("📊 LASTTEST")
+    print(f"{'='*60}")
+    print(f"  Jobs: {len(latencies)} erfolgreich, {len(failures)} fehlgeschlagen ({args.clients} parallele Clients)")
+    print(f"  Gesamtdauer: {elapsed:.1f}s, Durchsatz: {len(latencies) / (elapsed / 60) if elapsed else 0:.2f} Boards/Minute")
+    if latencies:
+        print(f"  Latenz p50: {percentile(latencies, 0.5):.1f}s, p90: {percentile(latencies, 0.9):.1f}s, "
+              f"p99: {percentile(latencies, 0.99):.1f}s, max: {max(latencies):.1f}s")
+    print("\nService-Metriken:")
+    for line in metrics.splitlines():
+        if not line.startswith('#'):
+            print(f"  {line}")
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load-test the Taskcard export service'
+    )
+    parser.add_argument('--service', default='http://127.0.0.1:8080', help='Service base URL (default: http://127.0.0.1:8080)')
+    parser.add_argument(
+        '--board-url',
+        help='Board to export (default: the local mock board server)',
+        default='http://127.0.0.1:8765/?columns=4&cards=6'
+    )
+    parser.add_argument('-n', '--jobs', type=int, default=20, help='Number of jobs to submit (default: 20)')
+    parser.add_argument('-c', '--clients', type=int, default=5, help='Number of concurrent clients (default: 5)')
+    parser.add_argument('--format', choices=['pdf', 'json'], default='pdf', help='Requested result format')
+    parser.add_argument('--timeout', type=float, default=600, help='Timeout per job in seconds (default: 600)')
+    args = parser.parse_args()
+    args.service = args.service.rstrip('/')
+
+    ok = asyncio.run(run_load_test(args))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Log Buffer - Thread-safe line buffer between download threads and the GUI
+Die GUI holt Zeilen gebündelt im festen Takt ab; das vollständige Log landet in einer Datei
+"""
+
+import threading
+from collections import deque
+
+
+class LogBuffer:
+    """Collects log output from any thread for batched display
+
+    Writers call write() (it is file-like, so it can stand in for stdout)
+    or add_line(). The UI thread calls drain() on a timer and inserts the
+    returned lines in one go. If the UI falls behind by more than
+    max_pending lines, the oldest pending lines are dropped from the
+    display only - every line is still written to the spool file.
+    """
+
+    def __init__(self, max_pending=2000):
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._partial = ''
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._spool = None
+        self.spool_path = None
+
+    def open_spool(self, path):
+        """Starts writing the full log to path (closes a previous spool file)"""
+        self.close_spool()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._spool = open(path, 'w', encoding='utf-8', buffering=1)
+            self.spool_path = path
+
+    def close_spool(self):
+        with self._lock:
+            if self._spool:
+                self._spool.close()
+                self._spool = None
+
+    def _append(self, line):
+        # Caller holds the lock
+        if self._spool:
+            self._spool.write(line + '\n')
+        self._pending.append(line)
+        if len(self._pending) > self.max_pending:
+            self._pending.popleft()
+            self._dropped += 1
+
+    def add_line(self, line):
+        with self._lock:
+            for part in str(line).split('\n'):
+                self._append(part)
+
+    def write(self, text):
+        """File-like write: complete lines are buffered, a trailing partial line is kept"""
+        with self._lock:
+            *lines, self._partial = (self._partial + text).split('\n')
+            for line in lines:
+                self._append(line.rstrip('\r'))
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            if self._spool:
+                self._spool.flush()
+
+    def flush_partial(self):
+        """Emits a trailing line without newline (call when the writer is done)"""
+        with self._lock:
+            if self._partial:
+                self._append(self._partial)
+                self._partial = ''
+
+    def drain(self, max_lines=500):
+        """Returns (lines, dropped): up to max_lines pending lines and how many were skipped since the last call"""
+        with self._lock:
+            count = min(max_lines, len(self._pending))
+            lines = [self._pending.popleft() for _ in range(count)]
+            dropped, self._dropped = self._dropped, 0
+        return lines, dropped
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._partial = ''
+            self._dropped = 0
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Memory Profile - Peak memory per pipeline phase (Python heap, process RSS, Chromium)
+Zeigt, ob Python, ReportLab, PyPDF2 oder der Browser den Speicher belegt
+"""
+
+import fnmatch
+import linecache
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from process_memory import MB, process_rss
+
+# Chromium metrics (CDP Performance.getMetrics) kept in the report
+BROWSER_METRICS = ('JSHeapUsedSize', 'JSHeapTotalSize', 'Nodes', 'Documents', 'JSEventListeners')
+# A new snapshot of the Python heap is taken when it grew by this factor since
+# the last one (and by at least MIN_SNAPSHOT_GROWTH since the phase started);
+# snapshots walk all traced blocks, so they must stay rare
+SNAPSHOT_GROWTH = 1.1
+MIN_SNAPSHOT_GROWTH = 1 * MB
+
+
+class _RssSampler(threading.Thread):
+    """Polls RSS in the background, because the peak usually lies between two phase boundaries
+
+    With filters, it also keeps a tracemalloc snapshot of the highest Python
+    heap it saw: phases like the ReportLab build or the PyPDF2 merge free
+    most of their memory before they end, so only a snapshot near the peak
+    shows where it went.
+    """
+
+    def __init__(self, interval, filters=None):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak_total = 0
+        self.peak_python = 0
+        self.filters = filters
+        self.peak_snapshot = None
+        self._baseline = tracemalloc.get_traced_memory()[0] if filters is not None else 0
+        self._snapshot_traced = self._baseline
+        self._stop_event = threading.Event()
+
+    def sample(self):
+        total = process_rss(include_children=True) or 0
+        python = process_rss(include_children=False) or 0
+        self.peak_total = max(self.peak_total, total)
+        self.peak_python = max(self.peak_python, python)
+        if self.filters is not None and tracemalloc.is_tracing():
+            current = tracemalloc.get_traced_memory()[0]
+            if current > self._snapshot_traced * SNAPSHOT_GROWTH and current - self._baseline >= MIN_SNAPSHOT_GROWTH:
+                self.peak_snapshot = tracemalloc.take_snapshot().filter_traces(self.filters)
+                self._snapshot_traced = current
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.sample()
+
+
+class MemoryProfiler:
+    """Records memory usage for each phase of a download run
+
+    Per phase it keeps the tracemalloc peak, the top allocation sites (by
+    line) at the sampled heap peak and those still alive at its end, the
+    sampled peak RSS of the Python
+    process and of all its children (Playwright driver and Chromium), and,
+    when a page is attached, Chromium's own JS heap metrics via CDP.
+    """
+
+    def __init__(self, top_n=10, frames=5, sample_interval=0.2):
+        self.top_n = top_n
+        self.frames = frames
+        self.sample_interval = sample_interval
+        self.phases = []
+        self._cdp = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracemalloc = True
+
+    def stop(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def phase(self, name):
+        """Measures everything that runs inside the with-block as phase name"""
+        self.start()
+        filters = self._own_filters()
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        tracemalloc.reset_peak()
+        rss_before = process_rss() or 0
+
+        sampler = _RssSampler(self.sample_interval, filters)
+        sampler.sample()
+        sampler.start()
+        started = time.perf_counter()
+        record = {'name': name, 'browser': {}}
+        self.phases.append(record)
+        try:
+            yield record
+        finally:
+            sampler.stop()
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(filters)
+            record.update({
+                'seconds': time.perf_counter() - started,
+                'traced_peak': peak,
+                'traced_end': current,
+                'rss_before': rss_before,
+                'rss_after': process_rss() or 0,
+                'peak_rss_python': sampler.peak_python,
+                'peak_rss_total': sampler.peak_total,
+                # At the sampled peak (falls back to the end for short phases)
+                'top_sites': self._top_sites(sampler.peak_snapshot or after, before),
+                'peak_sampled': sampler.peak_snapshot is not None,
+                'retained_sites': self._top_sites(after, before),
+            })
+
+    def _top_sites(self, snapshot, before):
+        return [
+            (self._format_site(stat.traceback), stat.size_diff, stat.count_diff)
+            for stat in snapshot.compare_to(before, 'lineno')[:self.top_n]
+            if stat.size_diff > 0
+        ]
+
+    @staticmethod
+    def _format_site(traceback):
+        # Package directory plus file name, e.g. PyPDF2/_reader.py:318
+        frame = traceback[0]
+        path = os.path.normpath(frame.filename)
+        short = os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+        return f"{short}:{frame.lineno}"
+
+    @staticmethod
+    def _own_filters():
+        """Excludes the profiler's own allocations (tracemalloc, sampler thread, RSS sampling) from the snapshots"""
+        import process_memory
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, fnmatch.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, process_memory.__file__),
+        ]
+        if process_memory.psutil is not None:
+            filters.append(tracemalloc.Filter(False, os.path.join(os.path.dirname(process_memory.psutil.__file__), '*')))
+        return filters
+
+    async def attach_page(self, page):
+        """Opens a CDP session on page, so browser metrics can be sampled (Chromium only)"""
+        try:
+            self._cdp = await page.context.new_cdp_session(page)
+            await self._cdp.send('Performance.enable')
+        except Exception as e:
+            print(f"  ⚠️  CDP-Metriken nicht verfügbar: {e}")
+            self._cdp = None
+
+    async def sample_browser(self):
+        """Stores Chromium's JS heap and DOM metrics in the current phase"""
+        if not self._cdp or not self.phases:
+            return
+        try:
+            result = await self._cdp.send('Performance.getMetrics')
+        except Exception:
+            return
+        metrics = {m['name']: m['value'] for m in result.get('metrics', []) if m['name'] in BROWSER_METRICS}
+        self.phases[-1]['browser'] = metrics
+
+    def detach_page(self):
+        self._cdp = None
+
+    def report(self):
+        """Returns the per-phase peak report as text"""
+        lines = ['Speicherprofil pro Phase', '=' * 78]
+        lines.append(f"{'Phase':<14}{'Dauer':>8}{'Py-Heap Peak':>14}{'RSS Python':>13}"
+                     f"{'RSS gesamt':>13}{'Browser':>12}")
+        for record in self.phases:
+            if 'seconds' not in record:
+                continue
+            children = max(record['peak_rss_total'] - record['peak_rss_python'], 0)
+            lines.append(
+                f"{record['name']:<14}{record['seconds']:>7.1f}s"
+                f"{record['traced_peak'] / MB:>11.1f} MB"
+                f"{record['peak_rss_python'] / MB:>10.1f} MB"
+                f"{record['peak_rss_total'] / MB:>10.1f} MB"
+                f"{children / MB:>9.1f} MB"
+            )
+
+        if self.phases:
+            worst = max((r for r in self.phases if 'seconds' in r), key=lambda r: r['peak_rss_total'], default=None)
+            if worst:
+                lines.append(f"\nHöchster Speicherbedarf: Phase '{worst['name']}' "
+                             f"({worst['peak_rss_total'] / MB:.1f} MB inkl. Browser)")
+
+        for record in self.phases:
+            if 'seconds' not in record:
+                continue
+            lines.append(f"\n[{record['name']}]")
+            if record['browser']:
+                heap_used = record['browser'].get('JSHeapUsedSize', 0) / MB
+                heap_total = record['browser'].get('JSHeapTotalSize', 0) / MB
+                lines.append(f"  Chromium JS-Heap: {heap_used:.1f} / {heap_total:.1f} MB, "
+                             f"DOM-Knoten: {int(record['browser'].get('Nodes', 0))}, "
+                             f"Dokumente: {int(record['browser'].get('Documents', 0))}")
+            if record['peak_sampled'] and record['top_sites']:
+                lines.append("  Größte Python-Allokationen beim Höchststand der Phase (Stichprobe):")
+                for site, size, count in record['top_sites']:
+                    lines.append(f"    {size / 1024:>10.1f} KB  {count:>7} Objekte  {site}")
+            if record['retained_sites']:
+                lines.append("  Größte am Phasenende noch belegte Python-Allokationen:")
+                for site, size, count in record['retained_sites']:
+                    lines.append(f"    {size / 1024:>10.1f} KB  {count:>7} Objekte  {site}")
+            elif not record['top_sites']:
+                lines.append("  Keine verbleibenden Python-Allokationen")
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.report())
+        return path
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Mock Board Server - Serves a synthetic Taskcard board for local tests and load tests
+Gleiche DOM-Struktur wie Taskcard (Spalten, Karten, Bilder, klickbare PDF-Anhänge), kein Internet nötig
+"""
+
+import argparse
+import html
+import struct
+import zlib
+
+from aiohttp import web
+
+DEFAULT_COLUMNS = 4
+DEFAULT_CARDS = 6
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+.board-container {{ display: flex; overflow-x: auto; width: 100vw; }}
+.draggableList {{ min-width: 320px; margin: 8px; }}
+.board-card {{ border: 1px solid #ccc; margin: 6px 0; padding: 6px; }}
+.q-img__image {{ width: 120px; height: 80px; background-size: cover; }}
+</style>
+</head>
+<body>
+<div class="board-information-title">{title}</div>
+<div class="board-container">
+{columns}
+</div>
+<script>
+// Like Taskcard: clicking an attachment starts a download
+document.querySelectorAll('[data-file]').forEach((el) => {{
+    el.addEventListener('click', () => {{
+        const a = document.createElement('a');
+        a.href = el.dataset.file;
+        a.download = '';
+        document.body.appendChild(a);
+        a.click();
+        a.remove();
+    }});
+}});
+</script>
+</body>
+</html>
+"""
+
+
+def make_pdf(text):
+    """Builds a minimal valid one-page PDF showing text"""
+    text = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    content = f"BT /F1 18 Tf 72 720 Td ({text}) Tj ET".encode('latin-1', 'replace')
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def make_png(seed, width=160, height=120):
+    """Builds an RGB PNG with a seed-dependent gradient (no Pillow needed)"""
+    rows = bytearray()
+    for y in range(height):
+        rows.append(0)
+        for x in range(width):
+            rows += bytes(((x * 255 // width + seed * 40) % 256, (y * 255 // height) % 256, (seed * 70) % 256))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(bytes(rows))) + chunk(b'IEND', b'')
+
+
+def _int_param(request, name, default, maximum):
+    try:
+        return max(0, min(int(request.query.get(name, default)), maximum))
+    except ValueError:
+        return default
+
+
+def render_board(columns, cards, images, attachments, base_url):
+    parts = []
+    for col in range(1, columns + 1):
+        card_parts = []
+        for card in range(1, cards + 1):
+            key = f"{col}-{card}"
+            content = [f'<div class="contenteditable">Beschreibung der Karte {key}.\nZweite Zeile.</div>',
+                       f'<a href="https://example.org/{key}">Link {key}</a>']
+            if images and card % 2 == 1:
+                content.append(f'<img src="{base_url}/img/{key}.png" alt="Bild {key}">')
+            if images and card % 3 == 0:
+                content.append(f'<div class="q-img__image" style="background-image: url(&quot;{base_url}/img/bg-{key}.png&quot;)"></div>')
+            if attachments and card % 2 == 0:
+                content.append(f'<div class="border cursor-pointer" data-file="/files/anhang-{key}.pdf">'
+                               f'<div class="text-caption">anhang-{key}.pdf PDF · 1 KB</div></div>')
+            card_parts.append(
+                '<div class="board-card">'
+                f'<div class="board-card-header"><div class="contenteditable">Karte {key}</div></div>'
+                f'<div class="board-card-content">{"".join(content)}</div>'
+                '</div>'
+            )
+        parts.append(
+            '<div class="draggableList">'
+            f'<div class="board-list-header"><div class="contenteditable">Spalte {col}</div></div>'
+            f'{"".join(card_parts)}'
+            '</div>'
+        )
+    return '\n'.join(parts)
+
+
+async def handle_board(request):
+    """The board page; ?columns=N&cards=M&images=0|1&attachments=0|1 shape the board"""
+    columns = _int_param(request, 'columns', DEFAULT_COLUMNS, 200)
+    cards = _int_param(request, 'cards', DEFAULT_CARDS, 500)
+    images = _int_param(request, 'images', 1, 1)
+    attachments = _int_param(request, 'attachments', 1, 1)
+    base_url = f"{request.scheme}://{request.host}"
+    title = html.escape(request.query.get('title', f'Mock-Board {columns}x{cards}'))
+    body = PAGE_TEMPLATE.format(title=title, columns=render_board(columns, cards, images, attachments, base_url))
+    return web.Response(text=body, content_type='text/html')
+
+
+async def handle_image(request):
+    name = request.match_info['name']
+    return web.Response(body=make_png(zlib.crc32(name.encode()) % 7), content_type='image/png')
+
+
+async def handle_file(request):
+    name = request.match_info['name']
+    return web.Response(body=make_pdf(f"Anhang {name}"), content_type='application/pdf',
+                        headers={'Content-Disposition': f'attachment; filename="{name}"'})
+
+
+def create_app():
+    app = web.Application()
+    app.router.add_get('/', handle_board)
+    app.router.add_get('/img/{name}', handle_image)
+    app.router.add_get('/files/{name}', handle_file)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve a synthetic Taskcard board, e.g. http://127.0.0.1:8765/?columns=4&cards=6'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    args = parser.parse_args()
+    web.run_app(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Overview Render - ReportLab story of the board overview (title page, TOC, one chapter per column)
+Spalten können einzeln (auch parallel in einem Prozesspool) als PDF-Fragment gerendert und danach zur Übersicht zusammengesetzt werden
+"""
+
+import os
+from concurrent.futures import as_completed
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image as RLImage
+
+from attachment_routing import EMBED, INLINE_IMAGE, MAX_EMBED_SIZE, MERGE, embed_link, route
+from download_plan import format_size
+from preflight import make_process_pool
+
+# Style name of the column chapter titles; their pages are recorded for the TOC
+CHAPTER_STYLE = 'ChapterTitle'
+
+
+def escape_html(text):
+    """Escapes HTML special characters"""
+    if not text:
+        return ""
+    text = str(text)
+    text = text.replace('&', '&amp;')
+    text = text.replace('<', '&lt;')
+    text = text.replace('>', '&gt;')
+    return text
+
+
+def make_styles():
+    """Paragraph styles of the overview"""
+    styles = getSampleStyleSheet()
+    return {
+        'normal': styles['Normal'],
+        'title': ParagraphStyle('CustomTitle', parent=styles['Heading1'],
+            fontSize=24, textColor=colors.HexColor('#1a73e8'), spaceAfter=30,
+            spaceBefore=10, alignment=TA_CENTER, fontName='Helvetica-Bold'),
+        'toc_title': ParagraphStyle('TOCTitle', parent=styles['Heading2'],
+            fontSize=18, spaceAfter=20, spaceBefore=10, fontName='Helvetica-Bold'),
+        'toc_entry': ParagraphStyle('TOCEntry', parent=styles['Normal'],
+            fontSize=12, leftIndent=20, spaceAfter=8, fontName='Helvetica'),
+        'chapter': ParagraphStyle(CHAPTER_STYLE, parent=styles['Heading1'],
+            fontSize=18, textColor=colors.HexColor('#34a853'), spaceAfter=15,
+            spaceBefore=10, fontName='Helvetica-Bold'),
+        'card_title': ParagraphStyle('CardTitle', parent=styles['Heading2'],
+            fontSize=14, textColor=colors.HexColor('#ea4335'), spaceAfter=10,
+            spaceBefore=15, leftIndent=10, fontName='Helvetica-Bold'),
+        'card_content': ParagraphStyle('CardContent', parent=styles['Normal'],
+            fontSize=11, leftIndent=20, spaceAfter=6, fontName='Helvetica'),
+        'link': ParagraphStyle('Link', parent=styles['Normal'],
+            fontSize=10, textColor=colors.HexColor('#1a73e8'),
+            leftIndent=20, spaceAfter=4, fontName='Helvetica'),
+        'attachment_note': ParagraphStyle('AttachmentNote', parent=styles['Normal'],
+            fontSize=10, textColor=colors.HexColor('#666666'), leftIndent=20,
+            spaceAfter=8, fontName='Helvetica-Oblique'),
+    }
+
+
+def skipped_by_card(data):
+    """Items left out by the byte budget, by card id (they get a placeholder on their card)"""
+    by_card = {}
+    for item in data.get('skipped', []):
+        by_card.setdefault(item.get('card_id'), []).append(item)
+    return by_card
+
+
+def front_matter_story(data, styles, chapter_pages=None):
+    """Title page and table of contents
+
+    chapter_pages are the page numbers on which the columns start in the
+    final document (without them the TOC lists no pages).
+    """
+    story = []
+
+    # 1. TITLE PAGE
+    story.append(Paragraph(escape_html(data.get('board_title', 'Taskcard Board')), styles['title']))
+    story.append(Spacer(1, 0.5*cm))
+    date_style = ParagraphStyle('DateStyle', parent=styles['normal'],
+        fontSize=10, textColor=colors.HexColor('#666666'), alignment=TA_CENTER)
+    story.append(Paragraph(f"Erstellt am: {datetime.now().strftime('%d.%m.%Y %H:%M')}", date_style))
+
+    # Add extraction strategy info
+    strategy = data.get('extraction_strategy', '')
+    if strategy:
+        strategy_style = ParagraphStyle('StrategyStyle', parent=styles['normal'],
+            fontSize=9, textColor=colors.HexColor('#666666'),
+            alignment=TA_CENTER, fontName='Helvetica-Oblique')
+        story.append(Spacer(1, 0.3*cm))
+        story.append(Paragraph(f"Extrahiert mit: {escape_html(strategy)}", strategy_style))
+
+    story.append(PageBreak())
+
+    # 2. TABLE OF CONTENTS
+    story.append(Paragraph("Inhaltsverzeichnis", styles['toc_title']))
+    story.append(Spacer(1, 0.5*cm))
+
+    for col_idx, column in enumerate(data['columns']):
+        col_title = column.get('title', f'Spalte {col_idx + 1}')
+        card_count = len(column.get('cards', []))
+        toc_text = f"{col_idx + 1}. {escape_html(col_title)} ({card_count} Karte{'n' if card_count != 1 else ''})"
+        if chapter_pages:
+            toc_text += f" · Seite {chapter_pages[col_idx]}"
+        story.append(Paragraph(toc_text, styles['toc_entry']))
+
+    story.append(PageBreak())
+    return story
+
+
+def _image_flowables(img, styles):
+    local_path = img.get('local_path')
+    alt = img.get('alt', 'Bild')
+    if not (local_path and os.path.exists(local_path)):
+        return []
+
+    story = []
+    try:
+        # Calculate maximum width (PDF page width minus margins)
+        max_width = A4[0] - 4*cm  # 2cm left + 2cm right margin
+        max_height = 10*cm  # Maximum height to prevent huge images
+
+        # Create ReportLab Image object
+        img_obj = RLImage(local_path)
+
+        # Get original dimensions
+        img_width = img_obj.imageWidth
+        img_height = img_obj.imageHeight
+
+        # Calculate scaling to fit within max dimensions
+        width_scale = max_width / img_width
+        height_scale = max_height / img_height
+        scale = min(width_scale, height_scale, 1.0)  # Don't upscale
+
+        # Set final dimensions
+        img_obj.drawWidth = img_width * scale
+        img_obj.drawHeight = img_height * scale
+
+        # Add image to story with alt text caption
+        story.append(Spacer(1, 0.2*cm))
+        story.append(img_obj)
+
+        # Add caption if alt text exists
+        if alt and alt != 'Bild':
+            caption_style = ParagraphStyle('ImageCaption', parent=styles['card_content'],
+                fontSize=9, textColor=colors.HexColor('#666666'),
+                fontName='Helvetica-Oblique', alignment=TA_CENTER)
+            story.append(Spacer(1, 0.1*cm))
+            story.append(Paragraph(escape_html(alt), caption_style))
+
+        story.append(Spacer(1, 0.3*cm))
+
+    except Exception as e:
+        print(f"Fehler beim Einfügen von Bild {local_path}: {e}")
+        # Add note about missing image
+        error_style = ParagraphStyle('ImageError', parent=styles['card_content'],
+            fontSize=9, textColor=colors.HexColor('#ea4335'),
+            fontName='Helvetica-Oblique')
+        story = [Paragraph(f"⚠️ Bild konnte nicht eingefügt werden: {alt}", error_style), Spacer(1, 0.2*cm)]
+    return story
+
+
+def _file_note(record, link_base):
+    """Placeholder of an attachment that is neither a PDF nor an image"""
+    name = Path(record['file_path']).name
+    size = format_size(record.get('size'))
+    if link_base is not None:
+        # Bundle: the file sits next to the PDF, a relative link is enough
+        target = quote(Path(os.path.relpath(record['file_path'], link_base)).as_posix())
+        return f"📎 <a href='{target}' color='blue'>{escape_html(name)}</a> ({size}, Datei im Bundle)"
+    if (record.get('size') or 0) > MAX_EMBED_SIZE:
+        return f"📎 {escape_html(name)} ({size}, zu groß zum Einbetten: {escape_html(record['file_path'])})"
+    return f"📎 <a href='{embed_link(record)}' color='blue'>{escape_html(name)}</a> ({size}, eingebettete Datei)"
+
+
+def column_story(col_idx, column, files_by_card, skipped, styles, link_base=None):
+    """Chapter of one column with all its cards, ending with a page break
+
+    files_by_card maps card ids to downloaded (preflighted) file records,
+    skipped maps card ids to items left out by the byte budget. Attachments
+    are routed by their detected type (see attachment_routing.py); with
+    link_base, other files are linked relative to it instead of embedded.
+    """
+    story = []
+
+    # Chapter title (Column name)
+    col_title = column.get('title', f'Spalte {col_idx + 1}')
+    story.append(Paragraph(f"{col_idx + 1}. {escape_html(col_title)}", styles['chapter']))
+    story.append(Spacer(1, 0.5*cm))
+
+    cards = column.get('cards', [])
+    if not cards:
+        no_cards_style = ParagraphStyle('NoCards', parent=styles['card_content'], fontName='Helvetica-Oblique')
+        story.append(Paragraph("<i>Keine Karten vorhanden</i>", no_cards_style))
+        story.append(Spacer(1, 0.5*cm))
+
+    for card_idx, card in enumerate(cards):
+        # Card title (Subchapter)
+        card_title = card.get('title', f'Karte {card_idx + 1}')
+        story.append(Paragraph(f"{col_idx + 1}.{card_idx + 1} {escape_html(card_title)}", styles['card_title']))
+        story.append(Spacer(1, 0.2*cm))
+
+        # Card description/content
+        description = card.get('description', '').strip()
+        if description:
+            for line in description.split('\n'):
+                if line.strip():
+                    story.append(Paragraph(escape_html(line.strip()), styles['card_content']))
+            story.append(Spacer(1, 0.3*cm))
+
+        routed = {}
+        for record in files_by_card.get(card.get('id'), []):
+            routed.setdefault(route(record), []).append(record)
+
+        # Card images, then attachments that turned out to be images
+        for img in card.get('images', []):
+            story.extend(_image_flowables(img, styles))
+        for record in routed.get(INLINE_IMAGE, []):
+            story.extend(_image_flowables({'local_path': record['file_path'], 'alt': record.get('info') or 'Bild'}, styles))
+
+        # Card links
+        links = card.get('links', [])
+        if links:
+            for link in links:
+                link_text = f"🔗 <a href='{link['url']}' color='blue'>{escape_html(link['text'][:80])}</a>"
+                story.append(Paragraph(link_text, styles['link']))
+            story.append(Spacer(1, 0.3*cm))
+
+        # Note about PDF attachments that will follow
+        pdf_attachments = routed.get(MERGE, [])
+
+        if pdf_attachments:
+            att_count = len(pdf_attachments)
+            story.append(Paragraph(f"📎 {att_count} PDF-Anhang{'̈e' if att_count > 1 else ''} (folgt auf nächsten Seiten)",
+                                   styles['attachment_note']))
+
+        for record in routed.get(EMBED, []):
+            story.append(Paragraph(_file_note(record, link_base), styles['attachment_note']))
+
+        for item in skipped.get(card.get('id'), []):
+            kind = 'Bild' if item['kind'] == 'image' else 'Anhang'
+            note = f"{kind} nicht geladen: {item['label'][:80]} ({format_size(item.get('size'))}, {item['reason']})"
+            story.append(Paragraph(escape_html(note), styles['attachment_note']))
+
+        story.append(Spacer(1, 0.5*cm))
+
+    # Page break after each column (chapter)
+    story.append(PageBreak())
+    return story
+
+
+class _OverviewDoc(SimpleDocTemplate):
+    """Records the page of every column chapter title and the page count"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chapter_pages = []
+        self.page_count = 0
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, Paragraph) and flowable.style.name == CHAPTER_STYLE:
+            self.chapter_pages.append(self.page)
+
+    def afterPage(self):
+        self.page_count = self.page
+
+
+def build_pdf(path, story):
+    """Builds story into path (via a temp file next to it, so a crash never leaves a truncated PDF)
+
+    Returns (chapter_pages, page_count): the pages on which the column
+    chapters start and the number of pages.
+    """
+    partial_path = Path(f"{path}.part")
+    doc = _OverviewDoc(
+        str(partial_path),
+        pagesize=A4,
+        rightMargin=2*cm,
+        leftMargin=2*cm,
+        topMargin=2*cm,
+        bottomMargin=2*cm
+    )
+    doc.build(story)
+    os.replace(partial_path, path)
+    return doc.chapter_pages, doc.page_count
+
+
+def render_column_fragment(path, col_idx, column, files_by_card, skipped, link_base=None):
+    """Renders the chapter of one column as a PDF of its own; returns its page count"""
+    _, page_count = build_pdf(path, column_story(col_idx, column, files_by_card, skipped, make_styles(), link_base))
+    return page_count
+
+
+def render_columns(fragment_dir, columns, indices, files_by_card, skipped, workers, link_base=None, progress=None):
+    """Renders the chapters of the given columns in a process pool
+
+    Each worker only gets its column and the records of its cards. Returns
+    {column index: (fragment path, page count)}; progress(done, total) is
+    called as fragments complete.
+    """
+    indices = list(indices)
+    fragments = {}
+    if not indices:
+        return fragments
+    with make_process_pool(max(1, min(workers, len(indices)))) as pool:
+        futures = {}
+        for col_idx in indices:
+            column = columns[col_idx]
+            card_ids = {card.get('id') for card in column.get('cards', [])}
+            path = Path(fragment_dir) / f"column_{col_idx + 1:04d}.pdf"
+            future = pool.submit(render_column_fragment, path, col_idx, column,
+                                 {card_id: files_by_card[card_id] for card_id in card_ids if card_id in files_by_card},
+                                 {card_id: skipped[card_id] for card_id in card_ids if card_id in skipped},
+                                 link_base)
+            futures[future] = (col_idx, path)
+        for done, future in enumerate(as_completed(futures), 1):
+            col_idx, path = futures[future]
+            fragments[col_idx] = (path, future.result())
+            if progress:
+                progress(done, len(futures))
+    return fragments
+
+
+def render_front_matter(path, data, chapter_starts=None):
+    """Renders title page and TOC; returns its page count
+
+    chapter_starts are the first pages of the columns counted from the
+    first page after the TOC. The printed page numbers depend on the length
+    of the TOC itself, so it is rendered again if that differs from the
+    assumed length.
+    """
+    styles = make_styles()
+    front_pages = 2  # title page and a one-page TOC
+    for _ in range(3):
+        chapter_pages = [front_pages + start for start in chapter_starts] if chapter_starts else None
+        _, page_count = build_pdf(path, front_matter_story(data, styles, chapter_pages))
+        if not chapter_starts or page_count == front_pages:
+            break
+        front_pages = page_count
+    return page_count
+
+
+def assemble_overview(target, data, body_paths, chapter_starts):
+    """Title page and TOC (with page numbers), followed by the column chapters in body_paths"""
+    front_path = Path(f"{target}.front.pdf")
+    try:
+        render_front_matter(front_path, data, chapter_starts)
+        concatenate([front_path] + list(body_paths), target)
+    finally:
+        front_path.unlink(missing_ok=True)
+
+
+def concatenate(paths, target):
+    """Joins PDF fragments page by page into target"""
+    from PyPDF2 import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for path in paths:
+        for page in PdfReader(str(path)).pages:
+            writer.add_page(page)
+    partial_path = Path(f"{target}.part")
+    with open(partial_path, 'wb') as f:
+        writer.write(f)
+    os.replace(partial_path, target)
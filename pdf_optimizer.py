@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+PDF Optimizer - Shrinks the final Taskcard PDF before it is archived
+Entfernt doppelte Bilder/Schriften, komprimiert Streams, optional Linearisierung
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    StreamObject,
+)
+
+
+def _stream_key(stream, *extra):
+    """Content hash of a stream object (raw data plus its dictionary, without /Length)"""
+    digest = hashlib.sha256()
+    digest.update(stream._data if isinstance(stream._data, bytes) else str(stream._data).encode())
+    for key in sorted(k for k in stream.keys() if k != '/Length'):
+        digest.update(key.encode())
+        digest.update(repr(stream[key]).encode())
+    for value in extra:
+        digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _font_key(font):
+    """Content hash of an embedded font, None for non-embedded base fonts"""
+    descriptor = font.get('/FontDescriptor')
+    if descriptor is None and '/DescendantFonts' in font:
+        descendants = font['/DescendantFonts'].get_object()
+        if descendants:
+            descriptor = descendants[0].get_object().get('/FontDescriptor')
+    if descriptor is None:
+        return None
+    descriptor = descriptor.get_object()
+
+    font_file = None
+    for key in ('/FontFile', '/FontFile2', '/FontFile3'):
+        if key in descriptor:
+            font_file = descriptor[key].get_object()
+            break
+    if font_file is None:
+        return None
+
+    to_unicode = font.get('/ToUnicode')
+    to_unicode_data = to_unicode.get_object()._data if to_unicode is not None else b''
+    return _stream_key(
+        font_file,
+        font.get('/BaseFont'), font.get('/Subtype'), font.get('/Encoding'),
+        font.get('/Widths'), to_unicode_data,
+    )
+
+
+class _Deduplicator:
+    """Points identical image XObjects and embedded fonts at a single object"""
+
+    def __init__(self):
+        self.canonical = {}
+        self.replaced = 0
+        self._visited = set()
+
+    def _canonical_ref(self, key, ref):
+        existing = self.canonical.setdefault(key, ref)
+        if existing.idnum != ref.idnum:
+            self.replaced += 1
+        return existing
+
+    def process_resources(self, resources):
+        if resources is None:
+            return
+        resources = resources.get_object()
+        if id(resources) in self._visited:
+            return
+        self._visited.add(id(resources))
+
+        xobjects = resources.get('/XObject')
+        if xobjects is not None:
+            xobjects = xobjects.get_object()
+            for name in list(xobjects.keys()):
+                ref = xobjects.raw_get(name)
+                if not isinstance(ref, IndirectObject):
+                    continue
+                obj = ref.get_object()
+                subtype = obj.get('/Subtype')
+                if subtype == '/Image':
+                    xobjects[NameObject(name)] = self._canonical_ref(('image', _stream_key(obj)), ref)
+                elif subtype == '/Form':
+                    # Form XObjects can reference images and fonts themselves
+                    self.process_resources(obj.get('/Resources'))
+
+        fonts = resources.get('/Font')
+        if fonts is not None:
+            fonts = fonts.get_object()
+            for name in list(fonts.keys()):
+                ref = fonts.raw_get(name)
+                if not isinstance(ref, IndirectObject):
+                    continue
+                key = _font_key(ref.get_object())
+                if key:
+                    fonts[NameObject(name)] = self._canonical_ref(('font', key), ref)
+
+
+def _drop_unreferenced(writer):
+    """Replaces writer objects that are no longer reachable from the root by null"""
+    reachable = set()
+    pending = [writer._root]
+    if writer._info is not None:
+        pending.append(writer._info)
+
+    while pending:
+        obj = pending.pop()
+        if isinstance(obj, IndirectObject):
+            if obj.pdf is not writer or obj.idnum in reachable:
+                continue
+            reachable.add(obj.idnum)
+            obj = obj.get_object()
+        if isinstance(obj, DictionaryObject):
+            pending.extend(obj.values())
+        elif isinstance(obj, ArrayObject):
+            pending.extend(obj)
+
+    dropped = 0
+    for idx, obj in enumerate(writer._objects):
+        if obj is not None and (idx + 1) not in reachable and not isinstance(obj, NullObject):
+            writer._objects[idx] = NullObject()
+            dropped += 1
+    return dropped
+
+
+def _compress_content_streams(writer):
+    """Flate-compresses page content streams that were written without a filter"""
+    compressed = 0
+    for page in writer.pages:
+        contents = page.get('/Contents')
+        if contents is None:
+            continue
+        streams = contents.get_object()
+        streams = list(streams) if isinstance(streams, ArrayObject) else [contents]
+        if all(isinstance(s.get_object(), StreamObject) and '/Filter' in s.get_object() for s in streams):
+            continue
+        page.compress_content_streams()
+        compressed += 1
+    return compressed
+
+
+def _rewrite_with_object_streams(source, target, linearize):
+    """Writes compressed object streams (and optionally linearizes) via pikepdf or qpdf
+
+    PyPDF2 can neither write object streams nor linearize. Returns False if
+    neither pikepdf nor the qpdf command line tool is available.
+    """
+    try:
+        import pikepdf
+    except ImportError:
+        pikepdf = None
+
+    if pikepdf is not None:
+        with pikepdf.open(source) as pdf:
+            pdf.save(
+                target,
+                compress_streams=True,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                linearize=linearize,
+            )
+        return True
+
+    qpdf = shutil.which('qpdf')
+    if qpdf:
+        command = [qpdf, '--object-streams=generate', '--compress-streams=y']
+        if linearize:
+            command.append('--linearize')
+        subprocess.run(command + [str(source), str(target)], check=True, capture_output=True)
+        return True
+
+    return False
+
+
+def _format_size(size):
+    return f"{size / (1024 * 1024):.2f} MB" if size >= 1024 * 1024 else f"{size / 1024:.1f} KB"
+
+
+def optimize_pdf(pdf_path, linearize=False):
+    """Optimizes a PDF in place and prints the size before and after
+
+    1. Deduplicates identical image XObjects and embedded fonts (e.g. an
+       image used on several cards, or the same attachment merged twice)
+    2. Compresses uncompressed content streams and drops orphaned objects
+    3. Writes compressed object streams and, if requested, linearizes for
+       fast web view (requires pikepdf or qpdf)
+
+    The original file is only replaced if the result is smaller, or if
+    linearization was requested and succeeded.
+
+    Returns dict with 'before' and 'after' size in bytes.
+    """
+    pdf_path = Path(pdf_path)
+    size_before = pdf_path.stat().st_size
+    print(f"\nOptimiere PDF ({_format_size(size_before)})...")
+
+    fd, deduped_name = tempfile.mkstemp(dir=pdf_path.parent, prefix=f".{pdf_path.stem}.", suffix='.pdf')
+    os.close(fd)
+    deduped_path = Path(deduped_name)
+    # mkstemp creates owner-only files; the PDF must stay readable for others
+    shutil.copymode(pdf_path, deduped_path)
+    final_name = None
+
+    try:
+        reader = PdfReader(str(pdf_path))
+        writer = PdfWriter()
+        for page in reader.pages:
+            writer.add_page(page)
+        if reader.metadata:
+            writer.add_metadata(reader.metadata)
+
+        deduplicator = _Deduplicator()
+        for page in writer.pages:
+            deduplicator.process_resources(page.get('/Resources'))
+        compressed = _compress_content_streams(writer)
+        dropped = _drop_unreferenced(writer)
+
+        with open(deduped_path, 'wb') as f:
+            writer.write(f)
+        print(f"  Duplikate entfernt: {deduplicator.replaced}, "
+              f"Objekte verworfen: {dropped}, Seiten komprimiert: {compressed}")
+
+        candidate = deduped_path
+        fd, final_name = tempfile.mkstemp(dir=pdf_path.parent, prefix=f".{pdf_path.stem}.", suffix='.pdf')
+        os.close(fd)
+        shutil.copymode(pdf_path, final_name)
+        if _rewrite_with_object_streams(deduped_path, final_name, linearize):
+            candidate = Path(final_name)
+            if linearize:
+                print("  Linearisiert für schnelle Web-Anzeige")
+        else:
+            print("  ℹ️  pikepdf/qpdf nicht gefunden - keine Objekt-Streams/Linearisierung")
+
+        size_after = candidate.stat().st_size
+        if size_after < size_before or (linearize and candidate != deduped_path):
+            # pikepdf/qpdf may have recreated the file
+            shutil.copymode(pdf_path, candidate)
+            os.replace(candidate, pdf_path)
+        else:
+            size_after = size_before
+
+    except Exception as e:
+        print(f"  ⚠️  Optimierung übersprungen: {e}")
+        size_after = size_before
+
+    finally:
+        deduped_path.unlink(missing_ok=True)
+        if final_name:
+            Path(final_name).unlink(missing_ok=True)
+
+    saved = size_before - size_after
+    percent = (saved / size_before * 100) if size_before else 0
+    print(f"  Größe vorher: {_format_size(size_before)}, nachher: {_format_size(size_after)} (-{percent:.1f}%)")
+    return {'before': size_before, 'after': size_after}
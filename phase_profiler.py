@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Phase Profiler - cProfile per pipeline phase with one pstats file each
+Findet die heißen Python-Pfade (Paragraphen, PyPDF2-Seitenkopien, ...) ohne Code anzupassen
+"""
+
+import cProfile
+import io
+import pstats
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class PhaseProfiler:
+    """Profiles each pipeline phase separately
+
+    Phases may be nested (e.g. 'merge' -> 'merge:write'). Only one profiler
+    can be active per thread, so entering a nested phase pauses the outer
+    one: every pstats file holds the time spent in its phase minus its
+    nested phases. Work handed to other threads (asyncio.to_thread) is not
+    included.
+    """
+
+    def __init__(self, output_dir, top_n=25):
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.results = []
+        self._stack = []
+        self._started_phases = 0
+
+    @contextmanager
+    def phase(self, name):
+        if self._stack:
+            self._stack[-1].disable()
+        if self._started_phases == 0:
+            self._clear_old_results()
+        self._started_phases += 1
+        number = self._started_phases
+
+        profile = cProfile.Profile()
+        self._stack.append(profile)
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._stack.pop()
+            self._save(number, name, profile, time.perf_counter() - started)
+            if self._stack:
+                self._stack[-1].enable()
+
+    def _clear_old_results(self):
+        """Removes pstats files of an earlier run, so the summary only covers this one"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for old in self.output_dir.glob('*.pstats'):
+            old.unlink()
+
+    def _save(self, number, name, profile, seconds):
+        # Numbered in start order, so nested phases sort below their parent
+        safe_name = re.sub(r'[^A-Za-z0-9_-]+', '_', name)
+        path = self.output_dir / f"{number:02d}_{safe_name}.pstats"
+        profile.dump_stats(str(path))
+        self.results.append({'number': number, 'name': name, 'path': path, 'seconds': seconds})
+        self.results.sort(key=lambda result: result['number'])
+
+    def summary(self):
+        """Returns the per-phase durations and the combined top-N functions as text"""
+        out = io.StringIO()
+        out.write("Profil pro Phase (Wandzeit inkl. verschachtelter Phasen)\n")
+        out.write("=" * 78 + "\n")
+        for result in self.results:
+            out.write(f"{result['name']:<24}{result['seconds']:>9.2f}s   {result['path'].name}\n")
+
+        if self.results:
+            combined = pstats.Stats(*(str(r['path']) for r in self.results), stream=out)
+            combined.strip_dirs()
+            out.write(f"\nAlle Phasen zusammen - Top {self.top_n} nach Eigenzeit\n")
+            combined.sort_stats('tottime').print_stats(self.top_n)
+            out.write(f"\nAlle Phasen zusammen - Top {self.top_n} nach Gesamtzeit\n")
+            combined.sort_stats('cumulative').print_stats(self.top_n)
+        return out.getvalue()
+
+    def write_summary(self):
+        summary_path = self.output_dir / 'summary.txt'
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        summary_path.write_text(self.summary(), encoding='utf-8')
+        return summary_path
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Preflight - Checks downloaded files in a process pool before they are merged
+Dateityp anhand der Magic Bytes, PDF-Struktur, Seitenzahl, Verschlüsselung, optionale Reparatur
+"""
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+# Preflight status of a file (record['preflight']['status'])
+OK = 'ok'
+REPAIRED = 'repaired'
+ENCRYPTED = 'encrypted'
+CORRUPT = 'corrupt'
+EMPTY = 'empty'
+NOT_PDF = 'not_pdf'
+
+# Statuses whose PDF can be merged
+MERGEABLE = (OK, REPAIRED)
+
+DEFAULT_WORKERS = 4
+SNIFF_BYTES = 1024
+
+_SIGNATURES = [
+    (b'%PDF-', 'pdf'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'PK\x03\x04', 'zip'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'ole'),  # .doc/.xls/.ppt
+    (b'{\\rtf', 'rtf'),
+    (b'ID3', 'mp3'),
+    (b'OggS', 'ogg'),
+    (b'fLaC', 'flac'),
+    (b'\x1aE\xdf\xa3', 'webm'),
+    (b'7z\xbc\xaf\x27\x1c', '7z'),
+    (b'Rar!\x1a\x07', 'rar'),
+]
+
+
+def sniff_type(path):
+    """Detects the file type from its first bytes (the extension is not trusted)"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        return 'missing'
+    if not head:
+        return 'empty'
+    # Some servers prepend junk or a BOM before the PDF header
+    if b'%PDF-' in head:
+        return 'pdf'
+    for signature, kind in _SIGNATURES:
+        if head.startswith(signature):
+            return kind
+    if head[:4] == b'RIFF' and head[8:12] in (b'WEBP', b'WAVE', b'AVI '):
+        return {b'WEBP': 'webp', b'WAVE': 'wav', b'AVI ': 'avi'}[head[8:12]]
+    if head[4:8] == b'ftyp':
+        return 'mp4'
+    text = head.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if text.startswith((b'<!doctype html', b'<html', b'<head', b'<body')):
+        return 'html'
+    if text.startswith(b'<?xml') or text.startswith(b'<svg'):
+        return 'svg' if b'<svg' in text else 'xml'
+    return 'unknown'
+
+
+def _count_pages(path):
+    """Opens a PDF with PyPDF2 and returns (page count, encrypted); raises if unreadable"""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(str(path), strict=False)
+    encrypted = reader.is_encrypted
+    if encrypted:
+        # Owner-password-only PDFs (print/copy restrictions) open with an empty password
+        try:
+            if not reader.decrypt(''):
+                return 0, True
+        except Exception:
+            return 0, True
+    pages = len(reader.pages)
+    # Touch every page, so a broken page tree fails here and not in the merge
+    for page in reader.pages:
+        page.mediabox
+    return pages, False
+
+
+def _repair_pdf(path, repair_dir):
+    """Rewrites a damaged PDF into repair_dir via pikepdf, qpdf or PyPDF2; returns the repaired path or None"""
+    source = Path(path)
+    fd, target = tempfile.mkstemp(dir=repair_dir, prefix=f"{source.stem}.", suffix='.repaired.pdf')
+    os.close(fd)
+    target = Path(target)
+
+    try:
+        import pikepdf
+    except ImportError:
+        pikepdf = None
+
+    try:
+        if pikepdf is not None:
+            with pikepdf.open(source) as pdf:
+                pdf.save(target)
+            return str(target)
+
+        qpdf = shutil.which('qpdf')
+        if qpdf:
+            # Exit code 3 means "succeeded with warnings"
+            result = subprocess.run([qpdf, str(source), str(target)], capture_output=True)
+            if result.returncode in (0, 3) and target.stat().st_size:
+                return str(target)
+
+        from PyPDF2 import PdfReader, PdfWriter
+
+        reader = PdfReader(str(source), strict=False)
+        writer = PdfWriter()
+        for page in reader.pages:
+            writer.add_page(page)
+        with open(target, 'wb') as f:
+            writer.write(f)
+        return str(target)
+    except Exception:
+        if target.exists():
+            target.unlink()
+        return None
+
+
+def inspect_file(path, repair_dir=None):
+    """Preflight of one file; runs in a worker process or thread
+
+    With repair_dir, damaged PDFs are repaired into that directory (never
+    next to the downloaded file, which may be archived or bundled). Returns
+    a dict with kind, status, pages, error and (after a successful repair)
+    repaired_path.
+    """
+    result = {'kind': sniff_type(path), 'status': NOT_PDF, 'pages': 0, 'error': None}
+    if result['kind'] in ('missing', 'empty'):
+        result['status'] = EMPTY
+        return result
+    if result['kind'] != 'pdf':
+        return result
+
+    try:
+        pages, encrypted = _count_pages(path)
+    except Exception as e:
+        result['status'] = CORRUPT
+        result['error'] = f"{type(e).__name__}: {e}"
+    else:
+        if encrypted:
+            result['status'] = ENCRYPTED
+            result['error'] = 'Passwortgeschützt'
+        elif pages == 0:
+            result['status'] = CORRUPT
+            result['error'] = 'PDF ohne Seiten'
+        else:
+            result['status'] = OK
+            result['pages'] = pages
+            return result
+
+    if repair_dir and result['status'] == CORRUPT:
+        repaired = _repair_pdf(path, repair_dir)
+        if repaired:
+            try:
+                pages, encrypted = _count_pages(repaired)
+            except Exception:
+                pages, encrypted = 0, False
+            if pages and not encrypted:
+                result.update(status=REPAIRED, pages=pages, repaired_path=repaired)
+            else:
+                os.unlink(repaired)
+    return result
+
+
+def merge_path(record):
+    """Path to merge for a preflighted record, or None if it must not be merged"""
+    preflight = record.get('preflight') or {}
+    if preflight.get('kind') != 'pdf' or preflight.get('status') not in MERGEABLE:
+        return None
+    return preflight.get('repaired_path') or record['file_path']
+
+
+def _unchecked(record):
+    """True if record needs a preflight (also if its repaired copy is gone, e.g. in a resumed job)"""
+    preflight = record.get('preflight')
+    if preflight is None:
+        return True
+    return bool(preflight.get('repaired_path')) and not os.path.exists(preflight['repaired_path'])
+
+
+def default_workers():
+    """Preflight processes for callers that guard their entry point (see multiprocessing.freeze_support)"""
+    return min(DEFAULT_WORKERS, os.cpu_count() or 1)
+
+
+def make_process_pool(workers):
+    """Process pool with the spawn start method (the parent runs threads: Playwright, the GUI)
+
+    Daemonic processes (worker_farm.py workers) must not start children;
+    there a single thread is used, the farm already runs one board per process.
+    """
+    if multiprocessing.current_process().daemon:
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+class Preflight:
+    """Inspects downloaded files in the background while the download continues
+
+    submit() is called for every file as soon as it is stored; finish()
+    waits for all of them and writes the result into record['preflight'].
+    The pool is only started with the first submitted file: a process pool
+    with more than one worker, otherwise a single thread (a process pool
+    needs a guarded entry point, which library callers may not have).
+
+    Repaired PDFs are written to a temp directory owned by this object;
+    call close() once they are merged.
+    """
+
+    def __init__(self, workers=None, repair=False):
+        self.workers = workers or 1
+        self.repair = repair
+        self._repair_dir = None
+        self._executor = None
+        self._pending = []
+
+    def _pool(self):
+        if self._executor is None:
+            if self.workers > 1:
+                self._executor = make_process_pool(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    @property
+    def repair_dir(self):
+        if self.repair and self._repair_dir is None:
+            self._repair_dir = tempfile.mkdtemp(prefix='taskcard_repair_')
+        return self._repair_dir
+
+    def submit(self, record):
+        """Schedules the preflight of a stored file (call from the event loop)"""
+        if not record or not _unchecked(record):
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool(), inspect_file, record['file_path'], self.repair_dir)
+        self._pending.append((record, future))
+
+    @staticmethod
+    async def _collect(record, future):
+        try:
+            record['preflight'] = await future
+        except Exception as e:
+            record['preflight'] = {'kind': 'unknown', 'status': CORRUPT, 'pages': 0, 'error': f"Preflight: {e}"}
+
+    async def wait(self, records):
+        """Waits for the given records only (the pool keeps running), submitting those not submitted yet"""
+        wanted = {id(record) for record in records}
+        submitted = {id(record) for record, _ in self._pending}
+        for record in records:
+            if id(record) not in submitted:
+                self.submit(record)
+        for record, future in list(self._pending):
+            if id(record) in wanted:
+                await self._collect(record, future)
+
+    async def finish(self, records=()):
+        """Waits for all submitted files, plus any record in records not submitted yet"""
+        submitted = {id(record) for record, _ in self._pending}
+        for record in records:
+            if id(record) not in submitted:
+                self.submit(record)
+        pending, self._pending = self._pending, []
+        for record, future in pending:
+            await self._collect(record, future)
+        self.shutdown()
+        return [record for record, _ in pending]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def close(self):
+        """Stops the pool and removes the repaired copies (after the merge)"""
+        self.shutdown()
+        if self._repair_dir is not None:
+            shutil.rmtree(self._repair_dir, ignore_errors=True)
+            self._repair_dir = None
+
+
+def run_preflight(records, workers=None, repair_dir=None):
+    """Synchronous preflight of all records that were not checked yet (e.g. for taskcard_render.py)
+
+    Uses a process pool only with more than one worker; damaged PDFs are
+    repaired into repair_dir if given.
+    """
+    todo = [record for record in records or [] if _unchecked(record)]
+    workers = min(workers or 1, len(todo))
+    if workers <= 1:
+        for record in todo:
+            record['preflight'] = inspect_file(record['file_path'], repair_dir)
+        return todo
+    with make_process_pool(workers) as executor:
+        results = executor.map(inspect_file, [record['file_path'] for record in todo], [repair_dir] * len(todo))
+        for record, result in zip(todo, results):
+            record['preflight'] = result
+    return todo
+
+
+def print_report(records):
+    """Prints one line per damaged, encrypted, empty or repaired file and per HTML page saved as attachment"""
+    def is_problem(record):
+        preflight = record.get('preflight') or {}
+        if preflight.get('status') in (CORRUPT, ENCRYPTED, EMPTY, REPAIRED):
+            return True
+        # Typically an error or login page delivered instead of the file
+        return preflight.get('kind') == 'html' and record.get('type') != 'image'
+
+    problems = [record for record in records or [] if is_problem(record)]
+    if not problems:
+        return
+    print(f"\n🔍 Vorabprüfung: {len(problems)} Datei(en) mit Problemen")
+    for record in problems:
+        preflight = record['preflight']
+        name = Path(record['file_path']).name
+        if preflight['status'] == REPAIRED:
+            print(f"  🔧 {name}: repariert ({preflight['pages']} Seiten)")
+        elif preflight['kind'] == 'html':
+            print(f"  ⚠️  {name}: HTML-Seite statt Datei (nicht eingefügt)")
+        else:
+            print(f"  ⚠️  {name}: {preflight['status']} - {preflight.get('error') or ''}")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Process Memory - RSS and free-memory readings with optional psutil support
+Ohne psutil werden /proc (Linux) bzw. getrusage als Fallback genutzt
+"""
+
+import os
+import sys
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MB = 1024 * 1024
+
+# Win32 constants for _windows_process
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_ACCESS_DENIED = 5
+STILL_ACTIVE = 259
+
+
+def _windows_process(pid):
+    """(alive, creation FILETIME) of pid via the Win32 API, works without psutil"""
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.GetProcessTimes.argtypes = (wintypes.HANDLE,) + (ctypes.POINTER(wintypes.FILETIME),) * 4
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Access denied: the process exists, but belongs to another user
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED, None
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True, None
+        times = [wintypes.FILETIME() for _ in range(4)]
+        created = None
+        if kernel32.GetProcessTimes(handle, *(ctypes.byref(t) for t in times)):
+            created = (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime
+        return exit_code.value == STILL_ACTIVE, created
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def process_start_time(pid):
+    """Start time of pid in a platform-specific unit, None if unknown
+
+    Only meant to be compared with another value from this function, to
+    tell a process apart from a later one that reused its pid.
+    """
+    if sys.platform == 'win32':
+        return _windows_process(pid)[1]
+    if sys.platform.startswith('linux'):
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                # Field 22 (starttime in clock ticks after boot); the command
+                # name in field 2 may contain spaces, so split after it
+                return int(f.read().rsplit(')', 1)[1].split()[19])
+        except (OSError, ValueError, IndexError):
+            return None
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).create_time()
+        except psutil.Error:
+            return None
+    return None
+
+
+def pid_alive(pid, started=None):
+    """True if a process with this pid is running
+
+    With started (a process_start_time() value of the original process), a
+    process that has since reused the pid does not count as alive.
+    """
+    if sys.platform == 'win32':
+        # os.kill(pid, 0) would send CTRL_C on Windows
+        alive = _windows_process(pid)[0]
+    elif psutil is not None:
+        alive = psutil.pid_exists(pid)
+    else:
+        try:
+            os.kill(pid, 0)
+            alive = True
+        except ProcessLookupError:
+            alive = False
+        except PermissionError:
+            alive = True
+    if not alive or started is None:
+        return alive
+    current = process_start_time(pid)
+    return current is None or current == started
+
+
+def _proc_rss_bytes(pid):
+    """Current RSS of pid from /proc (Linux only), None elsewhere"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _proc_children(pid):
+    """Direct and indirect child pids from /proc (Linux only)"""
+    children = []
+    pending = [pid]
+    while pending:
+        parent = pending.pop()
+        try:
+            with open(f'/proc/{parent}/task/{parent}/children') as f:
+                kids = [int(child) for child in f.read().split()]
+        except OSError:
+            kids = []
+        children.extend(kids)
+        pending.extend(kids)
+    return children
+
+
+def process_rss(pid=None, include_children=True):
+    """Resident set size in bytes of a process and (optionally) all its children
+
+    Children matter because Chromium runs as separate processes below the
+    Python process. Returns None if the value cannot be determined.
+    """
+    pid = pid or os.getpid()
+
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            total = process.memory_info().rss
+            if include_children:
+                for child in process.children(recursive=True):
+                    try:
+                        total += child.memory_info().rss
+                    except psutil.Error:
+                        pass
+            return total
+        except psutil.Error:
+            return None
+
+    rss = _proc_rss_bytes(pid)
+    if rss is not None:
+        if include_children:
+            rss += sum(_proc_rss_bytes(child) or 0 for child in _proc_children(pid))
+        return rss
+
+    if pid == os.getpid():
+        # Peak instead of current RSS, but better than nothing (macOS without psutil)
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    return None
+
+
+def available_memory():
+    """Memory available for new processes in bytes, None if unknown"""
+    if psutil is not None:
+        return psutil.virtual_memory().available
+
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Stdout Router - Sends print() output of concurrent jobs to per-job streams
+Jede asyncio-Task (bzw. jeder Thread) schreibt in ihr eigenes Log statt ins gemeinsame Terminal
+"""
+
+import contextvars
+import sys
+from contextlib import contextmanager
+
+_current_stream = contextvars.ContextVar('taskcard_stdout', default=None)
+
+
+class _RoutedStdout:
+    """sys.stdout replacement that writes to the stream of the current context
+
+    asyncio tasks and asyncio.to_thread copy the context they were created
+    in, so everything a job prints (including its image download tasks)
+    ends up in that job's stream. Output outside any job goes to the
+    original stdout.
+    """
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+
+    def _target(self):
+        return _current_stream.get() or self._fallback
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._fallback, name)
+
+
+def install():
+    """Replaces sys.stdout with the routing proxy (idempotent)"""
+    if not isinstance(sys.stdout, _RoutedStdout):
+        sys.stdout = _RoutedStdout(sys.stdout)
+
+
+@contextmanager
+def route_stdout(stream):
+    """Routes print() output of the current task/thread to stream inside the with-block"""
+    install()
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
@@ -5,11 +5,24 @@ Optimiert für Taskcard.app Struktur
 """
 
 import asyncio
+import contextlib
+import multiprocessing
 import sys
 import os
+import shutil
 import tempfile
 from pathlib import Path
 
+def get_app_dir():
+    """Get the per-user application folder (browsers, job database, caches)"""
+    if sys.platform == 'win32':
+        app_dir = Path.home() / "AppData" / "Local" / "taskcard_downloader"
+    else:
+        app_dir = Path.home() / ".taskcard_downloader"
+
+    app_dir.mkdir(parents=True, exist_ok=True)
+    return app_dir
+
 # Determine if running as PyInstaller bundle
 def get_browsers_path():
     """Get the path to Playwright browsers, checking bundled resources first"""
@@ -41,11 +54,7 @@ def get_browsers_path():
             return bundled_browsers
 
     # Fall back to user's home directory
-    if sys.platform == 'win32':
-        user_browsers = Path.home() / "AppData" / "Local" / "taskcard_downloader" / "playwright_browsers"
-    else:
-        user_browsers = Path.home() / ".taskcard_downloader" / "playwright_browsers"
-
+    user_browsers = get_app_dir() / "playwright_browsers"
     user_browsers.mkdir(parents=True, exist_ok=True)
     return user_browsers
 
@@ -53,21 +62,36 @@ def get_browsers_path():
 BROWSERS_PATH = get_browsers_path()
 os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(BROWSERS_PATH)
 
-from playwright.async_api import async_playwright
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, Image as RLImage
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from reportlab.lib import colors
 from datetime import datetime
 import argparse
 import json
+import re
+import time
 import requests
 import aiohttp
 import asyncio
 from PyPDF2 import PdfReader, PdfWriter
 
+from archive_export import export_archive
+from attachment_routing import EMBED, embed_files, route
+from attachment_store import AttachmentStore, MANIFEST_NAME, card_attachment_files, index_downloaded_files, sanitize_filename
+from board_pipeline import BoardPipeline, ColumnTracker, print_latency
+from board_watch import content_hash, watch_board
+from browser_profile import BrowserProfiles, DEFAULT_CACHE_MB
+from bundle_writer import BundleWriter
+from deadline import Deadline, MIN_DOWNLOAD_SECONDS
+from download_plan import (ByteBudget, MB, DEFAULT_MIN_FREE_MB, OUT_OF_TIME, TOO_LARGE, build_plan, format_size,
+                           parse_caption_size, print_plan, skipped_entry, write_plan)
+from export_filter import ExportFilter, add_filter_arguments
+from job_store import JobStore
+from memory_profile import MemoryProfiler
+from phase_profiler import PhaseProfiler
+from overview_render import (assemble_overview, build_pdf, column_story, make_styles, render_column_fragment,
+                             render_columns, skipped_by_card)
+from trace_bundle import TraceRecorder
+from pdf_optimizer import optimize_pdf
+from preflight import Preflight, default_workers as default_preflight_workers, merge_path, print_report, run_preflight
+
 
 def check_playwright_browsers():
     """Check if Playwright browsers are installed and provide installation instructions if not"""
@@ -98,154 +122,609 @@ def check_playwright_browsers():
     return True
 
 
+# In-page scrolling: horizontal step of the board, pauses for lazy loading
+SCROLL_STEP_PX = 600
+SCROLL_WAIT_MS = 500
+COLUMN_SCROLL_WAIT_MS = 300
+
+# Share of the overall progress (start, end) covered by each phase
+PROGRESS_PHASES = {
+    'extract': (0.0, 0.25),
+    'attachments': (0.25, 0.5),
+    'images': (0.5, 0.7),
+    'render': (0.7, 0.85),
+    'merge': (0.85, 0.95),
+    'optimize': (0.95, 1.0),
+    'export': (0.7, 1.0),
+}
+
+
 class TaskcardDownloader:
-    def __init__(self, url, output_file=None):
+    def __init__(self, url, output_file=None, optimize_output=True, linearize=False):
         self.url = url
         self.output_file = output_file or f"taskcard_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        self.optimize_output = optimize_output
+        self.linearize = linearize
+        # Optional MemoryProfiler / PhaseProfiler; when set, every pipeline phase is measured
+        self.memory_profiler = None
+        self.phase_profiler = None
+        # Optional directory for a trace bundle of the browser phase
+        self.trace_dir = None
+        self.tracer = None
+        # Optional callback(phase, fraction) with the overall progress 0.0-1.0;
+        # may be called from a worker thread when render_in_thread is set
+        self.progress_callback = None
+        # Run the CPU-bound output generation in a thread, so a shared event
+        # loop (GUI queue, service) keeps serving other jobs meanwhile
+        self.render_in_thread = False
+        # Full-page screenshot next to the output after loading (for debugging)
+        self.debug_screenshot = True
+        # Screenshot written by the current run (the only one that goes into its bundle)
+        self.screenshot_file = None
+        # Hierarchical content hashes of the extracted data (see board_watch.py);
+        # if the board hash equals unchanged_hash, the run stops after extraction
+        self.hashes = None
+        self.unchanged_hash = None
+        self.unchanged = False
+        # Remove the files of the previous export from the attachments folder
+        # once the new output is written (repeated exports into one folder)
+        self.replace_attachments = False
+        # Preflight of downloaded files (type, PDF structure, page count), in a
+        # process pool with more than one worker (the caller must guard its
+        # entry point), otherwise in a thread; repair_pdfs also tries to
+        # rewrite damaged PDFs
+        self.preflight_workers = None
+        self.repair_pdfs = False
+        # Optional ExportFilter (columns, cards, attachment types, images)
+        self.export_filter = None
+        self.filtered_counts = None
+        # Optional ByteBudget; items over budget are skipped and listed in data['skipped']
+        self.byte_budget = None
+        # Only extract and estimate sizes (self.plan), download nothing
+        self.plan_only = False
+        self.plan = None
+        # Optional BrowserProfiles: run in a persistent Chromium profile with a
+        # warm HTTP cache instead of a fresh context (only without browser=)
+        self.browser_profiles = None
+        self.navigation_seconds = None
+        self._profile_slot = None
+        # Stream the output (PDF/JSON, attachments, images) into <stem>.zip
+        # instead of leaving separate files (pdf and json format only)
+        self.bundle_output = False
+        self.bundle_path = None
+        # Also write the board as JSON Lines after the output (see export_jsonl);
+        # jsonl_compression is None, 'gzip' or 'zstd'
+        self.jsonl_output = False
+        self.jsonl_compression = None
+        self.jsonl_file = None
+        # Overlap the stages: images load while the browser clicks through the
+        # attachments, and each column is rendered as soon as its files are in
+        self.overlap_stages = True
+        self._pipeline = None
+        # Render the column chapters in a process pool of this many workers
+        # (None: all chapters in one pass, see _render_overview)
+        self.render_workers = None
+        # Seconds from the start of the run to the end of each stage (see board_pipeline.py)
+        self.latency = None
+        self._run_started = None
+        # Optional overall time limit per board in seconds (see deadline.py):
+        # downloads that can't finish in time are skipped and shown as placeholders
+        self.deadline_seconds = None
+        self.deadline = None
+        self._progress_fraction = 0.0
         self.data = {
             'board_title': '',
             'columns': []
         }
 
-    async def download_and_save(self, include_pdf_attachments=True):
+    def _phase(self, name):
+        """Context manager around one pipeline phase (memory and cProfile hook)"""
+        stack = contextlib.ExitStack()
+        if self.memory_profiler:
+            stack.enter_context(self.memory_profiler.phase(name))
+        if self.phase_profiler:
+            stack.enter_context(self.phase_profiler.phase(name))
+        return stack
+
+    def _subphase(self, name):
+        """Context manager around a step inside a phase (cProfile only)"""
+        if self.phase_profiler:
+            return self.phase_profiler.phase(name)
+        return contextlib.nullcontext()
+
+    def _progress(self, phase, done=0, total=1):
+        """Reports progress within phase (done of total steps) as overall fraction"""
+        if not self.progress_callback:
+            return
+        start, end = PROGRESS_PHASES[phase]
+        fraction = start + (end - start) * (done / total if total else 1)
+        # Overlapping stages report into different ranges; never move backwards
+        fraction = max(fraction, self._progress_fraction)
+        self._progress_fraction = fraction
+        try:
+            self.progress_callback(phase, fraction)
+        except Exception:
+            pass
+
+    def _mark(self, name):
+        """Records the end of a stage for the latency report (first call wins)"""
+        if self.latency is not None and self._run_started is not None:
+            self.latency.setdefault(name, round(time.monotonic() - self._run_started, 2))
+
+    def _asset_done(self, kind, ids):
+        """Tells the column tracker that an image or attachment is finished"""
+        if self._pipeline and self._pipeline.tracker and ids:
+            self._pipeline.tracker.done(kind, ids.get(f'{kind}_id'), ids.get('column_id'))
+
+    def _trace_step(self, name):
+        """Context manager timing one step of the page load (only while tracing)"""
+        if self.tracer:
+            return self.tracer.step(name)
+        return contextlib.nullcontext()
+
+    def _skip(self, kind, label, size, reason, **ids):
+        """Records an image or attachment that is not downloaded (shown as placeholder)"""
+        self.data.setdefault('skipped', []).append(skipped_entry(kind, label, size, reason, **ids))
+        print(f"      ⏭️  Übersprungen ({reason}, {format_size(size)}): {label[:60]}")
+
+    async def download_and_save(self, include_pdf_attachments=True, output_format='pdf', job_store=None, browser=None):
         """
         Orchestrates the download process:
         1. Launches browser
         2. Extracts data
         3. Downloads attachments (via browser)
         4. Downloads images (via aiohttp parallel)
-        5. Generates PDF
+        5. Generates PDF (or JSON, or an HTML/Markdown archive, see output_format)
         Returns list of downloaded files for JSON export.
+
+        With a job_store, every completed phase is checkpointed and an
+        interrupted run for the same URL and output file resumes from the
+        last completed phase.
+
+        An already running Playwright browser can be passed in to skip the
+        browser launch; the run then only opens (and closes) its own context.
         """
         print(f"Start Taskcard download process for: {self.url}")
-        
+
+        job = None
+        if job_store:
+            job = job_store.open_job(self.url, self.output_file, {
+                'include_pdf_attachments': include_pdf_attachments,
+                'output_format': output_format,
+            })
+            if job.phase != 'queued':
+                print(f"⏩ Setze Job {job.job_id} fort (letzte abgeschlossene Phase: {job.phase})")
+
+        self.latency = {}
+        self.screenshot_file = None
+        self.jsonl_file = None
+        self._run_started = time.monotonic()
+        self._progress_fraction = 0.0
+        self.deadline = Deadline(self.deadline_seconds) if self.deadline_seconds else None
+        if self.deadline:
+            print(f"⏳ Zeitlimit {self.deadline.describe()}")
+        if self.memory_profiler:
+            self.memory_profiler.start()
+        try:
+            downloaded_files = await self._run_phases(include_pdf_attachments, output_format, job, browser)
+        except BaseException as e:
+            if job:
+                job.fail(e)
+            raise
+        finally:
+            if self.memory_profiler:
+                self.memory_profiler.stop()
+
+        self._mark('output')
+        print_latency(self.latency)
+        return downloaded_files
+
+    async def _run_phases(self, include_pdf_attachments, output_format, job, browser):
+        """Runs (or skips, when resuming a job) each pipeline phase"""
         # Prepare output directory
         output_path = Path(self.output_file)
-        attachments_dir = output_path.parent / f"{output_path.stem}_attachments"
-        if include_pdf_attachments:
-            attachments_dir.mkdir(exist_ok=True)
+        if output_format in ('pdf', 'json'):
+            attachments_dir = output_path.parent / f"{output_path.stem}_attachments"
+        else:
+            # Download straight into the archive, so no asset has to be copied
+            attachments_dir = self.archive_dir() / 'assets'
+        if include_pdf_attachments and not self.plan_only:
+            attachments_dir.mkdir(parents=True, exist_ok=True)
             
-        downloaded_files = [] 
+        store = AttachmentStore(attachments_dir) if include_pdf_attachments and not self.plan_only else None
+        bundle = None
+        if self.bundle_output and output_format in ('pdf', 'json') and not self.plan_only:
+            bundle = BundleWriter(output_path.with_suffix('.zip'), output_path.parent)
+        preflight = None
+        if store:
+            # Every file is checked in the background as soon as it is stored
+            # (and streamed into the bundle)
+            preflight = Preflight(self.preflight_workers, repair=self.repair_pdfs)
+            callbacks = [preflight.submit] + ([bundle.add_record] if bundle else [])
+
+            def on_stored(record):
+                for callback in callbacks:
+                    callback(record)
+
+            store.on_stored = on_stored
+        if self.overlap_stages and store and not self.plan_only and not (job and job.reached('attachments')):
+            self._pipeline = BoardPipeline(store, preflight, render_columns=output_format == 'pdf')
+        try:
+            downloaded_files = await self._run_stored_phases(include_pdf_attachments, output_format, job, browser,
+                                                             store, preflight)
+            if bundle:
+                if self.unchanged:
+                    bundle.abort()
+                else:
+                    await asyncio.to_thread(self._finish_bundle, bundle, output_format, downloaded_files, store)
+            return downloaded_files
+        except BaseException:
+            if bundle:
+                bundle.abort()
+            raise
+        finally:
+            if self._pipeline:
+                await self._pipeline.cancel()
+                self._pipeline = None
+            if preflight:
+                # Also removes the repaired copies, which are merged by now
+                preflight.close()
+
+    def _finish_bundle(self, bundle, output_format, downloaded_files, store):
+        """Adds the remaining files to the bundle, closes it and removes the loose files"""
+        output_path = Path(self.output_file)
+        output = output_path if output_format == 'pdf' else output_path.with_suffix('.json')
+        # Only a screenshot taken by this run: a file at that path may be left
+        # over from an earlier run and must not be bundled (and deleted)
+        screenshot = self.screenshot_file
+
+        # Files adopted from a resumed job were never passed to on_stored
+        for record in downloaded_files:
+            if os.path.exists(record['file_path']):
+                bundle.add_record(record)
+        jsonl = Path(self.jsonl_file) if self.jsonl_file else None
+        loose = [path for path in (output, jsonl, screenshot) if path and path.exists()]
+        if store and (store.directory / MANIFEST_NAME).exists():
+            bundle.add(store.directory / MANIFEST_NAME)
+        for path in loose:
+            bundle.add(path)
+        self.bundle_path = bundle.close()
+
+        for path in loose:
+            path.unlink(missing_ok=True)
+        if store:
+            shutil.rmtree(store.directory, ignore_errors=True)
+        print(f"📦 Bundle gespeichert: {self.bundle_path} ({format_size(self.bundle_path.stat().st_size)})")
+
+    async def _run_stored_phases(self, include_pdf_attachments, output_format, job, browser, store, preflight):
+        """Browser, image and output phases, storing downloads in store"""
+        downloaded_files = []
+
+        if job and job.reached('extracted'):
+            self.data = job.checkpoint('data', self.data)
+
+        # The browser is only needed until the clickable attachments are downloaded
+        if job and job.reached('attachments'):
+            if store:
+                downloaded_files = store.adopt(job.checkpoint('downloaded_files', []))
+        elif browser is not None:
+            downloaded_files = await self._run_browser_phases(browser, include_pdf_attachments, store, job)
+        else:
+            from playwright.async_api import async_playwright
+
+            async with async_playwright() as p:
+                if self.browser_profiles:
+                    downloaded_files = await self._run_with_profile(p, include_pdf_attachments, store, job)
+                else:
+                    # Launch browser once
+                    browser = await p.chromium.launch(headless=True)
+                    try:
+                        downloaded_files = await self._run_browser_phases(browser, include_pdf_attachments, store, job)
+                    finally:
+                        await browser.close()
+
+        if self.unchanged:
+            print("✓ Board unverändert - Export übersprungen")
+            return downloaded_files
+        if self.plan_only:
+            print_plan(self.plan, self.byte_budget, Path(self.output_file).parent)
+            return downloaded_files
         
-        async with async_playwright() as p:
-            # Launch browser once
-            browser = await p.chromium.launch(headless=True)
-            # Create context with accept_downloads=True from the start
-            context = await browser.new_context(accept_downloads=True)
-            page = await context.new_page()
+        # 3. Download Images (Parallel) - outside of browser context as we just need URLs
+        if not (job and job.reached('images')):
+            if include_pdf_attachments and self.data.get('columns'):
+                with self._phase('images'):
+                    if self._pipeline and self._pipeline.image_task:
+                        # Started right after the extraction (see _start_pipeline)
+                        image_files = await self._pipeline.image_task
+                    else:
+                        image_files = await self._download_images_parallel(store)
+                downloaded_files.extend(image_files)
+            self._mark('images')
+            if job:
+                job.advance('images', data=self.data, downloaded_files=downloaded_files)
+
+        if self._pipeline and self._pipeline.render_task:
+            # Columns still waiting for files are rendered now
+            self._pipeline.tracker.close()
+            with self._phase('columns'):
+                await self._pipeline.render_task
+            self._mark('columns')
+
+        if preflight:
+            with self._phase('preflight'):
+                await preflight.finish(downloaded_files)
+            print_report(downloaded_files)
+            self._mark('preflight')
+
+        if store:
+            store.write_manifest()
             
+        # 4. Generate PDF (or JSON / static archive, skipping ReportLab and PyPDF2)
+        if self.render_in_thread:
+            await asyncio.to_thread(self._write_output, output_format, downloaded_files, job)
+        else:
+            self._write_output(output_format, downloaded_files, job)
+
+        if self.replace_attachments and store:
+            removed = store.remove_stale()
+            if removed:
+                print(f"🧹 {removed} Dateien des letzten Exports aus {store.directory} entfernt")
+
+        return downloaded_files
+
+    def _write_output(self, output_format, downloaded_files, job):
+        """Final phase: writes the PDF, JSON or archive from the collected data (and the JSON Lines)"""
+        if output_format == 'pdf':
+            self.generate_pdf(downloaded_files, job=job)
+        else:
+            self._progress('export', 0)
+            if output_format == 'json':
+                with self._phase('export'):
+                    self.export_json(str(Path(self.output_file).with_suffix('.json')), downloaded_pdfs=downloaded_files)
+            else:
+                with self._phase('archive'):
+                    self.export_archive(fmt=output_format, downloaded_files=downloaded_files)
+            if job:
+                job.advance('merged')
+            self._progress('export', 1)
+
+        if self.jsonl_output:
+            self.jsonl_file = self.export_jsonl(downloaded_pdfs=downloaded_files, compression=self.jsonl_compression)
+
+    async def _run_with_profile(self, playwright, include_pdf_attachments, store, job):
+        """Browser phases in a locked persistent profile slot (fresh browser if all slots are busy)"""
+        with self.browser_profiles.acquire() as slot_dir:
+            if slot_dir is None:
+                print("⚠️  Alle Browser-Profile sind belegt - nutze ein temporäres Profil")
+                browser = await playwright.chromium.launch(headless=True)
+                try:
+                    return await self._run_browser_phases(browser, include_pdf_attachments, store, job)
+                finally:
+                    await browser.close()
+
+            print(f"Nutze Browser-Profil: {slot_dir}")
+            context = await self.browser_profiles.launch(playwright, slot_dir)
+            self._profile_slot = slot_dir
             try:
-                # 1. Load and Extract Data
-                await self._load_and_extract_data(page)
-                
-                # 2. Download Attachments (files that need clicking)
-                if include_pdf_attachments:
-                    att_files = await self._download_clickable_attachments(page, attachments_dir)
-                    downloaded_files.extend(att_files)
-                    
+                return await self._run_browser_phases(None, include_pdf_attachments, store, job, context=context)
             finally:
-                await browser.close()
-        
-        # 3. Download Images (Parallel) - outside of browser context as we just need URLs
-        if include_pdf_attachments and self.data.get('columns'):
-            image_files = await self._download_images_parallel(attachments_dir)
-            downloaded_files.extend(image_files)
-            
-        # 4. Generate PDF
-        self.generate_pdf(downloaded_files)
-        
+                self._profile_slot = None
+                await context.close()
+
+    async def _run_browser_phases(self, browser, include_pdf_attachments, store, job, context=None):
+        """Extraction and clickable attachments, in a fresh context of the given browser
+
+        A given (persistent) context is used as is and left open.
+        """
+        downloaded_files = []
+
+        own_context = context is None
+        if own_context:
+            # Create context with accept_downloads=True from the start
+            context = await browser.new_context(accept_downloads=True)
+        # A persistent context starts with one blank page
+        page = context.pages[0] if context.pages else await context.new_page()
+        if self.memory_profiler:
+            await self.memory_profiler.attach_page(page)
+        if self.trace_dir:
+            self.tracer = TraceRecorder(self.trace_dir, Path(self.output_file).stem)
+            await self.tracer.start(browser, context, page)
+
+        try:
+            # 1. Load and Extract Data
+            # (also repeated when resuming from 'extracted': the attachment
+            # clicks need the ids that extraction writes into the DOM)
+            self._progress('extract', 0)
+            with self._phase('extract'):
+                await self._load_and_extract_data(page)
+                if self.memory_profiler:
+                    await self.memory_profiler.sample_browser()
+            if job:
+                job.advance('extracted', data=self.data)
+            self._progress('extract', 1)
+            self._mark('extracted')
+            if self.tracer:
+                # The trace is about the page load; attachment clicks are not part of it
+                await self.tracer.stop(browser, context)
+
+            self.hashes = content_hash(self.data)
+            if self.unchanged_hash and self.hashes['board'] == self.unchanged_hash:
+                self.unchanged = True
+                return downloaded_files
+
+            if self.plan_only:
+                with self._phase('plan'):
+                    self.plan = await build_plan(self.data)
+                return downloaded_files
+
+            if self._pipeline:
+                self._start_pipeline()
+
+            # 2. Download Attachments (files that need clicking)
+            if include_pdf_attachments:
+                with self._phase('attachments'):
+                    att_files = await self._download_clickable_attachments(page, store)
+                    if self.memory_profiler:
+                        await self.memory_profiler.sample_browser()
+                downloaded_files.extend(att_files)
+            self._mark('attachments')
+            if job:
+                job.advance('attachments', downloaded_files=downloaded_files)
+
+        finally:
+            if self.memory_profiler:
+                self.memory_profiler.detach_page()
+            if self.tracer:
+                await self.tracer.stop(browser, context)
+                self.tracer.finish()
+                self.tracer = None
+            if own_context:
+                await context.close()
+
         return downloaded_files
 
+    def _start_pipeline(self):
+        """Starts the image downloads and the column rendering next to the attachment clicks"""
+        pipeline = self._pipeline
+        pipeline.tracker = ColumnTracker(self.data)
+        pipeline.image_task = asyncio.create_task(self._image_stage(pipeline.store))
+        if pipeline.render_columns:
+            pipeline.render_task = asyncio.create_task(self._render_ready_columns())
+
+    async def _image_stage(self, store):
+        try:
+            return await self._download_images_parallel(store)
+        finally:
+            self._mark('images')
+            if self._pipeline and self._pipeline.tracker:
+                self._pipeline.tracker.stage_finished('image')
+
+    async def _render_ready_columns(self):
+        """Renders each column chapter as a PDF fragment as soon as all of its files are in
+
+        Columns arrive through the tracker's queue and are rendered one at a
+        time in a thread; _render_overview only assembles the fragments. A
+        column that fails here is simply rendered again with the whole overview.
+        """
+        pipeline = self._pipeline
+        index_by_id = {column.get('id'): idx for idx, column in enumerate(self.data['columns'])}
+        fragment_dir = pipeline.make_fragment_dir()
+        while True:
+            column_id = await pipeline.tracker.ready.get()
+            if column_id is None:
+                return
+            col_idx = index_by_id.get(column_id)
+            if col_idx is None:
+                continue
+
+            # The attachment notes need the preflight result of the column's files
+            records = [record for record in list(pipeline.store.manifest) if record.get('column_id') == column_id]
+            if pipeline.preflight:
+                await pipeline.preflight.wait(records)
+            _, files_by_card = index_downloaded_files(records)
+
+            path = fragment_dir / f"column_{col_idx + 1:04d}.pdf"
+            try:
+                page_count = await asyncio.to_thread(render_column_fragment, path, col_idx, self.data['columns'][col_idx],
+                                                     files_by_card, skipped_by_card(self.data), self._link_base())
+            except Exception as e:
+                print(f"  ⚠️  Spalte {col_idx + 1} konnte nicht vorab gerendert werden: {e}")
+                continue
+            pipeline.fragments[col_idx] = (path, page_count)
+            self._mark('first_column')
+
     async def _load_and_extract_data(self, page):
         """Loads page and extracts data using the provided page object"""
         print(f"Öffne Taskcard: {self.url}")
         
         # Navigate to the page
-        await page.goto(self.url, wait_until='networkidle', timeout=30000)
+        started = time.monotonic()
+        with self._trace_step('goto (networkidle)'):
+            timeout = self.deadline.timeout('extract', 30) if self.deadline else 30
+            await page.goto(self.url, wait_until='networkidle', timeout=timeout * 1000)
+        self.navigation_seconds = time.monotonic() - started
+        if self._profile_slot:
+            previous = self.browser_profiles.record_navigation(self._profile_slot, self.navigation_seconds)
+            comparison = f" (bisher typisch {previous:.1f}s)" if previous is not None else " (erster Lauf mit diesem Profil)"
+            print(f"Seite geladen in {self.navigation_seconds:.1f}s{comparison}")
+        else:
+            print(f"Seite geladen in {self.navigation_seconds:.1f}s")
 
         # Wait for content to load
         print("Warte auf Seiteninhalt...")
-        await page.wait_for_timeout(5000)
+        with self._trace_step('wait'):
+            await page.wait_for_timeout(min(5000, self.deadline.left('extract') * 500) if self.deadline else 5000)
 
-        # Scroll logic to trigger lazy loading
-        await self._scroll_page(page)
+        # Scroll through the board and harvest all cards (one round trip)
+        with self._trace_step('scroll + extract'):
+            await self._scroll_and_harvest(page)
 
         # Save screenshot
-        debug_screenshot = Path(self.output_file).parent / 'taskcard_debug.png'
-        try:
-             await page.screenshot(path=str(debug_screenshot), full_page=True)
-             print(f"Screenshot gespeichert: {debug_screenshot}")
-        except Exception as e:
-            print(f"Screenshot Fehler: {e}")
+        debug_screenshot = self.debug_screenshot_path()
+        if self.debug_screenshot:
+            with self._trace_step('screenshot'):
+                try:
+                     await page.screenshot(path=str(debug_screenshot), full_page=True)
+                     self.screenshot_file = debug_screenshot
+                     print(f"Screenshot gespeichert: {debug_screenshot}")
+                except Exception as e:
+                    print(f"Screenshot Fehler: {e}")
 
-        # Extract data implementation
-        await self._extract_data_js(page, debug_screenshot)
+        self._print_extraction_summary(debug_screenshot)
         
-    async def _scroll_page(self, page):
-        """Handles the scrolling logic"""
+    async def _scroll_and_harvest(self, page):
+        """Scrolls the board and extracts all cards in one in-page async routine
+
+        The board is scrolled horizontally and every column vertically (or
+        the page, if the columns don't scroll themselves). After each step
+        the rendered cards are harvested into a map keyed by a stable card
+        identity, so cards of lazily loaded or virtualized columns are kept
+        even after they left the DOM again. Returns after one round trip.
+        """
         print("Lade alle Spalten durch Scrollen...")
-        board_container = await page.query_selector('.board-container')
-        if board_container:
-            # Get the scrollable width
-            scroll_width = await page.evaluate('''
-                () => {
-                    const container = document.querySelector('.board-container');
-                    return container ? container.scrollWidth : 0;
-                }
-            ''')
-
-            # Scroll in steps
-            current_scroll = 0
-            step = 600
-            while current_scroll < scroll_width:
-                await page.evaluate(f'''
-                    () => {{
-                        const container = document.querySelector('.board-container');
-                        if (container) {{
-                            container.scrollLeft = {current_scroll};
-                        }}
-                    }}
-                ''')
-                await page.wait_for_timeout(500)
-                current_scroll += step
-
-            # Scroll to end and back
-            await page.evaluate('''
-                () => {
-                    const container = document.querySelector('.board-container');
-                    if (container) container.scrollLeft = container.scrollWidth;
-                }
-            ''')
-            await page.wait_for_timeout(1000)
-            
-            await page.evaluate('''
-                () => {
-                    const container = document.querySelector('.board-container');
-                    if (container) container.scrollLeft = 0;
-                }
-            ''')
-            await page.wait_for_timeout(1000)
-            
-    async def _extract_data_js(self, page, debug_screenshot):
-        """Runs the JS extraction logic"""
-        # (This contains the large JS block from the original code)
-        debug_info = await page.evaluate("""
-            () => {
-                const columns = document.querySelectorAll('.draggableList');
-                return columns.length;
-            }
-        """)
-        print(f"DEBUG: Gefundene Spalten-Container: {debug_info}")
-
-        # Extract data using JavaScript
+        options = {
+            'filter': self.export_filter.to_js() if self.export_filter else None,
+            'step_x': SCROLL_STEP_PX,
+            'wait_x': SCROLL_WAIT_MS,
+            'wait_y': COLUMN_SCROLL_WAIT_MS,
+            # Stop scrolling when the extraction budget is used up (keep what was harvested)
+            'max_ms': self.deadline.left('extract') * 1000 if self.deadline else None,
+        }
         data = await page.evaluate("""
-            () => {
+            async (options) => {
+                const filter = options.filter;
+                const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
                 const result = {
                     board_title: '',
                     columns: [],
                     extraction_strategy: '',
                     debug_info: ''
                 };
+                // In-page step durations (ms), kept for trace bundles
+                const extractStart = performance.now();
+                const timings = {
+                    columns_discovery_ms: 0,
+                    background_images_ms: 0,
+                    scroll_ms: 0,
+                    scroll_steps: 0,
+                    columns: [],
+                    total_ms: 0
+                };
+
+                // Export filter: excluded content gets no ids, so it is never downloaded
+                const columnPattern = filter && filter.columns ? new RegExp(filter.columns, 'i') : null;
+                const cardPattern = filter && filter.cards ? new RegExp(filter.cards, 'i') : null;
+                const attachmentTypes = filter ? filter.attachment_types : null;
+                const includeImages = !filter || filter.images !== false;
+                const filteredColumns = new Set();
+                const filteredCards = new Set();
+                const filtered = { columns: 0, cards: 0, attachments: 0, images: 0 };
+                const attachmentAllowed = (text) => {
+                    if (!attachmentTypes) return true;
+                    const match = text.match(/\\.([A-Za-z0-9]{1,8})(?:\\s|$)/) || text.match(/\\s([A-Za-z0-9]{2,8})\\s*·/);
+                    return !!match && attachmentTypes.includes(match[1].toLowerCase());
+                };
 
                 // Extract board title with fallbacks
                 const titleContainer = document.querySelector('.board-information-title');
@@ -260,14 +739,31 @@ class TaskcardDownloader:
                     }
                 }
 
-                // Helper function to extract card data
+                // Attachment elements of a card that pass the filter (same order for extraction and tagging)
+                const attachmentElements = (cardContent) => {
+                    const found = [];
+                    for (const attDiv of cardContent.querySelectorAll('[class*="border cursor-pointer"]')) {
+                        const fileInfo = attDiv.querySelector('.text-caption');
+                        if (!fileInfo) continue;
+                        const text = fileInfo.innerText.trim();
+                        if (!attachmentAllowed(text)) {
+                            found.push({ el: attDiv, text, excluded: true });
+                            continue;
+                        }
+                        found.push({ el: attDiv, text, excluded: false });
+                    }
+                    return found;
+                };
+
+                // Helper function to extract card data (null if excluded by the filter)
                 const extractCardData = (cardEl) => {
                     const card = {
                         title: '',
                         description: '',
                         links: [],
                         attachments: [],
-                        images: []
+                        images: [],
+                        excluded: { attachments: 0, images: 0 }
                     };
 
                     // Get card title from board-card-header
@@ -275,6 +771,9 @@ class TaskcardDownloader:
                     if (cardHeader) {
                         card.title = cardHeader.innerText.trim();
                     }
+                    if (cardPattern && !cardPattern.test(card.title)) {
+                        return null;
+                    }
 
                     // Get card content from board-card-content
                     const cardContent = cardEl.querySelector('.board-card-content');
@@ -296,7 +795,10 @@ class TaskcardDownloader:
                         }
 
                         // Get images from card - normal <img> tags
-                        const images = cardContent.querySelectorAll('img');
+                        const images = includeImages ? cardContent.querySelectorAll('img') : [];
+                        if (!includeImages) {
+                            card.excluded.images = cardContent.querySelectorAll('img, .q-img__image').length;
+                        }
                         for (const img of images) {
                             const src = img.src;
                             const alt = img.alt || 'Bild';
@@ -306,7 +808,8 @@ class TaskcardDownloader:
                         }
 
                         // Get background images (Taskcard Preview Style)
-                        const bgImages = cardContent.querySelectorAll('.q-img__image');
+                        const bgStart = performance.now();
+                        const bgImages = includeImages ? cardContent.querySelectorAll('.q-img__image') : [];
                         for (const div of bgImages) {
                             const bgStyle = div.style.backgroundImage;
                             if (bgStyle) {
@@ -319,13 +822,17 @@ class TaskcardDownloader:
                                 }
                             }
                         }
+                        timings.background_images_ms += performance.now() - bgStart;
 
                         // Get attachment info (PDFs, files) with download URLs
-                        const attachmentDivs = cardContent.querySelectorAll('[class*="border cursor-pointer"]');
-                        for (const attDiv of attachmentDivs) {
-                            const fileInfo = attDiv.querySelector('.text-caption');
+                        for (const att of attachmentElements(cardContent)) {
+                            if (att.excluded) {
+                                card.excluded.attachments++;
+                                continue;
+                            }
                             // Get the background image URL which contains the file URL
-                            const imgDiv = attDiv.querySelector('.q-img__image');
+                            const attBgStart = performance.now();
+                            const imgDiv = att.el.querySelector('.q-img__image');
                             let fileUrl = null;
                             if (imgDiv) {
                                 const bgStyle = imgDiv.style.backgroundImage;
@@ -336,81 +843,305 @@ class TaskcardDownloader:
                                     }
                                 }
                             }
-
-                            if (fileInfo) {
-                                const text = fileInfo.innerText.trim();
-                                card.attachments.push({
-                                    info: text,
-                                    url: fileUrl
-                                });
-                            }
+                            timings.background_images_ms += performance.now() - attBgStart;
+                            card.attachments.push({
+                                info: att.text,
+                                url: fileUrl
+                            });
                         }
                     }
 
                     return card;
                 };
 
-                // STRATEGY 1: Column Layout (Kanban)
-                const columns = document.querySelectorAll('.draggableList');
+                // Stable identity of a rendered card: a DOM id if the app provides one,
+                // otherwise its content. Identical cards in the same pass are numbered.
+                // Images are left out: a q-img only gets its background-image once it
+                // has loaded, so the same card would get a second key on a later pass.
+                const cardKey = (cardEl, card, seen) => {
+                    const domId = cardEl.dataset.id || cardEl.getAttribute('data-card-id') || cardEl.id;
+                    if (domId) return `id:${domId}`;
+                    const fingerprint = JSON.stringify([
+                        card.title, card.description.slice(0, 500), card.attachments.map(a => a.info)
+                    ]);
+                    const occurrence = (seen.get(fingerprint) || 0) + 1;
+                    seen.set(fingerprint, occurrence);
+                    return `${fingerprint}#${occurrence}`;
+                };
 
-                if (columns.length > 0) {
-                    result.extraction_strategy = 'Spalten-Layout (Kanban)';
-                    result.debug_info = `${columns.length} Spalte(n) erkannt`;
+                const columnTitle = (col) => {
+                    const colHeaderDiv = col.querySelector('.board-list-header .contenteditable');
+                    return colHeaderDiv ? colHeaderDiv.innerText.trim() : '';
+                };
 
-                    for (const col of columns) {
-                        const columnData = {
-                            title: '',
-                            cards: []
-                        };
+                // Column identity: DOM id, otherwise its title (numbered if repeated)
+                const columnKeys = (cols) => {
+                    const seen = new Map();
+                    return cols.map((col) => {
+                        const domId = col.dataset.id || col.id;
+                        if (domId) return `id:${domId}`;
+                        const title = columnTitle(col);
+                        const occurrence = (seen.get(title) || 0) + 1;
+                        seen.set(title, occurrence);
+                        return `${title}#${occurrence}`;
+                    });
+                };
 
-                        const colHeaderDiv = col.querySelector('.board-list-header .contenteditable');
-                        if (colHeaderDiv) {
-                            columnData.title = colHeaderDiv.innerText.trim();
+                const board = document.querySelector('.board-container');
+                const pageScroller = document.scrollingElement || document.documentElement;
+
+                // Element that scrolls a column vertically (null if the page scrolls instead)
+                const verticalScroller = (col) => {
+                    const firstCard = col.querySelector('.board-card');
+                    let el = firstCard ? firstCard.parentElement : col;
+                    while (el && el !== board && el !== document.body) {
+                        const overflowY = getComputedStyle(el).overflowY;
+                        if ((overflowY === 'auto' || overflowY === 'scroll') && el.scrollHeight > el.clientHeight + 2) {
+                            return el;
                         }
+                        if (el === col) break;
+                        el = el.parentElement;
+                    }
+                    return null;
+                };
 
-                        const cardElements = col.querySelectorAll('.board-card');
-                        for (const cardEl of cardElements) {
-                            const card = extractCardData(cardEl);
-                            if (card.title || card.description || card.links.length > 0 || card.attachments.length > 0 || card.images.length > 0) {
-                                columnData.cards.push(card);
-                            }
-                        }
+                // Position of an element in the scrolled content, for the final order
+                const contentTop = (el, scroller) => {
+                    if (scroller) {
+                        return el.getBoundingClientRect().top - scroller.getBoundingClientRect().top + scroller.scrollTop;
+                    }
+                    return el.getBoundingClientRect().top + window.scrollY;
+                };
+                const contentLeft = (el) => el.getBoundingClientRect().left + (board ? board.scrollLeft : 0) + window.scrollX;
 
-                        if (columnData.title || columnData.cards.length > 0) {
-                            result.columns.push(columnData);
+                // key -> { title, left, cards: Map(key -> { card, top }), seenElements, ms }
+                const harvested = new Map();
+
+                const harvestColumn = (col, key, scroller) => {
+                    const start = performance.now();
+                    const title = columnTitle(col);
+                    if (columnPattern && !columnPattern.test(title)) {
+                        filteredColumns.add(key);
+                        return;
+                    }
+                    let column = harvested.get(key);
+                    if (!column) {
+                        column = { title, left: contentLeft(col), cards: new Map(), elements: 0, ms: 0 };
+                        harvested.set(key, column);
+                    }
+                    const seen = new Map();
+                    for (const cardEl of col.querySelectorAll('.board-card')) {
+                        column.elements++;
+                        const card = extractCardData(cardEl);
+                        if (!card) {
+                            filteredCards.add(`${key}|${cardEl.innerText.slice(0, 200)}`);
+                            continue;
+                        }
+                        const cardKeyValue = cardKey(cardEl, card, seen);
+                        const known = column.cards.get(cardKeyValue);
+                        if (!known) {
+                            column.cards.set(cardKeyValue, { card, top: contentTop(cardEl, scroller) });
+                        } else if (card.images.length > known.card.images.length) {
+                            // Seen again after its images loaded
+                            known.card = card;
                         }
                     }
+                    column.ms += performance.now() - start;
+                };
 
-                // STRATEGY 2: Free Layout (Pinboard/Timeline)
-                } else {
-                    const allCards = document.querySelectorAll('.board-card');
+                // Time limit of the extraction (null: none); what was harvested so far is kept
+                const harvestStart = performance.now();
+                let outOfTime = false;
+                const timeUp = () => {
+                    if (options.max_ms !== null && performance.now() - harvestStart > options.max_ms) {
+                        outOfTime = true;
+                    }
+                    return outOfTime;
+                };
 
-                    if (allCards.length > 0) {
-                        result.extraction_strategy = 'Freies Layout (Pinnwand/Tafel)';
-                        result.debug_info = `${allCards.length} Karte(n) ohne Spalten gefunden`;
+                const scanned = new Set();
+                const scanVisibleColumns = async () => {
+                    const discoveryStart = performance.now();
+                    const cols = Array.from(document.querySelectorAll('.draggableList'));
+                    const keys = columnKeys(cols);
+                    timings.columns_discovery_ms += performance.now() - discoveryStart;
+
+                    for (let i = 0; i < cols.length; i++) {
+                        const col = cols[i];
+                        const key = keys[i];
+                        const scroller = verticalScroller(col);
+                        harvestColumn(col, key, scroller);
+                        if (scanned.has(key) || filteredColumns.has(key) || !scroller) continue;
+                        const rect = col.getBoundingClientRect();
+                        if (rect.right < 0 || rect.left > window.innerWidth) continue;
+
+                        // Scroll this column top to bottom, harvesting after every step
+                        scanned.add(key);
+                        const stepY = Math.max(200, Math.floor(scroller.clientHeight * 0.8));
+                        for (let y = stepY; y < scroller.scrollHeight && !timeUp(); y += stepY) {
+                            scroller.scrollTop = y;
+                            timings.scroll_steps++;
+                            await sleep(options.wait_y);
+                            // The list may have been re-rendered; look the column up again
+                            const current = document.querySelectorAll('.draggableList');
+                            const currentKeys = columnKeys(Array.from(current));
+                            const index = currentKeys.indexOf(key);
+                            if (index < 0) break;
+                            harvestColumn(current[index], key, scroller);
+                        }
+                        scroller.scrollTop = 0;
+                    }
+                };
 
-                        const fallbackColumn = {
-                            title: 'Alle Inhalte (Freies Layout)',
-                            cards: []
-                        };
+                // Page-level vertical scrolling (columns that grow with the page, free layout)
+                const scanPageVertically = async (harvest) => {
+                    const stepY = Math.max(200, Math.floor(window.innerHeight * 0.8));
+                    for (let y = stepY; y < pageScroller.scrollHeight && !timeUp(); y += stepY) {
+                        window.scrollTo(window.scrollX, y);
+                        timings.scroll_steps++;
+                        await sleep(options.wait_y);
+                        await harvest();
+                    }
+                    window.scrollTo(window.scrollX, 0);
+                };
 
-                        for (const cardEl of allCards) {
+                const scrollStart = performance.now();
+                if (document.querySelector('.draggableList')) {
+                    // STRATEGY 1: Column Layout (Kanban)
+                    const width = board ? board.scrollWidth : 0;
+                    let x = 0;
+                    do {
+                        if (board) board.scrollLeft = x;
+                        timings.scroll_steps++;
+                        await sleep(options.wait_x);
+                        await scanVisibleColumns();
+                        if (pageScroller.scrollHeight > window.innerHeight + 2) {
+                            await scanPageVertically(scanVisibleColumns);
+                        }
+                        x += options.step_x;
+                    } while (board && x < Math.max(width, board.scrollWidth) + options.step_x && !timeUp());
+                    if (board) board.scrollLeft = 0;
+                } else {
+                    // STRATEGY 2: Free Layout (Pinboard/Timeline) - cards without columns
+                    const harvestFree = async () => {
+                        const start = performance.now();
+                        let column = harvested.get('free');
+                        if (!column) {
+                            column = { title: 'Alle Inhalte (Freies Layout)', left: 0, cards: new Map(), elements: 0, ms: 0 };
+                            harvested.set('free', column);
+                        }
+                        const seen = new Map();
+                        for (const cardEl of document.querySelectorAll('.board-card')) {
+                            column.elements++;
                             const card = extractCardData(cardEl);
-                            if (card.title || card.description || card.links.length > 0 || card.attachments.length > 0 || card.images.length > 0) {
-                                fallbackColumn.cards.push(card);
+                            if (!card) {
+                                filteredCards.add(`free|${cardEl.innerText.slice(0, 200)}`);
+                                continue;
+                            }
+                            const key = cardKey(cardEl, card, seen);
+                            const known = column.cards.get(key);
+                            if (!known) {
+                                const rect = cardEl.getBoundingClientRect();
+                                // Pinboards are read row by row
+                                column.cards.set(key, { card, top: rect.top + window.scrollY + (rect.left + window.scrollX) / 100000 });
+                            } else if (card.images.length > known.card.images.length) {
+                                known.card = card;
                             }
                         }
-                        result.columns.push(fallbackColumn);
-                    } else {
-                         result.extraction_strategy = 'FEHLER: Keine Inhalte erkannt';
+                        column.ms += performance.now() - start;
+                    };
+                    await harvestFree();
+                    await scanPageVertically(harvestFree);
+                }
+                timings.scroll_ms = performance.now() - scrollStart;
+
+                // Build the result in board order and give cards stable ids. The ids
+                // are also written into the DOM, so downloads can be linked back to their card.
+                const idsByKey = new Map();
+                const ordered = Array.from(harvested.entries()).sort((a, b) => a[1].left - b[1].left);
+                for (const [key, column] of ordered) {
+                    const columnData = {
+                        id: `c${result.columns.length + 1}`,
+                        title: column.title,
+                        cards: []
+                    };
+                    const cards = Array.from(column.cards.entries()).sort((a, b) => a[1].top - b[1].top);
+                    for (const [cardKeyValue, entry] of cards) {
+                        const card = entry.card;
+                        filtered.attachments += card.excluded.attachments;
+                        filtered.images += card.excluded.images;
+                        delete card.excluded;
+                        const hasContent = card.title || card.description || card.links.length > 0 || card.attachments.length > 0 || card.images.length > 0;
+                        if (!hasContent) continue;
+                        card.id = `${columnData.id}-k${columnData.cards.length + 1}`;
+                        card.attachments.forEach((att, idx) => { att.id = `${card.id}-a${idx + 1}`; });
+                        card.images.forEach((img, idx) => { img.id = `${card.id}-i${idx + 1}`; });
+                        idsByKey.set(`${key}|${cardKeyValue}`, card.id);
+                        columnData.cards.push(card);
+                    }
+                    timings.columns.push({
+                        id: columnData.id,
+                        title: columnData.title,
+                        card_elements: column.elements,
+                        ms: column.ms
+                    });
+                    if (key === 'free' || columnData.title || columnData.cards.length > 0) {
+                        result.columns.push(columnData);
                     }
                 }
+
+                // Tag the cards that are rendered now (all of them, unless the board virtualizes)
+                const tagCards = (cardEls, key) => {
+                    const seen = new Map();
+                    for (const cardEl of cardEls) {
+                        const card = extractCardData(cardEl);
+                        if (!card) continue;
+                        const cardId = idsByKey.get(`${key}|${cardKey(cardEl, card, seen)}`);
+                        if (!cardId) continue;
+                        cardEl.dataset.tcCardId = cardId;
+                        const cardContent = cardEl.querySelector('.board-card-content');
+                        if (!cardContent) continue;
+                        attachmentElements(cardContent).filter(att => !att.excluded).forEach((att, idx) => {
+                            att.el.dataset.tcAttachmentId = `${cardId}-a${idx + 1}`;
+                        });
+                    }
+                };
+                const renderedColumns = Array.from(document.querySelectorAll('.draggableList'));
+                if (renderedColumns.length > 0) {
+                    const keys = columnKeys(renderedColumns);
+                    renderedColumns.forEach((col, i) => tagCards(col.querySelectorAll('.board-card'), keys[i]));
+                } else {
+                    tagCards(document.querySelectorAll('.board-card'), 'free');
+                }
+
+                filtered.columns = filteredColumns.size;
+                filtered.cards = filteredCards.size;
+                const harvestedCards = result.columns.reduce((sum, col) => sum + col.cards.length, 0);
+                if (harvested.size === 0 || (harvestedCards === 0 && !document.querySelector('.board-card'))) {
+                    result.extraction_strategy = 'FEHLER: Keine Inhalte erkannt';
+                    result.columns = [];
+                } else if (harvested.has('free')) {
+                    result.extraction_strategy = 'Freies Layout (Pinnwand/Tafel)';
+                    result.debug_info = `${harvestedCards} Karte(n) ohne Spalten gefunden`;
+                } else {
+                    result.extraction_strategy = 'Spalten-Layout (Kanban)';
+                    result.debug_info = `${harvested.size + filteredColumns.size} Spalte(n) erkannt, ${timings.scroll_steps} Scroll-Schritte`;
+                }
+                timings.total_ms = performance.now() - extractStart;
+                result.timings = timings;
+                result.filtered = filtered;
+                result.out_of_time = outOfTime;
                 return result;
             }
-        """)
-
+        """, options)
+
+        timings = data.pop('timings', None)
+        if self.tracer:
+            self.tracer.page_timings = timings
+        self.filtered_counts = data.pop('filtered', None)
+        if data.pop('out_of_time', False):
+            print("⚠️  Zeitlimit beim Scrollen erreicht - Karten weiter unten/rechts fehlen evtl.")
         self.data = data
-        self._print_extraction_summary(debug_screenshot)
 
     def _print_extraction_summary(self, debug_screenshot):
         """Prints summary of extracted data"""
@@ -429,24 +1160,47 @@ class TaskcardDownloader:
             total_images = sum(len(card.get('images', [])) for card in col['cards'])
             print(f"  Spalte {idx+1}: {col['title']} ({len(col['cards'])} Karten, {total_images} Bilder)")
 
+        if self.export_filter:
+            counts = self.filtered_counts or {}
+            print(f"\n🔎 Filter: {self.export_filter.describe()}")
+            print(f"   Ausgelassen: {counts.get('columns', 0)} Spalten, {counts.get('cards', 0)} Karten, "
+                  f"{counts.get('attachments', 0)} Anhänge, {counts.get('images', 0)} Bilder")
+
         if self.data.get('extraction_strategy', '').startswith('FEHLER'):
             print("\n⚠️  WARNUNG: Keine Inhalte gefunden!")
             print(f"    Debug-Screenshot: {debug_screenshot}")
 
-    async def _download_clickable_attachments(self, page, attachments_dir):
+    async def _download_clickable_attachments(self, page, store):
         """Downloads file attachments by clicking them in the browser"""
         print("\nLade klickbare Anhänge über Browser herunter...")
         downloaded_files = [] 
         
-        # Find clickable attachments
-        border_attachments = await page.query_selector_all('[class*="border cursor-pointer"]')
-        qitem_attachments = await page.query_selector_all('.q-item--clickable:has(i[class*="mdi-file"])')
-        file_links = await page.query_selector_all('.board-card-content a[href*="download"]')
+        # Find clickable attachments; with an export filter only those in kept
+        # cards (the extraction only gave ids to allowed attachments)
+        if self.export_filter:
+            border_attachments = await page.query_selector_all('[data-tc-attachment-id]')
+            qitem_attachments = await page.query_selector_all('[data-tc-card-id] .q-item--clickable:has(i[class*="mdi-file"])')
+            file_links = await page.query_selector_all('[data-tc-card-id] .board-card-content a[href*="download"]')
+        else:
+            border_attachments = await page.query_selector_all('[class*="border cursor-pointer"]')
+            qitem_attachments = await page.query_selector_all('.q-item--clickable:has(i[class*="mdi-file"])')
+            file_links = await page.query_selector_all('.board-card-content a[href*="download"]')
         
         all_attachments = list(border_attachments) + list(qitem_attachments) + list(file_links)
         print(f"  Gefunden: {len(all_attachments)} potentielle Anhänge")
+        if self.deadline:
+            # With a time limit, get as many files as possible: small ones first
+            all_attachments = await self._smallest_first(all_attachments)
+
+        card_columns = {
+            card.get('id'): col.get('id')
+            for col in self.data.get('columns', [])
+            for card in col.get('cards', [])
+        }
 
         for idx, att_div in enumerate(all_attachments):
+            self._progress('attachments', idx, len(all_attachments))
+            ids = None
             try:
                 caption_text = None
                 # Try finding text
@@ -460,49 +1214,129 @@ class TaskcardDownloader:
                 
                 if not caption_text:
                     caption_text = f"Anhang {idx+1}"
+                elif self.export_filter and not self.export_filter.attachment_allowed(caption_text):
+                    print(f"  [{idx+1}/{len(all_attachments)}] Übersprungen (Filter): {caption_text[:60]}")
+                    continue
 
                 print(f"  [{idx+1}/{len(all_attachments)}] Lade: {caption_text[:60]}...")
 
+                # Stable ids written into the DOM by _scroll_and_harvest
+                ids = await att_div.evaluate('''
+                    (el) => {
+                        const cardEl = el.closest('[data-tc-card-id]');
+                        return {
+                            attachment_id: el.dataset.tcAttachmentId || null,
+                            card_id: cardEl ? cardEl.dataset.tcCardId : null
+                        };
+                    }
+                ''')
+                ids['column_id'] = card_columns.get(ids['card_id'])
+
+                expected_size = parse_caption_size(caption_text)
+                if self.deadline and not self.deadline.can_finish(expected_size, 'downloads'):
+                    self._skip('attachment', caption_text, expected_size, OUT_OF_TIME, **ids)
+                    continue
+                if self.byte_budget:
+                    reason = self.byte_budget.admit(expected_size, store.directory)
+                    if reason:
+                        self._skip('attachment', caption_text, expected_size, reason, **ids)
+                        continue
+
                 try:
-                    async with page.expect_download(timeout=10000) as download_info:
+                    click_started = time.monotonic()
+                    timeout = self.deadline.timeout('downloads', 10, MIN_DOWNLOAD_SECONDS) if self.deadline else 10
+                    async with page.expect_download(timeout=timeout * 1000) as download_info:
                         await att_div.click()
                     
                     download = await download_info.value
-                    suggested_filename = download.suggested_filename
-                    safe_filename = "".join(c for c in suggested_filename if c.isalnum() or c in (' ', '.', '_', '-')).strip() or f"attachment_{idx}.bin"
-                    
-                    final_path = attachments_dir / safe_filename
-                    counter = 1
-                    while final_path.exists():
-                        name, ext = os.path.splitext(safe_filename)
-                        final_path = attachments_dir / f"{name}_{counter}{ext}"
-                        counter += 1
-                        
-                    await download.save_as(str(final_path))
+                    if self.export_filter and not self.export_filter.attachment_allowed(download.suggested_filename):
+                        # Type only known from the filename: stop the transfer
+                        await download.cancel()
+                        if self.byte_budget:
+                            self.byte_budget.consume(expected_size, 0)
+                        print(f"      ⏭️  Übersprungen (Filter): {download.suggested_filename}")
+                        continue
+                    if self.byte_budget and not await self._download_within_budget(download, expected_size, caption_text, ids):
+                        continue
+                    safe_filename = sanitize_filename(download.suggested_filename, f"attachment_{idx}.bin")
                     
-                    downloaded_files.append({
-                        'info': caption_text,
-                        'file_path': str(final_path),
-                        'type': 'file'
-                    })
-                    print(f"      ✓ Gespeichert: {final_path.name}")
+                    record = await store.move_download(download, safe_filename, caption_text, 'file', **ids)
+                    downloaded_files.append(record)
+                    if self.deadline:
+                        self.deadline.record_transfer(record['size'], time.monotonic() - click_started)
+                    if self.byte_budget:
+                        self.byte_budget.consume(expected_size, record['size'])
+                    print(f"      ✓ Gespeichert: {Path(record['file_path']).name}")
                     
                 except Exception as down_err:
+                    if self.byte_budget:
+                        self.byte_budget.consume(expected_size, 0)
+                    if self.deadline and self.deadline.expired('downloads'):
+                        self._skip('attachment', caption_text, expected_size, OUT_OF_TIME, **ids)
+                        continue
                     print(f"      ⚠️  Kein Download ausgelöst oder Timeout (kein File?): {str(down_err)[:50]}")
                     
             except Exception as e:
                 print(f"      ⚠️  Fehler bei Anhang {idx}: {e}")
-                
+            finally:
+                self._asset_done('attachment', ids)
+
+        if self._pipeline and self._pipeline.tracker:
+            # Attachments that were not clicked (not rendered, filtered) hold up no column
+            self._pipeline.tracker.stage_finished('attachment')
+        self._progress('attachments', 1)
+        if self.deadline:
+            downloaded_files = self._in_board_order(downloaded_files)
         return downloaded_files
 
-    async def _download_images_parallel(self, attachments_dir):
+    async def _smallest_first(self, elements):
+        """Orders attachment elements by the size in their caption (unknown sizes last)"""
+        sizes = []
+        for element in elements:
+            caption = await element.evaluate('''
+                (el) => {
+                    const label = el.querySelector('.q-item__label') || el.querySelector('.text-caption');
+                    return label ? label.innerText : '';
+                }
+            ''')
+            sizes.append(parse_caption_size(caption))
+        order = sorted(range(len(elements)), key=lambda i: (sizes[i] is None, sizes[i] or 0, i))
+        return [elements[i] for i in order]
+
+    def _in_board_order(self, records):
+        """Sorts downloaded attachment records back into the order of the board (merge order)"""
+        position = {}
+        for col_idx, column in enumerate(self.data.get('columns', [])):
+            for card_idx, card in enumerate(column.get('cards', [])):
+                position[card.get('id')] = (col_idx, card_idx, -1)
+                for att_idx, attachment in enumerate(card.get('attachments', [])):
+                    position[attachment.get('id')] = (col_idx, card_idx, att_idx)
+        unknown = (len(position), 0, 0)
+        return sorted(records, key=lambda r: position.get(r.get('attachment_id')) or position.get(r.get('card_id')) or unknown)
+
+    async def _download_within_budget(self, download, expected_size, caption_text, ids):
+        """Checks the real size of a finished browser download against the per-file limit"""
+        try:
+            actual_size = os.path.getsize(await download.path())
+        except Exception:
+            # Remote browsers don't expose a local path; the caption size was checked
+            return True
+        if self.byte_budget.allows_file(actual_size):
+            return True
+        await download.delete()
+        self.byte_budget.consume(expected_size, 0)
+        self._skip('attachment', caption_text, actual_size, TOO_LARGE, **ids)
+        return False
+
+    async def _download_images_parallel(self, store):
         """Downloads all images in parallel using aiohttp"""
         all_images = []
         for col in self.data.get('columns', []):
             for card in col.get('cards', []):
                 for image in card.get('images', []):
                     if image.get('src'):
-                        all_images.append(image)
+                        ids = {'column_id': col.get('id'), 'card_id': card.get('id'), 'image_id': image.get('id')}
+                        all_images.append((image, ids))
         
         if not all_images:
             return []
@@ -511,11 +1345,13 @@ class TaskcardDownloader:
         
         downloaded_images = []
         semaphore = asyncio.Semaphore(10)  # Limit concurrency
+        self._images_done = 0
+        self._images_total = len(all_images)
         
         async with aiohttp.ClientSession() as session:
             tasks = []
-            for idx, img in enumerate(all_images):
-                tasks.append(self._download_single_image(session, img, attachments_dir, idx, semaphore))
+            for idx, (img, ids) in enumerate(all_images):
+                tasks.append(self._download_single_image(session, img, store, idx, semaphore, ids))
                 
             results = await asyncio.gather(*tasks)
             
@@ -527,16 +1363,29 @@ class TaskcardDownloader:
         print(f"  {len(downloaded_images)}/{len(all_images)} Bilder erfolgreich geladen.")
         return downloaded_images
 
-    async def _download_single_image(self, session, image_data, attachments_dir, idx, semaphore):
+    async def _download_single_image(self, session, image_data, store, idx, semaphore, ids=None):
         """Helper to download a single image"""
         src = image_data.get('src')
         alt = image_data.get('alt', 'Bild')
         
         async with semaphore:
             try:
-                async with session.get(src, timeout=30) as response:
+                if self.deadline and self.deadline.expired('downloads'):
+                    self._skip('image', alt, None, OUT_OF_TIME, **(ids or {}))
+                    return None
+                timeout = self.deadline.timeout('downloads', 30, MIN_DOWNLOAD_SECONDS) if self.deadline else 30
+                request_started = time.monotonic()
+                async with session.get(src, timeout=timeout) as response:
                     if response.status == 200:
-                        content = await response.read()
+                        if self.deadline and not self.deadline.can_finish(response.content_length, 'downloads'):
+                            self._skip('image', alt, response.content_length, OUT_OF_TIME, **(ids or {}))
+                            return None
+                        if self.byte_budget:
+                            content = await self._read_within_budget(response, alt, store, ids or {})
+                            if content is None:
+                                return None
+                        else:
+                            content = await response.read()
                         
                         # Guess extension
                         content_type = response.headers.get('content-type', '')
@@ -547,31 +1396,53 @@ class TaskcardDownloader:
                         else: ext = '.jpg'
                         
                         # Filename
-                        safe_name = "".join(c for c in alt if c.isalnum() or c in (' ', '.', '_', '-')).strip()
-                        if not safe_name: safe_name = f"image_{idx}"
+                        safe_name = sanitize_filename(alt, f"image_{idx}")
                         
-                        # Save
-                        final_path = attachments_dir / f"{safe_name}{ext}"
-                        counter = 1
-                        while final_path.exists():
-                            final_path = attachments_dir / f"{safe_name}_{counter}{ext}"
-                            counter += 1
-                            
-                        with open(final_path, 'wb') as f:
-                            f.write(content)
+                        # Save (unique name + atomic write via the store)
+                        record = await store.write_bytes_async(f"{safe_name}{ext}", content, f"Bild: {alt}", 'image', **(ids or {}))
                             
                         # Update local path in data
-                        image_data['local_path'] = str(final_path)
+                        image_data['local_path'] = record['file_path']
+                        if self.deadline:
+                            self.deadline.record_transfer(record['size'], time.monotonic() - request_started)
                         
-                        print(f"  ✓ Bild geladen: {final_path.name}")
-                        return {
-                            'info': f"Bild: {alt}",
-                            'file_path': str(final_path),
-                            'type': 'image'
-                        }
+                        print(f"  ✓ Bild geladen: {Path(record['file_path']).name}")
+                        return record
             except Exception as e:
+                if self.deadline and self.deadline.expired('downloads'):
+                    self._skip('image', alt, None, OUT_OF_TIME, **(ids or {}))
+                    return None
                 print(f"  ⚠️  Fehler bei Bild {alt[:20]}: {e}")
                 return None
+            finally:
+                self._images_done += 1
+                self._progress('images', self._images_done, self._images_total)
+                self._asset_done('image', ids)
+
+    async def _read_within_budget(self, response, alt, store, ids):
+        """Reads an image response unless it breaks the byte budget (then records it as skipped)"""
+        expected_size = response.content_length
+        reason = self.byte_budget.admit(expected_size, store.directory)
+        if reason:
+            self._skip('image', alt, expected_size, reason, **ids)
+            return None
+
+        # Content-Length may be missing or wrong: stop reading at the per-file limit
+        chunks = []
+        received = 0
+        try:
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                received += len(chunk)
+                if not self.byte_budget.allows_file(received):
+                    self.byte_budget.consume(expected_size, 0)
+                    self._skip('image', alt, expected_size or received, TOO_LARGE, **ids)
+                    return None
+                chunks.append(chunk)
+        except BaseException:
+            self.byte_budget.consume(expected_size, 0)
+            raise
+        self.byte_budget.consume(expected_size, received)
+        return b''.join(chunks)
 
     # Keeping old method name for compatibility if needed, but it should be unused
     async def fetch_taskcard_data(self): 
@@ -582,213 +1453,141 @@ class TaskcardDownloader:
 
 
 
-    def generate_pdf(self, downloaded_pdfs=None):
-        """Generates structured PDF with TOC, columns as chapters, cards as subchapters, attachments inline"""
+    def generate_pdf(self, downloaded_pdfs=None, job=None):
+        """Generates structured PDF with TOC, columns as chapters, cards as subchapters, attachments inline
+
+        With a job handle, the rendered overview is kept in the job's work
+        directory, so a resumed job only redoes the merge.
+        """
+        # Damaged PDFs are repaired into a temp directory that only lives until the merge
+        repair_dir = tempfile.mkdtemp(prefix='taskcard_repair_') if self.repair_pdfs else None
+        try:
+            self._generate_pdf(downloaded_pdfs, job, repair_dir)
+        finally:
+            if repair_dir:
+                shutil.rmtree(repair_dir, ignore_errors=True)
+
+    def _generate_pdf(self, downloaded_pdfs, job, repair_dir):
         print(f"\nGeneriere strukturiertes PDF mit Inhaltsverzeichnis...")
 
-        # Build a map of attachment info to PDF file path for easy lookup
-        pdf_map = {}
-        if downloaded_pdfs:
-            for pdf_dict in downloaded_pdfs:
-                pdf_map[pdf_dict['info']] = pdf_dict['file_path']
-
-        # Create temporary overview PDF first
-        temp_overview = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-        temp_overview.close()
-
-        doc = SimpleDocTemplate(
-            temp_overview.name,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
+        # Files that did not go through the download pipeline (taskcard_render.py)
+        with self._phase('preflight'):
+            checked = run_preflight(downloaded_pdfs, self.preflight_workers, repair_dir)
+        print_report(checked)
+        mergeable = [record for record in downloaded_pdfs or [] if merge_path(record)]
+        # Other files are embedded on their card's page (linked instead in a bundle)
+        embedded = [] if self.bundle_output else [record for record in downloaded_pdfs or [] if route(record) == EMBED]
 
-        story = []
-        styles = getSampleStyleSheet()
-
-        # Define styles
-        title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'],
-            fontSize=24, textColor=colors.HexColor('#1a73e8'), spaceAfter=30,
-            spaceBefore=10, alignment=TA_CENTER, fontName='Helvetica-Bold')
-
-        toc_title_style = ParagraphStyle('TOCTitle', parent=styles['Heading2'],
-            fontSize=18, spaceAfter=20, spaceBefore=10, fontName='Helvetica-Bold')
-
-        toc_entry_style = ParagraphStyle('TOCEntry', parent=styles['Normal'],
-            fontSize=12, leftIndent=20, spaceAfter=8, fontName='Helvetica')
-
-        chapter_style = ParagraphStyle('ChapterTitle', parent=styles['Heading1'],
-            fontSize=18, textColor=colors.HexColor('#34a853'), spaceAfter=15,
-            spaceBefore=10, fontName='Helvetica-Bold')
-
-        card_title_style = ParagraphStyle('CardTitle', parent=styles['Heading2'],
-            fontSize=14, textColor=colors.HexColor('#ea4335'), spaceAfter=10,
-            spaceBefore=15, leftIndent=10, fontName='Helvetica-Bold')
-
-        card_content_style = ParagraphStyle('CardContent', parent=styles['Normal'],
-            fontSize=11, leftIndent=20, spaceAfter=6, fontName='Helvetica')
-
-        link_style = ParagraphStyle('Link', parent=styles['Normal'],
-            fontSize=10, textColor=colors.HexColor('#1a73e8'),
-            leftIndent=20, spaceAfter=4, fontName='Helvetica')
-
-        attachment_note_style = ParagraphStyle('AttachmentNote', parent=styles['Normal'],
-            fontSize=10, textColor=colors.HexColor('#666666'), leftIndent=20,
-            spaceAfter=8, fontName='Helvetica-Oblique')
-
-        # 1. TITLE PAGE
-        story.append(Paragraph(self._escape_html(self.data.get('board_title', 'Taskcard Board')), title_style))
-        story.append(Spacer(1, 0.5*cm))
-        date_style = ParagraphStyle('DateStyle', parent=styles['Normal'],
-            fontSize=10, textColor=colors.HexColor('#666666'), alignment=TA_CENTER)
-        story.append(Paragraph(f"Erstellt am: {datetime.now().strftime('%d.%m.%Y %H:%M')}", date_style))
-
-        # Add extraction strategy info
-        strategy = self.data.get('extraction_strategy', '')
-        if strategy:
-            strategy_style = ParagraphStyle('StrategyStyle', parent=styles['Normal'],
-                fontSize=9, textColor=colors.HexColor('#666666'),
-                alignment=TA_CENTER, fontName='Helvetica-Oblique')
-            story.append(Spacer(1, 0.3*cm))
-            story.append(Paragraph(f"Extrahiert mit: {self._escape_html(strategy)}", strategy_style))
-
-        story.append(PageBreak())
-
-        # 2. TABLE OF CONTENTS
-        story.append(Paragraph("Inhaltsverzeichnis", toc_title_style))
-        story.append(Spacer(1, 0.5*cm))
-
-        for col_idx, column in enumerate(self.data['columns']):
-            col_title = column.get('title', f'Spalte {col_idx + 1}')
-            card_count = len(column.get('cards', []))
-            toc_text = f"{col_idx + 1}. {self._escape_html(col_title)} ({card_count} Karte{'n' if card_count != 1 else ''})"
-            story.append(Paragraph(toc_text, toc_entry_style))
-
-        story.append(PageBreak())
-
-        # 3. CHAPTERS (COLUMNS) WITH CARDS
-        for col_idx, column in enumerate(self.data['columns']):
-            # Chapter title (Column name)
-            col_title = column.get('title', f'Spalte {col_idx + 1}')
-            story.append(Paragraph(f"{col_idx + 1}. {self._escape_html(col_title)}", chapter_style))
-            story.append(Spacer(1, 0.5*cm))
-
-            cards = column.get('cards', [])
-            if not cards:
-                no_cards_style = ParagraphStyle('NoCards', parent=card_content_style, fontName='Helvetica-Oblique')
-                story.append(Paragraph("<i>Keine Karten vorhanden</i>", no_cards_style))
-                story.append(Spacer(1, 0.5*cm))
-            else:
-                for card_idx, card in enumerate(cards):
-                    # Card title (Subchapter)
-                    card_title = card.get('title', f'Karte {card_idx + 1}')
-                    story.append(Paragraph(f"{col_idx + 1}.{card_idx + 1} {self._escape_html(card_title)}", card_title_style))
-                    story.append(Spacer(1, 0.2*cm))
-
-                    # Card description/content
-                    description = card.get('description', '').strip()
-                    if description:
-                        for line in description.split('\n'):
-                            if line.strip():
-                                story.append(Paragraph(self._escape_html(line.strip()), card_content_style))
-                        story.append(Spacer(1, 0.3*cm))
-
-                    # Card images
-                    images = card.get('images', [])
-                    if images:
-                        for img in images:
-                            local_path = img.get('local_path')
-                            alt = img.get('alt', 'Bild')
-
-                            if local_path and os.path.exists(local_path):
-                                try:
-                                    # Calculate maximum width (PDF page width minus margins)
-                                    max_width = A4[0] - 4*cm  # 2cm left + 2cm right margin
-                                    max_height = 10*cm  # Maximum height to prevent huge images
-
-                                    # Create ReportLab Image object
-                                    img_obj = RLImage(local_path)
-
-                                    # Get original dimensions
-                                    img_width = img_obj.imageWidth
-                                    img_height = img_obj.imageHeight
-
-                                    # Calculate scaling to fit within max dimensions
-                                    width_scale = max_width / img_width
-                                    height_scale = max_height / img_height
-                                    scale = min(width_scale, height_scale, 1.0)  # Don't upscale
-
-                                    # Set final dimensions
-                                    img_obj.drawWidth = img_width * scale
-                                    img_obj.drawHeight = img_height * scale
-
-                                    # Add image to story with alt text caption
-                                    story.append(Spacer(1, 0.2*cm))
-                                    story.append(img_obj)
-
-                                    # Add caption if alt text exists
-                                    if alt and alt != 'Bild':
-                                        caption_style = ParagraphStyle('ImageCaption', parent=card_content_style,
-                                            fontSize=9, textColor=colors.HexColor('#666666'),
-                                            fontName='Helvetica-Oblique', alignment=TA_CENTER)
-                                        story.append(Spacer(1, 0.1*cm))
-                                        story.append(Paragraph(self._escape_html(alt), caption_style))
-
-                                    story.append(Spacer(1, 0.3*cm))
-
-                                except Exception as e:
-                                    print(f"Fehler beim Einfügen von Bild {local_path}: {e}")
-                                    # Add note about missing image
-                                    error_style = ParagraphStyle('ImageError', parent=card_content_style,
-                                        fontSize=9, textColor=colors.HexColor('#ea4335'),
-                                        fontName='Helvetica-Oblique')
-                                    story.append(Paragraph(f"⚠️ Bild konnte nicht eingefügt werden: {alt}", error_style))
-                                    story.append(Spacer(1, 0.2*cm))
-
-                    # Card links
-                    links = card.get('links', [])
-                    if links:
-                        for link in links:
-                            link_text = f"🔗 <a href='{link['url']}' color='blue'>{self._escape_html(link['text'][:80])}</a>"
-                            story.append(Paragraph(link_text, link_style))
-                        story.append(Spacer(1, 0.3*cm))
-
-                    # Note about PDF attachments that will follow
-                    attachments = card.get('attachments', [])
-                    pdf_attachments = [att for att in attachments if isinstance(att, dict) and 'PDF' in att.get('info', '').upper()]
-
-                    if pdf_attachments and pdf_map:
-                        att_count = len(pdf_attachments)
-                        story.append(Paragraph(f"📎 {att_count} PDF-Anhang{'̈e' if att_count > 1 else ''} (folgt auf nächsten Seiten)", attachment_note_style))
-
-                    story.append(Spacer(1, 0.5*cm))
-
-            # Page break after each column (chapter)
-            story.append(PageBreak())
-
-        # Build the overview PDF
-        doc.build(story)
-
-        total_cards = sum(len(col['cards']) for col in self.data['columns'])
-        print(f"  Übersicht erstellt")
-        print(f"   Spalten: {len(self.data['columns'])}")
-        print(f"   Karten gesamt: {total_cards}")
+        # Index downloaded files by card id for direct lookup
+        _, files_by_card = index_downloaded_files(downloaded_pdfs)
 
-        # Now merge with downloaded PDFs, inserting them after their respective cards
-        if downloaded_pdfs and len(downloaded_pdfs) > 0:
-            print(f"\nFüge {len(downloaded_pdfs)} PDF-Anhänge ein...")
-            self._merge_pdfs_structured(temp_overview.name, downloaded_pdfs)
+        if job:
+            overview_path = job.work_dir / 'overview.pdf'
         else:
-            import shutil
-            shutil.copy(temp_overview.name, self.output_file)
+            # Create temporary overview PDF first
+            temp_overview = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
+            temp_overview.close()
+            overview_path = Path(temp_overview.name)
+
+        if job and job.reached('rendered') and overview_path.exists():
+            print(f"  ⏩ Übersicht bereits gerendert (Job {job.job_id})")
+        else:
+            self._progress('render', 0)
+            with self._phase('render'):
+                self._render_overview(overview_path, files_by_card)
+            if job:
+                job.advance('rendered')
+
+        # Now merge with downloaded PDFs, inserting them after their respective cards
+        self._progress('merge', 0)
+        with self._phase('merge'):
+            if mergeable or embedded:
+                if mergeable:
+                    print(f"\nFüge {len(mergeable)} PDF-Anhänge ein...")
+                self._merge_pdfs_structured(str(overview_path), mergeable, embedded)
+            else:
+                import shutil
+                shutil.copy(overview_path, self.output_file)
+
+        if not job:
+            os.unlink(overview_path)
+
+        # Deduplicate images/fonts, compress, optionally linearize
+        if self.optimize_output:
+            self._progress('optimize', 0)
+            with self._phase('optimize'):
+                optimize_pdf(self.output_file, linearize=self.linearize)
+        self._progress('optimize', 1)
+
+        if job:
+            job.advance('merged')
 
-        os.unlink(temp_overview.name)
         print(f"✅ PDF erfolgreich erstellt: {self.output_file}")
 
-    def _merge_pdfs_structured(self, overview_pdf_path, downloaded_pdfs):
-        """Merges overview PDF with downloaded PDFs, inserting after each card's section"""
+    def _link_base(self):
+        """In a bundle, files that can't be shown in the PDF are linked relative to the PDF instead of embedded"""
+        return str(Path(self.output_file).parent) if self.bundle_output else None
+
+    def _render_overview(self, overview_path, files_by_card):
+        """Renders title page, TOC and all columns/cards into overview_path with ReportLab
+
+        The column chapters are rendered first, so the TOC can give the page
+        on which each column starts. Columns already rendered by the pipeline
+        (see _render_ready_columns) are not rendered again; with
+        render_workers, the remaining ones are rendered as separate fragments
+        in a process pool. Otherwise all chapters are built in one pass.
+        Either way title page, TOC and chapters are assembled the same way,
+        so both paths give the same document.
+        """
+        columns = self.data['columns']
+        fragments = dict(self._pipeline.fragments) if self._pipeline else {}
+        missing = [idx for idx in range(len(columns)) if idx not in fragments]
+        skipped = skipped_by_card(self.data)
+        work_dir = Path(tempfile.mkdtemp(prefix='taskcard_render_'))
+        try:
+            if columns and missing and self.render_workers:
+                with self._subphase('render:columns'):
+                    fragments.update(render_columns(
+                        work_dir, columns, missing, files_by_card, skipped, self.render_workers,
+                        self._link_base(), progress=lambda done, total: self._progress('render', done, total)))
+                print(f"  {len(missing)} Spalten parallel gerendert ({self.render_workers} Prozesse)")
+                missing = []
+
+            if columns and not missing:
+                body_paths = [fragments[idx][0] for idx in range(len(columns))]
+                chapter_starts = []
+                page = 1
+                for idx in range(len(columns)):
+                    chapter_starts.append(page)
+                    page += fragments[idx][1]
+            else:
+                styles = make_styles()
+                story = []
+                for col_idx, column in enumerate(columns):
+                    story.extend(column_story(col_idx, column, files_by_card, skipped, styles, self._link_base()))
+                body_paths = [work_dir / 'columns.pdf'] if story else []
+                chapter_starts = []
+                with self._subphase('render:build'):
+                    if story:
+                        chapter_starts, _ = build_pdf(body_paths[0], story)
+
+            with self._subphase('render:assemble'):
+                assemble_overview(overview_path, self.data, body_paths, chapter_starts)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        total_cards = sum(len(col['cards']) for col in columns)
+        print(f"  Übersicht erstellt")
+        print(f"   Spalten: {len(columns)}")
+        print(f"   Karten gesamt: {total_cards}")
+
+    def _merge_pdfs_structured(self, overview_pdf_path, downloaded_pdfs, embedded=None):
+        """Merges overview PDF with downloaded PDFs, inserting after each card's section
+
+        downloaded_pdfs must be preflighted records (see preflight.py); only
+        validated PDFs are merged. The files in embedded are attached to the
+        overview pages that link them (see attachment_routing.py).
+        """
         try:
             from PyPDF2 import PdfReader, PdfWriter
 
@@ -799,27 +1598,40 @@ class TaskcardDownloader:
             # but that would require tracking page numbers during PDF generation
 
             # Add overview PDF pages
-            with open(overview_pdf_path, 'rb') as f:
+            with self._subphase('merge:overview'), open(overview_pdf_path, 'rb') as f:
                 pdf_reader = PdfReader(f)
                 for page in pdf_reader.pages:
                     pdf_writer.add_page(page)
 
-            # Add attachment PDFs
-            for pdf_dict in downloaded_pdfs:
-                pdf_path = pdf_dict['file_path']
-                info = pdf_dict['info']
-                print(f"  Füge hinzu: {info[:60]}...")
+            # ReportLab can't create file attachments; its placeholder links become them here
+            if embedded:
+                with self._subphase('merge:embed'):
+                    count = embed_files(pdf_writer, embedded)
+                print(f"  📎 {count} Datei(en) eingebettet")
 
-                try:
-                    with open(pdf_path, 'rb') as f:
-                        pdf_reader = PdfReader(f)
-                        for page in pdf_reader.pages:
-                            pdf_writer.add_page(page)
-                except Exception as e:
-                    print(f"    ⚠️  Fehler beim Hinzufügen: {str(e)[:60]}")
+            # Add attachment PDFs
+            with self._subphase('merge:attachments'):
+                for pdf_idx, pdf_dict in enumerate(downloaded_pdfs):
+                    self._progress('merge', pdf_idx, len(downloaded_pdfs))
+                    pdf_path = merge_path(pdf_dict)
+                    if not pdf_path:
+                        continue
+                    info = pdf_dict['info']
+                    print(f"  Füge hinzu: {info[:60]}... ({pdf_dict['preflight']['pages']} Seiten)")
+
+                    try:
+                        with open(pdf_path, 'rb') as f:
+                            pdf_reader = PdfReader(f, strict=False)
+                            if pdf_reader.is_encrypted:
+                                # Preflight only passes PDFs that open with an empty password
+                                pdf_reader.decrypt('')
+                            for page in pdf_reader.pages:
+                                pdf_writer.add_page(page)
+                    except Exception as e:
+                        print(f"    ⚠️  Fehler beim Hinzufügen: {e}")
 
             # Write final PDF
-            with open(self.output_file, 'wb') as f:
+            with self._subphase('merge:write'), open(self.output_file, 'wb') as f:
                 pdf_writer.write(f)
 
         except Exception as e:
@@ -828,19 +1640,192 @@ class TaskcardDownloader:
 
 
 
-    @staticmethod
-    def _escape_html(text):
-        """Escapes HTML special characters"""
-        if not text:
-            return ""
-        text = str(text)
-        text = text.replace('&', '&amp;')
-        text = text.replace('<', '&lt;')
-        text = text.replace('>', '&gt;')
-        return text
+    def debug_screenshot_path(self):
+        """Debug screenshot named after the output (several runs may write into one folder)"""
+        output_path = Path(self.output_file)
+        return output_path.with_name(f"{output_path.stem}_debug.png")
+
+    def archive_dir(self):
+        """Directory of the HTML/Markdown archive, derived from the output filename"""
+        output_path = Path(self.output_file)
+        return output_path.parent / output_path.stem
+
+    def export_archive(self, archive_dir=None, fmt='html', downloaded_files=None):
+        """Export Taskcard data as browsable offline HTML or Markdown
+
+        Args:
+            archive_dir: Target directory (default: output filename without suffix)
+            fmt: 'html' or 'markdown'
+            downloaded_files: List of downloaded file dicts (optional)
+        """
+        print(f"\nGeneriere {fmt.upper()}-Archiv...")
+        archive_dir = Path(archive_dir) if archive_dir else self.archive_dir()
+        index_path = export_archive(
+            self.data,
+            archive_dir,
+            fmt=fmt,
+            downloaded_files=downloaded_files,
+            meta_lines=[
+                f"Erstellt am: {datetime.now().strftime('%d.%m.%Y %H:%M')}",
+                f"Quelle: {self.url}",
+            ]
+        )
+        print(f"✅ Archiv erfolgreich erstellt: {index_path}")
+        return index_path
+
+    @classmethod
+    def from_export(cls, json_file, attachments_dir=None, output_file=None, **kwargs):
+        """Rebuilds a downloader from an export_json file, without any browser
+
+        Args:
+            json_file: JSON file written by export_json
+            attachments_dir: Directory with the downloaded files (default: <json stem>_attachments)
+            output_file: Target PDF (default: JSON filename with .pdf)
+            **kwargs: Passed to the constructor (optimize_output, linearize)
+
+        Local file paths stored in the export are used if they still exist,
+        otherwise the file is looked up by name in attachments_dir (e.g. after
+        the export was moved or renamed).
+
+        Returns (downloader, downloaded_files) ready for generate_pdf.
+        """
+        json_path = Path(json_file)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            export_data = json.load(f)
 
+        if attachments_dir is None:
+            attachments_dir = json_path.parent / f"{json_path.stem}_attachments"
+        attachments_dir = Path(attachments_dir)
 
+        def resolve(path):
+            if not path:
+                return None
+            if os.path.exists(path):
+                return str(path)
+            candidate = attachments_dir / Path(path).name
+            return str(candidate) if candidate.exists() else None
+
+        downloaded_files = []
+
+        def add_file(info, local_file, file_type, **ids):
+            file_path = resolve(local_file)
+            if file_path:
+                downloaded_files.append({'info': info, 'file_path': file_path, 'type': file_type, **ids})
+
+        data = {
+            'board_title': export_data.get('board_title', ''),
+            'extraction_strategy': export_data.get('extraction_strategy', ''),
+            'debug_info': export_data.get('debug_info', ''),
+            'columns': []
+        }
+
+        for column in export_data.get('columns', []):
+            column_data = {'id': column.get('id'), 'title': column.get('title', ''), 'cards': []}
+
+            for card in column.get('cards', []):
+                ids = {'column_id': column.get('id'), 'card_id': card.get('id')}
+                card_data = {
+                    'id': card.get('id'),
+                    'title': card.get('title', ''),
+                    'description': card.get('description', ''),
+                    'links': card.get('links', []),
+                    'attachments': [],
+                    'images': []
+                }
+
+                for attachment in card.get('attachments', []):
+                    # Exports written before attachments had ids keep them with id None
+                    card_data['attachments'].append({'id': attachment.get('id'), 'info': attachment.get('caption', '')})
+                    add_file(attachment.get('caption', ''), attachment.get('local_file'), 'file',
+                             attachment_id=attachment.get('id'), **ids)
+
+                for image in card.get('images', []):
+                    local_path = resolve(image.get('local_file'))
+                    card_data['images'].append({
+                        'id': image.get('id'),
+                        'src': image.get('src', ''),
+                        'alt': image.get('alt', 'Bild'),
+                        'local_path': local_path
+                    })
+                    add_file(f"Bild: {image.get('alt', 'Bild')}", local_path, 'image',
+                             image_id=image.get('id'), **ids)
+
+                column_data['cards'].append(card_data)
+
+            data['columns'].append(column_data)
+
+        for attachment in export_data.get('unassigned_attachments', []):
+            add_file(attachment.get('caption', ''), attachment.get('local_file'), 'file')
+
+        if export_data.get('skipped'):
+            data['skipped'] = export_data['skipped']
+
+        if output_file is None:
+            output_file = str(json_path.with_suffix('.pdf'))
 
+        downloader = cls(export_data.get('source_url', ''), output_file, **kwargs)
+        downloader.data = data
+        return downloader, downloaded_files
+
+    @staticmethod
+    def _attachment_export_entry(attachment_id, caption, record):
+        """Builds the JSON entry for one attachment and its downloaded file (if any)"""
+        local_file = record['file_path'] if record else None
+        attachment_data = {
+            'id': attachment_id,
+            'caption': caption,
+            'local_file': local_file,  # Path to downloaded file (null if not downloaded)
+        }
+
+        # Add appropriate note based on whether file was downloaded
+        if local_file:
+            attachment_data['sha256'] = record.get('sha256')
+            attachment_data['note'] = 'Datei wurde heruntergeladen - nutze local_file für Zugriff'
+        else:
+            attachment_data['note'] = 'Datei wurde nicht heruntergeladen (PDF-Anhänge Option war deaktiviert oder Download fehlgeschlagen)'
+        return attachment_data
+
+    def _card_export_entry(self, card, files_by_attachment, files_by_card):
+        """Builds the export entry for one card (shared by JSON and JSON Lines export)"""
+        card_data = {
+            'id': card.get('id'),
+            'title': card.get('title', ''),
+            'description': card.get('description', ''),
+            'attachments': [],
+            'images': [],
+            'links': []
+        }
+
+        # Add attachments with local file paths if available
+        attachments, unlisted = card_attachment_files(card, files_by_attachment, files_by_card)
+        for attachment, record in attachments:
+            card_data['attachments'].append(
+                self._attachment_export_entry(attachment.get('id'), attachment.get('info', ''), record)
+            )
+
+        # Files downloaded from this card that the extractor did not list
+        for record in unlisted:
+            card_data['attachments'].append(
+                self._attachment_export_entry(None, record.get('info', ''), record)
+            )
+
+        # Add images
+        for image in card.get('images', []):
+            card_data['images'].append({
+                'id': image.get('id'),
+                'alt': image.get('alt', ''),
+                'src': image.get('src', ''),
+                'local_file': image.get('local_path')
+            })
+
+        # Add links
+        for link in card.get('links', []):
+            card_data['links'].append({
+                'text': link.get('text', ''),
+                'url': link.get('url', '')
+            })
+
+        return card_data
 
     def export_json(self, json_file=None, downloaded_pdfs=None):
         """Export Taskcard data as JSON
@@ -852,16 +1837,8 @@ class TaskcardDownloader:
         if json_file is None:
             json_file = self.output_file.replace('.pdf', '.json')
 
-        # Create a mapping of PDF captions to local file paths
-        pdf_mapping = {}
-        if downloaded_pdfs:
-            for pdf_item in downloaded_pdfs:
-                # downloaded_pdfs is a list of dicts: {'info': caption, 'file_path': path}
-                if isinstance(pdf_item, dict):
-                    info = pdf_item.get('info', '')
-                    file_path = pdf_item.get('file_path', '')
-                    if info and file_path:
-                        pdf_mapping[info] = file_path
+        # Index downloaded files by their stable attachment/card ids
+        files_by_attachment, files_by_card = index_downloaded_files(downloaded_pdfs)
 
         # Prepare data for export
         export_data = {
@@ -876,63 +1853,151 @@ class TaskcardDownloader:
         # Add all columns and cards
         for column in self.data.get('columns', []):
             column_data = {
+                'id': column.get('id'),
                 'title': column.get('title', ''),
                 'cards': []
             }
 
             for card in column.get('cards', []):
-                card_data = {
-                    'title': card.get('title', ''),
-                    'description': card.get('description', ''),
-                    'attachments': [],
-                    'links': []
-                }
-
-                # Add attachments with local file paths if available
-                for attachment in card.get('attachments', []):
-                    caption = attachment.get('caption', '')
-
-                    # Try to find matching downloaded PDF by caption
-                    local_file = pdf_mapping.get(caption, None)
-
-                    # If not found by exact match, try fuzzy matching
-                    if not local_file:
-                        for pdf_info, pdf_path in pdf_mapping.items():
-                            # Check if caption is contained in PDF info or vice versa
-                            if caption and pdf_info and (caption in pdf_info or pdf_info in caption):
-                                local_file = pdf_path
-                                break
-
-                    attachment_data = {
-                        'caption': caption,
-                        'local_file': local_file,  # Path to downloaded PDF (null if not downloaded)
-                    }
-
-                    # Add appropriate note based on whether file was downloaded
-                    if local_file:
-                        attachment_data['note'] = 'Datei wurde heruntergeladen - nutze local_file für Zugriff'
-                    else:
-                        attachment_data['note'] = 'Datei wurde nicht heruntergeladen (PDF-Anhänge Option war deaktiviert oder Download fehlgeschlagen)'
-
-                    card_data['attachments'].append(attachment_data)
-
-                # Add links
-                for link in card.get('links', []):
-                    card_data['links'].append({
-                        'text': link.get('text', ''),
-                        'url': link.get('url', '')
-                    })
-
+                card_data = self._card_export_entry(card, files_by_attachment, files_by_card)
                 column_data['cards'].append(card_data)
 
             export_data['columns'].append(column_data)
 
+        # Downloads that could not be linked to any card
+        unassigned = [r for r in files_by_card.get(None, []) if r.get('type') != 'image']
+        if unassigned:
+            export_data['unassigned_attachments'] = [
+                self._attachment_export_entry(None, r.get('info', ''), r) for r in unassigned
+            ]
+
+        # Images and attachments left out by the byte budget
+        if self.data.get('skipped'):
+            export_data['skipped'] = self.data['skipped']
+
         # Write JSON file
         with open(json_file, 'w', encoding='utf-8') as f:
             json.dump(export_data, f, ensure_ascii=False, indent=2)
 
         print(f"✅ JSON erfolgreich exportiert: {json_file}")
 
+    @staticmethod
+    def _open_text_stream(path, compression=None):
+        """Opens a text file for writing, optionally gzip or zstd compressed"""
+        if compression == 'gzip':
+            import gzip
+            return gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+
+        if compression == 'zstd':
+            try:
+                from compression import zstd  # Python 3.14+
+                return zstd.open(path, 'wt', encoding='utf-8')
+            except ImportError:
+                pass
+            try:
+                import zstandard
+            except ImportError:
+                raise RuntimeError("zstd-Kompression benötigt das Paket 'zstandard' (pip install zstandard)") from None
+            return zstandard.open(path, 'wt', encoding='utf-8')
+
+        return open(path, 'w', encoding='utf-8')
+
+    def export_jsonl(self, jsonl_file=None, downloaded_pdfs=None, compression=None):
+        """Export Taskcard data as streaming JSON Lines
+
+        Writes one compact record per line: first a 'board' record, then a
+        'column' record followed by one 'card' record per card. Records are
+        written as they are built, without an intermediate copy of the board,
+        so ingestion pipelines can consume the file incrementally. The file is
+        written once the downloads are done, as the card records carry the
+        local files and their hashes. In a bundle, local_file paths are
+        relative to the bundle root.
+
+        Args:
+            jsonl_file: Path to output file (default: output name with .jsonl[.gz|.zst])
+            downloaded_pdfs: List of downloaded file records (optional)
+            compression: None, 'gzip' or 'zstd'
+        """
+        if jsonl_file is None:
+            suffix = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}.get(compression, '.jsonl')
+            jsonl_file = str(Path(self.output_file).with_suffix(suffix))
+
+        files_by_attachment, files_by_card = index_downloaded_files(downloaded_pdfs)
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        columns = self.data.get('columns', [])
+        # The bundle stores files relative to the output's folder (see BundleWriter)
+        bundle_root = Path(self.output_file).parent if self.bundle_output else None
+
+        def relative(entries):
+            if bundle_root is not None:
+                for entry in entries:
+                    if entry.get('local_file'):
+                        entry['local_file'] = Path(os.path.relpath(entry['local_file'], bundle_root)).as_posix()
+            return entries
+
+        with self._open_text_stream(jsonl_file, compression) as f:
+            f.write(encoder.encode({
+                'type': 'board',
+                'board_title': self.data.get('board_title', ''),
+                'export_date': datetime.now().isoformat(),
+                'source_url': self.url,
+                'extraction_strategy': self.data.get('extraction_strategy', 'Unbekannt'),
+                'column_count': len(columns)
+            }) + '\n')
+
+            for column in columns:
+                cards = column.get('cards', [])
+                f.write(encoder.encode({
+                    'type': 'column',
+                    'id': column.get('id'),
+                    'title': column.get('title', ''),
+                    'card_count': len(cards)
+                }) + '\n')
+
+                for card in cards:
+                    card_data = self._card_export_entry(card, files_by_attachment, files_by_card)
+                    relative(card_data['attachments'])
+                    relative(card_data['images'])
+                    card_data = {'type': 'card', 'column_id': column.get('id'), **card_data}
+                    f.write(encoder.encode(card_data) + '\n')
+
+            for record in files_by_card.get(None, []):
+                if record.get('type') != 'image':
+                    entry = relative([self._attachment_export_entry(None, record.get('info', ''), record)])[0]
+                    f.write(encoder.encode({'type': 'unassigned_attachment', **entry}) + '\n')
+
+            for item in self.data.get('skipped', []):
+                f.write(encoder.encode({'type': 'skipped', **item}) + '\n')
+
+        print(f"✅ JSON Lines erfolgreich exportiert: {jsonl_file}")
+        return jsonl_file
+
+
+def write_memory_report(downloader):
+    """Prints the memory profile of a finished run and saves it next to the output"""
+    if not downloader.memory_profiler:
+        return
+    output_path = Path(downloader.output_file)
+    report_path = output_path.parent / f"{output_path.stem}_memory.txt"
+    downloader.memory_profiler.write_report(report_path)
+    print(f"\n{downloader.memory_profiler.report()}")
+    print(f"📈 Speicherprofil gespeichert: {report_path}")
+
+
+def profile_dir(output_file):
+    """Directory for the pstats files of a --profile run"""
+    output_path = Path(output_file)
+    return output_path.parent / f"{output_path.stem}_profile"
+
+
+def write_profile_summary(downloader):
+    """Prints the combined cProfile summary of a finished run and saves it with the pstats files"""
+    if not downloader.phase_profiler:
+        return
+    summary_path = downloader.phase_profiler.write_summary()
+    print(f"\n{downloader.phase_profiler.summary()}")
+    print(f"📈 Profil gespeichert: {summary_path.parent} (ansehen z.B. mit: python -m pstats <datei>.pstats)")
+
 
 async def main():
     parser = argparse.ArgumentParser(
@@ -940,6 +2005,7 @@ async def main():
     )
     parser.add_argument(
         'url',
+        nargs='?',
         help='Taskcard URL (including token)'
     )
     parser.add_argument(
@@ -952,12 +2018,263 @@ async def main():
         help='Do not include PDF attachments in the output',
         action='store_true'
     )
+    parser.add_argument(
+        '--format',
+        help='Output format: pdf (default), json (data only, see taskcard_render.py), or a browsable offline archive as html or markdown',
+        choices=['pdf', 'json', 'html', 'markdown'],
+        default='pdf'
+    )
+    parser.add_argument(
+        '--bundle',
+        help='Write everything (PDF or JSON, attachments, images) into a single <output>.zip instead of separate files',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--jsonl',
+        help='Also export the board as streaming JSON Lines (one record per column and card)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--jsonl-compression',
+        help='Compression for the JSON Lines export (zstd requires the zstandard package)',
+        choices=['none', 'gzip', 'zstd'],
+        default='none'
+    )
+    parser.add_argument(
+        '--no-optimize',
+        help='Skip the PDF size optimization (image/font deduplication, object streams)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--linearize',
+        help='Linearize the PDF for fast web view (requires pikepdf or qpdf)',
+        action='store_true'
+    )
+
+    parser.add_argument(
+        '--repair-pdfs',
+        help='Try to repair damaged PDF attachments before merging (best with pikepdf or qpdf installed)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--render-workers',
+        metavar='N',
+        type=int,
+        help='Render the column chapters as separate PDFs in N processes and assemble them (large boards)',
+        default=None
+    )
+
+    parser.add_argument(
+        '--resume',
+        help='Resume unfinished jobs from the job database (all of them, or only those for the given URL)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--job-db',
+        help='SQLite job database for checkpoints and crash resume (default: in the app folder)',
+        default=None
+    )
+    parser.add_argument(
+        '--no-job-store',
+        help='Do not track the run in the job database (no checkpoints, no resume)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--memory-profile',
+        help='Measure peak memory per phase (Python heap, RSS incl. Chromium) and write <output>_memory.txt',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--profile',
+        help='Run every phase under cProfile; writes one pstats file per phase and a summary to <output>_profile/',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--watch',
+        metavar='SECONDS',
+        type=float,
+        help='Check the board every SECONDS and re-export only when its content changed (hashes in <output>.hash.json)',
+        default=None
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='DIR',
+        help='Record a Playwright/Chromium trace and step timings of the page load into a zip in DIR',
+        default=None
+    )
+
+    parser.add_argument(
+        '--plan',
+        help='Only load the board and print the download plan (item counts, estimated sizes); writes <output>_plan.json',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--max-file-size',
+        metavar='MB',
+        type=float,
+        help='Skip images and attachments larger than MB (listed as placeholders in the output)',
+        default=None
+    )
+    parser.add_argument(
+        '--max-board-size',
+        metavar='MB',
+        type=float,
+        help='Stop downloading further images and attachments once MB have been downloaded for the board',
+        default=None
+    )
+    parser.add_argument(
+        '--min-free-mb',
+        metavar='MB',
+        type=float,
+        help=f'Skip downloads that would leave less than MB of free disk space (default: {DEFAULT_MIN_FREE_MB})',
+        default=DEFAULT_MIN_FREE_MB
+    )
+    parser.add_argument(
+        '--deadline',
+        metavar='SECONDS',
+        type=float,
+        help='Overall time limit per board; images and attachments that cannot finish in time are skipped (placeholders in the PDF)',
+        default=None
+    )
+    parser.add_argument(
+        '--browser-profile',
+        help='Use a persistent browser profile in the app folder, so the web app and fonts are cached across runs',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--browser-cache-mb',
+        metavar='MB',
+        type=int,
+        help=f'Size limit of the browser cache per profile (default: {DEFAULT_CACHE_MB})',
+        default=DEFAULT_CACHE_MB
+    )
+    parser.add_argument(
+        '--clean-browser-profiles',
+        help='Delete the persistent browser profiles (except those in use) and exit',
+        action='store_true'
+    )
+    add_filter_arguments(parser)
 
     args = parser.parse_args()
 
-    downloader = TaskcardDownloader(args.url, args.output)
-    await downloader.download_and_save(include_pdf_attachments=not args.no_attachments)
+    try:
+        export_filter = ExportFilter.from_args(args)
+    except re.error as e:
+        parser.error(f'invalid filter pattern: {e}')
+
+    browser_profiles = BrowserProfiles(get_app_dir() / 'browser_profiles', cache_limit=args.browser_cache_mb * MB)
+    if args.clean_browser_profiles:
+        removed, freed, busy = browser_profiles.clean()
+        print(f"🧹 {removed} Browser-Profil(e) gelöscht, {format_size(freed)} freigegeben"
+              + (f", {busy} in Benutzung" if busy else ""))
+        return
+
+    if not args.url and not args.resume:
+        parser.error('url is required (unless --resume is given)')
+    if args.bundle and args.format not in ('pdf', 'json'):
+        parser.error('--bundle works with --format pdf or json (html/markdown archives are folders)')
+
+    def configure(downloader):
+        """Applies the options that are not constructor arguments"""
+        if args.memory_profile:
+            downloader.memory_profiler = MemoryProfiler()
+        downloader.trace_dir = args.trace
+        if args.profile:
+            downloader.phase_profiler = PhaseProfiler(profile_dir(downloader.output_file))
+        downloader.repair_pdfs = args.repair_pdfs
+        downloader.preflight_workers = default_preflight_workers()
+        downloader.render_workers = args.render_workers
+        downloader.bundle_output = args.bundle
+        downloader.jsonl_output = args.jsonl
+        downloader.jsonl_compression = None if args.jsonl_compression == 'none' else args.jsonl_compression
+        downloader.deadline_seconds = args.deadline
+        downloader.export_filter = export_filter
+        if args.browser_profile:
+            downloader.browser_profiles = browser_profiles
+        downloader.byte_budget = ByteBudget(
+            max_file=args.max_file_size * MB if args.max_file_size else None,
+            max_total=args.max_board_size * MB if args.max_board_size else None,
+            min_free=args.min_free_mb * MB
+        )
+        return downloader
+
+    job_store = None
+    if not args.no_job_store:
+        job_store = JobStore(args.job_db or get_app_dir() / 'jobs.sqlite3')
+
+    if args.resume:
+        if not job_store:
+            parser.error('--resume needs the job database (remove --no-job-store)')
+        jobs = [job for job in job_store.unfinished_jobs() if not args.url or job['url'] == args.url]
+        if not jobs:
+            print("Keine unterbrochenen Jobs gefunden.")
+        for job in jobs:
+            print(f"\n{'='*60}\nJob {job['id']}: {job['url']} (Phase: {job['phase']})\n{'='*60}")
+            downloader = TaskcardDownloader(
+                job['url'],
+                job['output_file'],
+                optimize_output=not args.no_optimize,
+                linearize=args.linearize
+            )
+            configure(downloader)
+            await downloader.download_and_save(**job['options'], job_store=job_store)
+            write_memory_report(downloader)
+            write_profile_summary(downloader)
+        return
+
+    if args.watch:
+        if args.watch <= 0:
+            parser.error('--watch needs a positive number of seconds')
+        # Keep one output name across polls, so unchanged boards are never rewritten
+        output_file = args.output or f"taskcard_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+        def make_downloader():
+            downloader = TaskcardDownloader(
+                args.url,
+                output_file,
+                optimize_output=not args.no_optimize,
+                linearize=args.linearize
+            )
+            downloader.debug_screenshot = False
+            return configure(downloader)
+
+        try:
+            await watch_board(
+                make_downloader,
+                args.watch,
+                include_pdf_attachments=not args.no_attachments,
+                output_format=args.format
+            )
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            print("\nÜberwachung beendet.")
+        return
+
+    downloader = TaskcardDownloader(
+        args.url,
+        args.output,
+        optimize_output=not args.no_optimize,
+        linearize=args.linearize
+    )
+    configure(downloader)
+
+    if args.plan:
+        downloader.plan_only = True
+        await downloader.download_and_save(include_pdf_attachments=not args.no_attachments)
+        output_path = Path(downloader.output_file)
+        plan_path = write_plan(downloader.plan or [], output_path.parent / f"{output_path.stem}_plan.json")
+        print(f"\n📝 Plan gespeichert: {plan_path}")
+        return
+
+    await downloader.download_and_save(
+        include_pdf_attachments=not args.no_attachments,
+        output_format=args.format,
+        job_store=job_store
+    )
+    write_memory_report(downloader)
+    write_profile_summary(downloader)
 
 
 if __name__ == '__main__':
+    # Preflight and render process pools re-import this module (spawn, frozen builds)
+    multiprocessing.freeze_support()
     asyncio.run(main())
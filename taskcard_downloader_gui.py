@@ -6,7 +6,7 @@ Taskcard Downloader GUI - Graphical interface for Taskcard downloader
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
-import asyncio
+import multiprocessing
 import sys
 import subprocess
 import os
@@ -14,7 +14,19 @@ from pathlib import Path
 from datetime import datetime
 
 # Import the main downloader class and browser check
-from taskcard_downloader import TaskcardDownloader, check_playwright_browsers, BROWSERS_PATH
+from taskcard_downloader import check_playwright_browsers, get_app_dir, BROWSERS_PATH
+from download_queue import DownloadQueue, RUNNING, WAITING, DONE, CANCELLED
+from log_buffer import LogBuffer
+
+# Log display: drain interval, lines per drain, lines kept in the widget
+LOG_DRAIN_INTERVAL_MS = 100
+LOG_BATCH_LINES = 500
+LOG_VISIBLE_LINES = 2000
+
+# Queue panel refresh interval and default number of parallel downloads
+QUEUE_REFRESH_MS = 250
+DEFAULT_CONCURRENCY = 2
+MAX_CONCURRENCY = 6
 
 
 class BrowserInstallerDialog:
@@ -211,7 +223,7 @@ class TaskcardDownloaderGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Taskcard Downloader")
-        self.root.geometry("700x600")
+        self.root.geometry("800x780")
         self.root.resizable(True, True)
 
         # Variables
@@ -219,9 +231,23 @@ class TaskcardDownloaderGUI:
         self.output_var = tk.StringVar()
         self.include_attachments_var = tk.BooleanVar(value=True)
         self.export_json_var = tk.BooleanVar(value=False)
-        self.is_downloading = False
+        self.concurrency_var = tk.IntVar(value=DEFAULT_CONCURRENCY)
+
+        # Log lines from any thread; drained into the widget by _drain_log.
+        # The full log of the session is spooled to a file.
+        self.log_buffer = LogBuffer(max_pending=LOG_VISIBLE_LINES)
+        self.log_buffer.open_spool(
+            get_app_dir() / 'logs' / f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        )
+        self.visible_log_lines = 0
+
+        # Downloads run on a background event loop sharing one browser
+        self.queue = DownloadQueue(self.log_buffer, concurrency=DEFAULT_CONCURRENCY)
 
         self.setup_ui()
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_log)
+        self.root.after(QUEUE_REFRESH_MS, self._refresh_queue)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def _bind_entry_shortcuts(self, entry):
         """Bind keyboard shortcuts for Entry widget to fix PyInstaller/macOS issues"""
@@ -295,6 +321,19 @@ class TaskcardDownloaderGUI:
         )
         json_export_check.grid(row=1, column=0, sticky=tk.W)
 
+        concurrency_frame = ttk.Frame(options_frame)
+        concurrency_frame.grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Label(concurrency_frame, text="Gleichzeitige Downloads:").pack(side=tk.LEFT)
+        concurrency_spin = ttk.Spinbox(
+            concurrency_frame,
+            from_=1,
+            to=MAX_CONCURRENCY,
+            width=4,
+            textvariable=self.concurrency_var,
+            command=self.update_concurrency
+        )
+        concurrency_spin.pack(side=tk.LEFT, padx=5)
+
         # Buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=4, column=0, columnspan=3, pady=10)
@@ -307,13 +346,12 @@ class TaskcardDownloaderGUI:
         )
         self.download_button.pack(side=tk.LEFT, padx=5)
 
-        self.cancel_button = ttk.Button(
+        multi_button = ttk.Button(
             button_frame,
-            text="Abbrechen",
-            command=self.cancel_download,
-            state=tk.DISABLED
+            text="Mehrere URLs...",
+            command=self.add_multiple_urls
         )
-        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        multi_button.pack(side=tk.LEFT, padx=5)
 
         clear_button = ttk.Button(
             button_frame,
@@ -322,28 +360,64 @@ class TaskcardDownloaderGUI:
         )
         clear_button.pack(side=tk.LEFT, padx=5)
 
-        # Progress bar
+        # Download queue
+        queue_frame = ttk.LabelFrame(main_frame, text="Warteschlange", padding="5")
+        queue_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        queue_frame.columnconfigure(0, weight=1)
+        queue_frame.rowconfigure(0, weight=1)
+        main_frame.rowconfigure(5, weight=1)
+
+        columns = ('nr', 'board', 'status', 'progress', 'time')
+        self.queue_tree = ttk.Treeview(queue_frame, columns=columns, show='headings', height=6)
+        for column, heading, width, anchor in (
+            ('nr', '#', 40, tk.CENTER),
+            ('board', 'Board', 300, tk.W),
+            ('status', 'Status', 150, tk.W),
+            ('progress', 'Fortschritt', 150, tk.W),
+            ('time', 'Dauer', 70, tk.E),
+        ):
+            self.queue_tree.heading(column, text=heading)
+            self.queue_tree.column(column, width=width, anchor=anchor, stretch=(column == 'board'))
+        self.queue_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.queue_tree.bind('<Double-1>', lambda e: self.open_selected())
+
+        queue_scroll = ttk.Scrollbar(queue_frame, orient=tk.VERTICAL, command=self.queue_tree.yview)
+        queue_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.queue_tree.configure(yscrollcommand=queue_scroll.set)
+
+        queue_buttons = ttk.Frame(queue_frame)
+        queue_buttons.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        for text, command in (
+            ("Abbrechen", self.cancel_selected),
+            ("Wiederholen", self.retry_selected),
+            ("Entfernen", self.remove_selected),
+            ("Datei öffnen", self.open_selected),
+        ):
+            ttk.Button(queue_buttons, text=text, command=command).pack(side=tk.LEFT, padx=(0, 5))
+
+        # Overall progress
         self.progress_var = tk.StringVar(value="Bereit")
         progress_label = ttk.Label(main_frame, textvariable=self.progress_var)
-        progress_label.grid(row=5, column=0, columnspan=3, sticky=tk.W, pady=5)
+        progress_label.grid(row=6, column=0, columnspan=3, sticky=tk.W, pady=5)
 
         self.progress_bar = ttk.Progressbar(
             main_frame,
-            mode='indeterminate',
+            mode='determinate',
+            maximum=100,
             length=400
         )
-        self.progress_bar.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+        self.progress_bar.grid(row=7, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
 
         # Log output
         log_frame = ttk.LabelFrame(main_frame, text="Status-Log", padding="5")
-        log_frame.grid(row=7, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        log_frame.grid(row=8, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
-        main_frame.rowconfigure(7, weight=1)
+        main_frame.rowconfigure(8, weight=1)
 
         self.log_text = scrolledtext.ScrolledText(
             log_frame,
-            height=15,
+            height=12,
             width=70,
             wrap=tk.WORD,
             state=tk.DISABLED,
@@ -352,9 +426,9 @@ class TaskcardDownloaderGUI:
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         # Info text at bottom
-        info_text = "Hinweis: Der Download kann 2-5 Minuten dauern, je nach Anzahl der PDF-Anhänge."
+        info_text = "Hinweis: Ein Download kann 2-5 Minuten dauern. Doppelklick auf einen fertigen Eintrag öffnet die Datei."
         info_label = ttk.Label(main_frame, text=info_text, foreground="gray", font=('Helvetica', 9))
-        info_label.grid(row=8, column=0, columnspan=3, pady=5)
+        info_label.grid(row=9, column=0, columnspan=3, pady=5)
 
         # Set default output filename in Documents/TaskCards
         default_name = f"taskcard_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -375,28 +449,80 @@ class TaskcardDownloaderGUI:
             self.output_var.set(filename)
 
     def clear_fields(self):
-        """Clear all input fields"""
-        if not self.is_downloading:
-            self.url_var.set("")
-            default_name = f"taskcard_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            default_dir = Path.home() / "Documents" / "TaskCards"
-            default_dir.mkdir(parents=True, exist_ok=True)
-            self.output_var.set(str(default_dir / default_name))
-            self.log_text.config(state=tk.NORMAL)
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.config(state=tk.DISABLED)
-            self.progress_var.set("Bereit")
+        """Clear all input fields (and the log, if no download is running)"""
+        self.url_var.set("")
+        default_name = f"taskcard_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        default_dir = Path.home() / "Documents" / "TaskCards"
+        default_dir.mkdir(parents=True, exist_ok=True)
+        self.output_var.set(str(default_dir / default_name))
+        if not any(job.active for job in self.queue.jobs):
+            self._clear_log()
 
     def log(self, message):
-        """Add message to log text widget"""
+        """Queue message for the log widget (safe to call from any thread)"""
+        self.log_buffer.add_line(message)
+
+    def _clear_log(self):
+        self.log_buffer.clear()
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
+        self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
-        self.root.update_idletasks()
+        self.visible_log_lines = 0
+
+    def _drain_log(self):
+        """Moves buffered lines into the widget in one batch, at a fixed rate
+
+        However fast the download logs, the Tk main loop only sees one insert
+        per tick, and the widget never holds more than LOG_VISIBLE_LINES lines
+        (the full log is in the spool file).
+        """
+        try:
+            lines, dropped = self.log_buffer.drain(LOG_BATCH_LINES)
+            if lines or dropped:
+                if dropped:
+                    lines.insert(0, f"… {dropped} Zeilen ausgelassen (vollständiges Log: {self.log_buffer.spool_path})")
+                at_bottom = self.log_text.yview()[1] >= 0.999
+                self.log_text.config(state=tk.NORMAL)
+                self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+                self.visible_log_lines += len(lines)
+                overflow = self.visible_log_lines - LOG_VISIBLE_LINES
+                if overflow > 0:
+                    self.log_text.delete('1.0', f'{overflow + 1}.0')
+                    self.visible_log_lines -= overflow
+                self.log_text.config(state=tk.DISABLED)
+                # Only follow the output if the user hasn't scrolled up
+                if at_bottom:
+                    self.log_text.see(tk.END)
+        finally:
+            self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_log)
+
+    def _unique_output(self, output_file):
+        """Returns output_file, or a numbered variant if it exists or another job already uses it"""
+        path = Path(output_file)
+        if path.suffix.lower() != '.pdf':
+            path = path.with_suffix('.pdf')
+        taken = {Path(job.output_file) for job in self.queue.jobs}
+        candidate = path
+        counter = 2
+        while candidate in taken or candidate.exists():
+            candidate = path.with_name(f"{path.stem}_{counter}{path.suffix}")
+            counter += 1
+        return str(candidate)
+
+    def _enqueue(self, url):
+        output_file = self._unique_output(self.output_var.get().strip())
+        job = self.queue.add(
+            url,
+            output_file,
+            include_attachments=self.include_attachments_var.get(),
+            export_json=self.export_json_var.get()
+        )
+        self.queue_tree.insert('', tk.END, iid=str(job.id), values=(job.id, url, WAITING, '', ''))
+        self.log(f"[#{job.id}] In Warteschlange: {url} -> {output_file}")
+        return job
 
     def start_download(self):
-        """Start the download process in a separate thread"""
+        """Add the entered URL to the download queue"""
         # Validate inputs
         if not self.url_var.get().strip():
             messagebox.showerror("Fehler", "Bitte geben Sie eine Taskcard-URL ein.")
@@ -406,180 +532,131 @@ class TaskcardDownloaderGUI:
             messagebox.showerror("Fehler", "Bitte geben Sie einen Ausgabe-Dateinamen an.")
             return
 
-        # Update UI state
-        self.is_downloading = True
-        self.download_button.config(state=tk.DISABLED)
-        self.cancel_button.config(state=tk.NORMAL)
-        self.progress_bar.start(10)
-        self.progress_var.set("Download läuft...")
-
-        # Clear log
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        self._enqueue(self.url_var.get().strip())
+        self.url_var.set("")
 
-        # Start download in separate thread
-        download_thread = threading.Thread(target=self.run_download, daemon=True)
-        download_thread.start()
+    def add_multiple_urls(self):
+        """Dialog to paste several board URLs (one per line) into the queue"""
+        if not self.output_var.get().strip():
+            messagebox.showerror("Fehler", "Bitte geben Sie einen Ausgabe-Dateinamen an.")
+            return
 
-    def run_download(self):
-        """Run the actual download process"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Mehrere URLs hinzufügen")
+        dialog.transient(self.root)
+        frame = ttk.Frame(dialog, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text="Eine Taskcard-URL pro Zeile:").pack(anchor=tk.W)
+        text = scrolledtext.ScrolledText(frame, height=12, width=80, font=('Courier', 9))
+        text.pack(fill=tk.BOTH, expand=True, pady=5)
+        text.focus_set()
+
+        def add():
+            urls = [line.strip() for line in text.get('1.0', tk.END).splitlines() if line.strip()]
+            for url in urls:
+                self._enqueue(url)
+            dialog.destroy()
+
+        buttons = ttk.Frame(frame)
+        buttons.pack(pady=(5, 0))
+        ttk.Button(buttons, text="Hinzufügen", command=add).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Abbrechen", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+
+    def update_concurrency(self):
         try:
-            url = self.url_var.get().strip()
-            output_file = self.output_var.get().strip()
-            include_attachments = self.include_attachments_var.get()
-            export_json = self.export_json_var.get()
-
-            self.log(f"Starte Download...")
-            self.log(f"URL: {url}")
-            self.log(f"Ausgabe: {output_file}")
-            self.log(f"PDF-Anhänge: {'Ja' if include_attachments else 'Nein'}")
-            self.log(f"JSON-Export: {'Ja' if export_json else 'Nein'}")
-            self.log("-" * 70)
-
-            # Create downloader with temporary name
-            downloader = TaskcardDownloader(url, output_file)
-
-            # Redirect output to log
-            import io
-            import contextlib
-            import re
-
-            log_capture = io.StringIO()
-
-            # Run async download
-            # Run async download
-            async def download_task():
-                # Perform the full download process in one go
-                # (Optimization: Single browser session for extraction and downloads)
-                downloaded_pdfs = await downloader.download_and_save(include_pdf_attachments=include_attachments)
-
-                # Attempt to rename file based on board title (if found)
-                final_output_file = Path(downloader.output_file)
-                
-                # Check if we should/can rename
-                if downloader.data.get('board_title'):
-                    board_title = downloader.data['board_title']
-                    safe_title = re.sub(r'[<>:"/\\|?*]', '', board_title)
-                    safe_title = safe_title[:100].strip()
-                    
-                    if safe_title:
-                        # Construct new filename
-                        new_filename = f"{safe_title}.pdf"
-                        new_output_path = final_output_file.parent / new_filename
-                        
-                        # Only rename if different and doesn't exist (to be safe)
-                        if new_output_path != final_output_file and not new_output_path.exists():
-                            try:
-                                # 1. Rename PDF
-                                final_output_file.rename(new_output_path)
-                                
-                                # 2. Rename attachments directory if it exists
-                                old_att_dir = final_output_file.parent / f"{final_output_file.stem}_attachments"
-                                new_att_dir = new_output_path.parent / f"{new_output_path.stem}_attachments"
-                                
-                                if old_att_dir.exists() and not new_att_dir.exists():
-                                    old_att_dir.rename(new_att_dir)
-                                    
-                                    # We would strictly need to update paths in downloaded_pdfs here 
-                                    # if we wanted 100% correct JSON paths, but for now we skip that 
-                                    # complexity to avoid breaking things.
-                                
-                                # Update references
-                                final_output_file = new_output_path
-                                downloader.output_file = str(final_output_file)
-                                
-                                self.root.after(0, self.output_var.set, str(final_output_file))
-                                self.root.after(0, self.log, f"Dateiname angepasst: {new_filename}")
-                                
-                            except Exception as rename_error:
-                                self.root.after(0, self.log, f"⚠️  Konnte Datei nicht umbenennen: {rename_error}")
-
-                # Export JSON if requested
-                if export_json:
-                    json_file = final_output_file.with_suffix('.json')
-                    downloader.export_json(str(json_file), downloaded_pdfs=downloaded_pdfs)
-                    self.root.after(0, self.log, f"✅ JSON erfolgreich exportiert: {json_file}")
-
-            # Capture output
-            with contextlib.redirect_stdout(log_capture), contextlib.redirect_stderr(log_capture):
-                asyncio.run(download_task())
-
-            # Get captured output and display it
-            output = log_capture.getvalue()
-            for line in output.split('\n'):
-                if line.strip():
-                    self.log(line)
-
-            # Use the actual output file (may have been renamed)
-            final_output = downloader.output_file
-            self.root.after(0, self.download_complete_success, final_output)
+            concurrency = max(1, min(int(self.concurrency_var.get()), MAX_CONCURRENCY))
+        except (tk.TclError, ValueError):
+            return
+        self.queue.set_concurrency(concurrency)
+
+    def _selected_jobs(self):
+        selected = set(self.queue_tree.selection())
+        return [job for job in self.queue.jobs if str(job.id) in selected]
+
+    def cancel_selected(self):
+        for job in self._selected_jobs():
+            self.queue.cancel(job)
+
+    def retry_selected(self):
+        for job in self._selected_jobs():
+            if not job.active:
+                self.log(f"[#{job.id}] Neuer Versuch")
+                self.queue.retry(job)
+
+    def remove_selected(self):
+        for job in self._selected_jobs():
+            if not job.active:
+                self.queue.remove(job)
+                self.queue_tree.delete(str(job.id))
+
+    def open_selected(self):
+        """Open the result file of the (first) selected finished job"""
+        for job in self._selected_jobs():
+            if job.status == DONE:
+                self._open_file(job.output_file)
+                return
+
+    def _open_file(self, output_file):
+        import platform
 
+        try:
+            if platform.system() == 'Darwin':  # macOS
+                subprocess.run(['open', output_file])
+            elif platform.system() == 'Windows':
+                subprocess.run(['start', '', output_file], shell=True)
+            else:  # Linux
+                subprocess.run(['xdg-open', output_file])
         except Exception as e:
-            error_msg = str(e)
-            self.root.after(0, self.download_complete_error, error_msg)
-
-    def download_complete_success(self, output_file):
-        """Handle successful download completion"""
-        self.progress_bar.stop()
-        self.progress_var.set("Download abgeschlossen!")
-        self.is_downloading = False
-        self.download_button.config(state=tk.NORMAL)
-        self.cancel_button.config(state=tk.DISABLED)
-
-        self.log("-" * 70)
-        self.log("✅ DOWNLOAD ERFOLGREICH ABGESCHLOSSEN!")
-        self.log(f"Datei gespeichert: {output_file}")
-
-        # Show success message with option to open file
-        result = messagebox.askyesno(
-            "Download abgeschlossen",
-            f"Die Taskcard wurde erfolgreich heruntergeladen!\n\n"
-            f"Datei: {Path(output_file).name}\n\n"
-            f"Möchten Sie die Datei öffnen?"
-        )
+            messagebox.showerror("Fehler", f"Konnte Datei nicht öffnen: {e}")
 
-        if result:
-            import subprocess
-            import platform
-
-            try:
-                if platform.system() == 'Darwin':  # macOS
-                    subprocess.run(['open', output_file])
-                elif platform.system() == 'Windows':
-                    subprocess.run(['start', output_file], shell=True)
-                else:  # Linux
-                    subprocess.run(['xdg-open', output_file])
-            except Exception as e:
-                messagebox.showerror("Fehler", f"Konnte Datei nicht öffnen: {e}")
-
-    def download_complete_error(self, error_msg):
-        """Handle download error"""
-        self.progress_bar.stop()
-        self.progress_var.set("Fehler beim Download")
-        self.is_downloading = False
-        self.download_button.config(state=tk.NORMAL)
-        self.cancel_button.config(state=tk.DISABLED)
+    @staticmethod
+    def _progress_text(job):
+        filled = int(job.progress * 10)
+        bar = '█' * filled + '░' * (10 - filled)
+        return f"{bar} {job.progress * 100:3.0f}%"
 
-        self.log("-" * 70)
-        self.log(f"❌ FEHLER: {error_msg}")
-
-        messagebox.showerror(
-            "Download fehlgeschlagen",
-            f"Beim Download ist ein Fehler aufgetreten:\n\n{error_msg}\n\n"
-            f"Bitte prüfen Sie die URL und Ihre Internetverbindung."
-        )
+    def _refresh_queue(self):
+        """Copies the job states into the queue panel and the overall progress bar"""
+        try:
+            for job in self.queue.jobs:
+                if not self.queue_tree.exists(str(job.id)):
+                    continue
+                status = job.status
+                if job.status == RUNNING and job.phase:
+                    status = f"{RUNNING}: {job.phase}"
+                elif job.error:
+                    status = f"{job.status}: {job.error[:40]}"
+                elapsed = job.elapsed
+                self.queue_tree.item(str(job.id), values=(
+                    job.id,
+                    job.title or job.url,
+                    status,
+                    self._progress_text(job) if job.status != WAITING else '',
+                    f"{int(elapsed // 60)}:{int(elapsed % 60):02d}" if elapsed is not None else '',
+                ))
+
+            counted = [job for job in self.queue.jobs if job.status != CANCELLED]
+            running = sum(1 for job in counted if job.status == RUNNING)
+            waiting = sum(1 for job in counted if job.status == WAITING)
+            done = sum(1 for job in counted if job.status == DONE)
+            failed = len(counted) - running - waiting - done
+            if counted:
+                self.progress_bar['value'] = 100 * sum(job.progress for job in counted) / len(counted)
+                self.progress_var.set(f"{running} laufend, {waiting} wartend, {done} fertig, {failed} fehlgeschlagen")
+            else:
+                self.progress_bar['value'] = 0
+                self.progress_var.set("Bereit")
+        finally:
+            self.root.after(QUEUE_REFRESH_MS, self._refresh_queue)
 
-    def cancel_download(self):
-        """Cancel the download (placeholder - actual cancellation is complex)"""
-        if messagebox.askyesno("Abbrechen", "Möchten Sie den Download wirklich abbrechen?"):
-            self.log("\n⚠️  Abbruch durch Benutzer...")
-            # Note: Proper cancellation would require more complex implementation
-            self.progress_bar.stop()
-            self.progress_var.set("Abgebrochen")
-            self.is_downloading = False
-            self.download_button.config(state=tk.NORMAL)
-            self.cancel_button.config(state=tk.DISABLED)
+    def on_close(self):
+        """Cancel running downloads, close the shared browser and quit"""
+        if any(job.active for job in self.queue.jobs):
+            if not messagebox.askyesno("Beenden", "Es laufen noch Downloads. Wirklich beenden?"):
+                return
+        self.queue.shutdown()
+        self.log_buffer.close_spool()
+        self.root.destroy()
 
 
 def main():
@@ -615,4 +692,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # Needed for the preflight process pool in PyInstaller builds
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Taskcard Render - Rebuilds the PDF from a saved JSON export without a browser
+Nützlich für Layout-Änderungen oder verlorene PDFs: kein Playwright, kein erneutes Scrapen
+"""
+
+import argparse
+import multiprocessing
+import sys
+from pathlib import Path
+
+from memory_profile import MemoryProfiler
+from phase_profiler import PhaseProfiler
+from preflight import default_workers as default_preflight_workers
+from taskcard_downloader import TaskcardDownloader, profile_dir, write_memory_report, write_profile_summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rebuild a Taskcard PDF from an export_json file and its attachments directory'
+    )
+    parser.add_argument(
+        'json_file',
+        help='JSON file written by the JSON export'
+    )
+    parser.add_argument(
+        '-a', '--attachments',
+        help='Attachments directory (default: <json name>_attachments next to the JSON file)',
+        default=None
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='Output PDF filename (default: JSON filename with .pdf)',
+        default=None
+    )
+    parser.add_argument(
+        '--no-optimize',
+        help='Skip the PDF size optimization (image/font deduplication, object streams)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--linearize',
+        help='Linearize the PDF for fast web view (requires pikepdf or qpdf)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--repair-pdfs',
+        help='Try to repair damaged PDF attachments before merging (best with pikepdf or qpdf installed)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--render-workers',
+        metavar='N',
+        type=int,
+        help='Render the column chapters as separate PDFs in N processes and assemble them (large boards)',
+        default=None
+    )
+    parser.add_argument(
+        '--memory-profile',
+        help='Measure peak memory of rendering, merging and optimizing and write <output>_memory.txt',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--profile',
+        help='Run rendering, merging and optimizing under cProfile and write the results to <output>_profile/',
+        action='store_true'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.json_file).exists():
+        print(f"❌ Datei nicht gefunden: {args.json_file}")
+        sys.exit(1)
+
+    downloader, downloaded_files = TaskcardDownloader.from_export(
+        args.json_file,
+        attachments_dir=args.attachments,
+        output_file=args.output,
+        optimize_output=not args.no_optimize,
+        linearize=args.linearize
+    )
+
+    print(f"Rendere '{downloader.data.get('board_title', '')}' aus {args.json_file}")
+    print(f"  {len(downloaded_files)} lokale Dateien gefunden")
+    downloader.repair_pdfs = args.repair_pdfs
+    downloader.preflight_workers = default_preflight_workers()
+    downloader.render_workers = args.render_workers
+    if args.memory_profile:
+        downloader.memory_profiler = MemoryProfiler()
+        downloader.memory_profiler.start()
+    if args.profile:
+        downloader.phase_profiler = PhaseProfiler(profile_dir(downloader.output_file))
+    downloader.generate_pdf(downloaded_files)
+    if downloader.memory_profiler:
+        downloader.memory_profiler.stop()
+        write_memory_report(downloader)
+    write_profile_summary(downloader)
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Taskcard Service - Long-running HTTP export service with a warm browser
+Nimmt Board-URLs per HTTP entgegen, arbeitet sie mit begrenzter Parallelität ab und liefert PDF oder JSON
+"""
+
+import argparse
+import asyncio
+import shutil
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from aiohttp import web
+
+from stdout_router import route_stdout
+from taskcard_downloader import TaskcardDownloader, get_app_dir
+
+RESULT_TYPES = {
+    'pdf': ('board.pdf', 'application/pdf'),
+    'json': ('board.json', 'application/json'),
+}
+
+
+class WarmContextPool:
+    """Hands out pre-created browser contexts, so a job doesn't wait for context start-up
+
+    Contexts are never reused between jobs (cookies, storage and downloads
+    stay isolated); the pool creates a replacement in the background as
+    soon as one is taken. Everything else (start_tracing, ...) is passed
+    through to the browser, so the pool can be used wherever the
+    downloader expects a browser.
+    """
+
+    def __init__(self, browser, size, **context_options):
+        self.browser = browser
+        self.size = size
+        self.context_options = context_options
+        self._ready = []
+        self._refills = set()
+        self.created = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def _create(self):
+        context = await self.browser.new_context(**self.context_options)
+        self.created += 1
+        return context
+
+    async def fill(self):
+        while len(self._ready) + len(self._refills) < self.size:
+            self._ready.append(await self._create())
+
+    def _schedule_refill(self):
+        async def refill():
+            try:
+                self._ready.append(await self._create())
+            except Exception as e:
+                print(f"⚠️  Browser-Kontext konnte nicht vorbereitet werden: {e}")
+        task = asyncio.create_task(refill())
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    async def new_context(self, **kwargs):
+        if kwargs == self.context_options and self._ready:
+            context = self._ready.pop()
+            self.hits += 1
+        else:
+            context = await self.browser.new_context(**kwargs)
+            self.misses += 1
+        if len(self._ready) + len(self._refills) < self.size:
+            self._schedule_refill()
+        return context
+
+    @property
+    def warm(self):
+        return len(self._ready)
+
+    async def close(self):
+        for task in list(self._refills):
+            task.cancel()
+        while self._ready:
+            await self._ready.pop().close()
+
+    def __getattr__(self, name):
+        return getattr(self.browser, name)
+
+
+class ExportJob:
+    def __init__(self, url, fmt, include_attachments, results_root):
+        self.id = uuid.uuid4().hex[:12]
+        self.url = url
+        self.format = fmt
+        self.include_attachments = include_attachments
+        self.result_dir = Path(results_root) / self.id
+        self.status = 'queued'
+        self.error = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.finished = asyncio.Event()
+
+    @property
+    def result_path(self):
+        return self.result_dir / RESULT_TYPES[self.format][0]
+
+    @property
+    def log_path(self):
+        return self.result_dir / 'job.log'
+
+    def to_dict(self, queue_position=None):
+        def iso(timestamp):
+            return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds') if timestamp else None
+
+        info = {
+            'id': self.id,
+            'url': self.url,
+            'format': self.format,
+            'status': self.status,
+            'error': self.error,
+            'queued_at': iso(self.queued_at),
+            'started_at': iso(self.started_at),
+            'finished_at': iso(self.finished_at),
+            'result_url': f"/jobs/{self.id}/result",
+        }
+        if self.started_at:
+            info['duration'] = round((self.finished_at or time.time()) - self.started_at, 2)
+        if queue_position is not None:
+            info['queue_position'] = queue_position
+        return info
+
+
+class ExportService:
+    """Job queue, worker tasks and the shared browser behind the HTTP API"""
+
+    def __init__(self, data_dir, concurrency=2, max_queue=100, pool_size=None,
+                 keep_minutes=60):
+        self.data_dir = Path(data_dir)
+        self.concurrency = concurrency
+        self.pool_size = pool_size if pool_size is not None else concurrency
+        self.keep_seconds = keep_minutes * 60
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.jobs = {}
+        self.running = 0
+        self.started = time.time()
+        self.counters = {'submitted': 0, 'done': 0, 'failed': 0, 'rejected': 0, 'cancelled': 0}
+        self.duration_sum = 0.0
+        self.wait_sum = 0.0
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        self.pool = None
+        self._tasks = []
+
+    # --- lifecycle -------------------------------------------------------
+
+    async def start(self, app=None):
+        from playwright.async_api import async_playwright
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._playwright = await async_playwright().start()
+        await self._ensure_browser()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._cleanup_loop()))
+        print(f"🚀 Service bereit: {self.concurrency} parallele Jobs, {self.pool_size} vorgewärmte Kontexte")
+
+    async def stop(self, app=None):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.pool:
+            await self.pool.close()
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    async def _ensure_browser(self):
+        """Returns the warm pool, relaunching Chromium if it has crashed"""
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._browser is not None:
+                    print("⚠️  Browser nicht mehr verbunden - starte neu")
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self.pool = WarmContextPool(self._browser, self.pool_size, accept_downloads=True)
+                await self.pool.fill()
+            return self.pool
+
+    # --- jobs ------------------------------------------------------------
+
+    def submit(self, url, fmt, include_attachments):
+        job = ExportJob(url, fmt, include_attachments, self.data_dir / 'results')
+        self.queue.put_nowait(job)
+        self.jobs[job.id] = job
+        self.counters['submitted'] += 1
+        return job
+
+    def queue_position(self, job):
+        if job.status != 'queued':
+            return None
+        queued = sorted((j for j in self.jobs.values() if j.status == 'queued'), key=lambda j: j.queued_at)
+        return queued.index(job) + 1
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                # Deleted while it was waiting (see handle_delete)
+                if job.status != 'cancelled':
+                    await self._run_job(job)
+            finally:
+                self.queue.task_done()
+
+    async def _run_job(self, job):
+        job.status = 'running'
+        job.started_at = time.time()
+        self.wait_sum += job.started_at - job.queued_at
+        self.running += 1
+        job.result_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            pool = await self._ensure_browser()
+            downloader = TaskcardDownloader(job.url, str(job.result_path))
+            downloader.render_in_thread = True
+            with open(job.log_path, 'w', encoding='utf-8') as log, route_stdout(log):
+                await downloader.download_and_save(
+                    include_pdf_attachments=job.include_attachments,
+                    output_format=job.format,
+                    browser=pool
+                )
+            job.status = 'done'
+            self.counters['done'] += 1
+        except asyncio.CancelledError:
+            job.status = 'failed'
+            job.error = 'Service beendet'
+            raise
+        except Exception as e:
+            job.status = 'failed'
+            job.error = f"{type(e).__name__}: {e}"
+            self.counters['failed'] += 1
+            print(f"❌ Job {job.id} fehlgeschlagen: {job.error}")
+        finally:
+            self.running -= 1
+            job.finished_at = time.time()
+            self.duration_sum += job.finished_at - job.started_at
+            job.finished.set()
+
+    def remove_job(self, job):
+        self.jobs.pop(job.id, None)
+        shutil.rmtree(job.result_dir, ignore_errors=True)
+
+    async def _cleanup_loop(self):
+        """Drops finished jobs and their files after keep_minutes"""
+        while True:
+            await asyncio.sleep(60)
+            cutoff = time.time() - self.keep_seconds
+            for job in list(self.jobs.values()):
+                if job.finished_at and job.finished_at < cutoff:
+                    self.remove_job(job)
+
+    # --- HTTP handlers ---------------------------------------------------
+
+    async def handle_submit(self, request):
+        try:
+            payload = await request.json()
+        except Exception:
+            raise web.HTTPBadRequest(text='Request body must be JSON: {"url": "...", "format": "pdf"}')
+
+        url = str(payload.get('url') or '')
+        fmt = payload.get('format', 'pdf')
+        if not url.startswith(('http://', 'https://')):
+            raise web.HTTPBadRequest(text='"url" must be an http(s) URL')
+        if fmt not in RESULT_TYPES:
+            raise web.HTTPBadRequest(text=f'"format" must be one of: {", ".join(RESULT_TYPES)}')
+
+        try:
+            job = self.submit(url, fmt, bool(payload.get('attachments', True)))
+        except asyncio.QueueFull:
+            self.counters['rejected'] += 1
+            raise web.HTTPTooManyRequests(text='Job queue is full, retry later', headers={'Retry-After': '30'})
+
+        return web.json_response(job.to_dict(self.queue_position(job)), status=202,
+                                 headers={'Location': f"/jobs/{job.id}"})
+
+    def _get_job(self, request):
+        job = self.jobs.get(request.match_info['job_id'])
+        if job is None:
+            raise web.HTTPNotFound(text='Unknown job')
+        return job
+
+    async def handle_status(self, request):
+        job = self._get_job(request)
+        return web.json_response(job.to_dict(self.queue_position(job)))
+
+    async def handle_result(self, request):
+        """Streams the finished file; ?wait=SECONDS long-polls until the job is done"""
+        job = self._get_job(request)
+        try:
+            wait = float(request.query.get('wait', 0) or 0)
+        except ValueError:
+            wait = -1
+        if not wait >= 0:  # also catches nan
+            raise web.HTTPBadRequest(text='"wait" must be a non-negative number of seconds')
+        wait = min(wait, 600)
+        if wait and not job.finished.is_set():
+            try:
+                await asyncio.wait_for(job.finished.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+        if job.status == 'failed':
+            return web.json_response(job.to_dict(), status=500)
+        if job.status == 'cancelled':
+            return web.json_response(job.to_dict(), status=410)
+        if job.status != 'done':
+            return web.json_response(job.to_dict(self.queue_position(job)), status=409)
+
+        filename, content_type = RESULT_TYPES[job.format]
+        return web.FileResponse(job.result_path, headers={
+            'Content-Type': content_type,
+            'Content-Disposition': f'attachment; filename="{filename}"',
+        })
+
+    async def handle_log(self, request):
+        job = self._get_job(request)
+        if not job.log_path.exists():
+            return web.Response(text='')
+        return web.FileResponse(job.log_path, headers={'Content-Type': 'text/plain; charset=utf-8'})
+
+    async def handle_delete(self, request):
+        """Deletes a finished job with its files, or cancels a queued one"""
+        job = self._get_job(request)
+        if job.status == 'running':
+            raise web.HTTPConflict(text='Job is still running')
+        if job.status == 'queued':
+            # It stays in the queue; the worker that picks it up skips it
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+            job.finished.set()
+            self.counters['cancelled'] += 1
+        self.remove_job(job)
+        return web.Response(status=204)
+
+    async def handle_metrics(self, request):
+        """Prometheus text format"""
+        finished = self.counters['done'] + self.counters['failed']
+        started = finished + self.running
+        lines = [
+            '# TYPE taskcard_jobs_total counter',
+            *(f'taskcard_jobs_total{{status="{name}"}} {value}' for name, value in self.counters.items()),
+            '# TYPE taskcard_jobs_running gauge',
+            f'taskcard_jobs_running {self.running}',
+            '# TYPE taskcard_queue_depth gauge',
+            f'taskcard_queue_depth {self.queue.qsize()}',
+            '# TYPE taskcard_job_duration_seconds summary',
+            f'taskcard_job_duration_seconds_sum {self.duration_sum:.3f}',
+            f'taskcard_job_duration_seconds_count {finished}',
+            '# TYPE taskcard_job_wait_seconds summary',
+            f'taskcard_job_wait_seconds_sum {self.wait_sum:.3f}',
+            f'taskcard_job_wait_seconds_count {started}',
+            '# TYPE taskcard_context_pool_warm gauge',
+            f'taskcard_context_pool_warm {self.pool.warm if self.pool else 0}',
+            '# TYPE taskcard_context_pool_hits_total counter',
+            f'taskcard_context_pool_hits_total {self.pool.hits if self.pool else 0}',
+            '# TYPE taskcard_context_pool_misses_total counter',
+            f'taskcard_context_pool_misses_total {self.pool.misses if self.pool else 0}',
+            '# TYPE taskcard_uptime_seconds gauge',
+            f'taskcard_uptime_seconds {time.time() - self.started:.0f}',
+        ]
+        return web.Response(text='\n'.join(lines) + '\n', content_type='text/plain')
+
+    def create_app(self):
+        app = web.Application()
+        app.router.add_post('/jobs', self.handle_submit)
+        app.router.add_get('/jobs/{job_id}', self.handle_status)
+        app.router.add_delete('/jobs/{job_id}', self.handle_delete)
+        app.router.add_get('/jobs/{job_id}/result', self.handle_result)
+        app.router.add_get('/jobs/{job_id}/log', self.handle_log)
+        app.router.add_get('/metrics', self.handle_metrics)
+        app.on_startup.append(self.start)
+        app.on_cleanup.append(self.stop)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run the Taskcard downloader as an HTTP export service'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument(
+        '-c', '--concurrency',
+        help='Number of boards exported at the same time (default: 2)',
+        type=int,
+        default=2
+    )
+    parser.add_argument(
+        '--pool-size',
+        help='Number of pre-created browser contexts (default: same as --concurrency)',
+        type=int,
+        default=None
+    )
+    parser.add_argument(
+        '--max-queue',
+        help='Maximum number of waiting jobs before new ones are rejected with 429 (default: 100)',
+        type=int,
+        default=100
+    )
+    parser.add_argument(
+        '--data-dir',
+        help='Directory for results and job logs (default: service/ in the app folder)',
+        default=None
+    )
+    parser.add_argument(
+        '--keep-minutes',
+        help='Delete finished jobs and their files after this many minutes (default: 60)',
+        type=int,
+        default=60
+    )
+
+    args = parser.parse_args()
+
+    service = ExportService(
+        args.data_dir or get_app_dir() / 'service',
+        concurrency=max(1, args.concurrency),
+        max_queue=max(1, args.max_queue),
+        pool_size=args.pool_size,
+        keep_minutes=args.keep_minutes
+    )
+    web.run_app(service.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
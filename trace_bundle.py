@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Trace Bundle - Records why a board loads slowly and packs everything into one zip
+Enthält Playwright-Trace, Chromium-Performance-Trace und die Zeitmessungen der Extraktion
+"""
+
+import json
+import os
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PLAYWRIGHT_TRACE_NAME = 'playwright-trace.zip'
+CHROMIUM_TRACE_NAME = 'chromium-trace.json'
+TIMINGS_NAME = 'timings.json'
+
+README_TEXT = """Taskcard Downloader - Trace-Bundle
+
+{playwright}: Playwright-Trace (Netzwerk, DOM-Snapshots, Screenshots)
+    ansehen mit: playwright show-trace {playwright}  oder auf https://trace.playwright.dev
+{chromium}: Chromium-Performance-Trace
+    in Chrome DevTools > Performance > "Profil laden" öffnen
+{timings}: Dauer jedes Schritts (Python) und der Extraktion im Browser
+    (Spaltensuche, Karten pro Spalte, Hintergrundbild-Auswertung) in Millisekunden
+"""
+
+
+class TraceRecorder:
+    """Collects traces and step timings of the browser phase of one run
+
+    The Playwright trace and the Chromium performance trace are written to
+    a temporary directory and zipped together with the timings on finish.
+    Chromium only allows one performance trace per browser at a time; if it
+    is already tracing (shared browser), the bundle simply goes without it.
+    """
+
+    def __init__(self, trace_dir, name):
+        self.trace_dir = Path(trace_dir)
+        self.name = name
+        self.steps = []
+        self.page_timings = None
+        self._work_dir = Path(tempfile.mkdtemp(prefix='taskcard_trace_'))
+        self._browser_tracing = False
+        self._context_tracing = False
+
+    async def start(self, browser, context, page):
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True)
+            self._context_tracing = True
+        except Exception as e:
+            print(f"  ⚠️  Playwright-Trace nicht verfügbar: {e}")
+        try:
+            await browser.start_tracing(page=page, path=str(self._work_dir / CHROMIUM_TRACE_NAME), screenshots=True)
+            self._browser_tracing = True
+        except Exception as e:
+            print(f"  ⚠️  Chromium-Trace nicht verfügbar: {e}")
+
+    async def stop(self, browser, context):
+        """Stops both traces; must run before the context is closed"""
+        if self._context_tracing:
+            try:
+                await context.tracing.stop(path=str(self._work_dir / PLAYWRIGHT_TRACE_NAME))
+            except Exception as e:
+                print(f"  ⚠️  Playwright-Trace konnte nicht gespeichert werden: {e}")
+            self._context_tracing = False
+        if self._browser_tracing:
+            try:
+                await browser.stop_tracing()
+            except Exception as e:
+                print(f"  ⚠️  Chromium-Trace konnte nicht gespeichert werden: {e}")
+            self._browser_tracing = False
+
+    @contextmanager
+    def step(self, name):
+        """Times one Python-side step of the page load (goto, scroll, extraction, ...)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append({'step': name, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+
+    def print_summary(self):
+        for entry in self.steps:
+            print(f"  ⏱  {entry['step']:<24}{entry['ms'] / 1000:>7.2f}s")
+        if self.page_timings:
+            columns = sorted(self.page_timings.get('columns', []), key=lambda c: c['ms'], reverse=True)
+            print(f"  ⏱  Spaltensuche im Browser: {self.page_timings.get('columns_discovery_ms', 0):.1f} ms, "
+                  f"Hintergrundbilder: {self.page_timings.get('background_images_ms', 0):.1f} ms, "
+                  f"Scrollen: {self.page_timings.get('scroll_ms', 0):.0f} ms "
+                  f"({self.page_timings.get('scroll_steps', 0)} Schritte)")
+            for column in columns[:3]:
+                print(f"      langsamste Spalte: {column['title'] or column['id']} "
+                      f"({column['card_elements']} Karten, {column['ms']:.1f} ms)")
+
+    def finish(self):
+        """Writes the trace bundle zip and returns its path"""
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        bundle_path = self.trace_dir / f"{self.name}_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+
+        timings = {'steps': self.steps, 'page': self.page_timings}
+        with zipfile.ZipFile(bundle_path, 'w', zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr(TIMINGS_NAME, json.dumps(timings, ensure_ascii=False, indent=2))
+            bundle.writestr('README.txt', README_TEXT.format(
+                playwright=PLAYWRIGHT_TRACE_NAME, chromium=CHROMIUM_TRACE_NAME, timings=TIMINGS_NAME))
+            for filename in (PLAYWRIGHT_TRACE_NAME, CHROMIUM_TRACE_NAME):
+                path = self._work_dir / filename
+                if path.exists():
+                    # The Playwright trace is a zip itself, compressing it again gains nothing
+                    compression = zipfile.ZIP_STORED if filename.endswith('.zip') else zipfile.ZIP_DEFLATED
+                    bundle.write(path, filename, compress_type=compression)
+
+        for path in self._work_dir.iterdir():
+            path.unlink()
+        os.rmdir(self._work_dir)
+
+        self.print_summary()
+        print(f"🔍 Trace-Bundle gespeichert: {bundle_path}")
+        return bundle_path
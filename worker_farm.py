@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Worker Farm - Exports many Taskcard boards in parallel across all CPU cores
+Jeder Worker-Prozess hat seinen eigenen Chromium und wird nach K Jobs bzw. bei zu hohem RSS recycelt
+"""
+
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from pathlib import Path
+
+from board_pipeline import print_latency
+from process_memory import MB, available_memory, process_rss
+
+
+def read_job_list(path):
+    """Reads 'URL [output name]' lines, skipping blanks and # comments"""
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split(None, 1)
+            jobs.append({'url': parts[0], 'name': parts[1].strip() if len(parts) > 1 else None})
+    return jobs
+
+
+async def _worker_main(worker_id, task_queue, result_queue, options):
+    """Processes jobs with one warm Chromium until it is time to retire"""
+    from playwright.async_api import async_playwright
+    from taskcard_downloader import TaskcardDownloader
+    from job_store import JobStore
+
+    job_store = JobStore(options['job_db']) if options.get('job_db') else None
+    loop = asyncio.get_running_loop()
+    jobs_done = 0
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            while True:
+                job = await loop.run_in_executor(None, task_queue.get)
+                if job is None:
+                    break
+
+                started = time.monotonic()
+                error = None
+                downloader = None
+                log_path = Path(job['output_file']).with_suffix('.log')
+                try:
+                    # Keep the console readable: each job logs into its own file
+                    with open(log_path, 'w', encoding='utf-8') as log, \
+                            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                        downloader = TaskcardDownloader(job['url'], job['output_file'])
+                        downloader.deadline_seconds = options.get('deadline')
+                        await downloader.download_and_save(
+                            include_pdf_attachments=options['include_attachments'],
+                            output_format=options['output_format'],
+                            job_store=job_store,
+                            browser=browser
+                        )
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+
+                jobs_done += 1
+                rss = process_rss()
+                retire = jobs_done >= options['jobs_per_worker'] or (
+                    options['max_rss'] and rss is not None and rss > options['max_rss']
+                )
+                result_queue.put({
+                    'worker_id': worker_id,
+                    'index': job['index'],
+                    'url': job['url'],
+                    'output_file': job['output_file'],
+                    'error': error,
+                    'duration': time.monotonic() - started,
+                    'latency': downloader.latency if downloader else None,
+                    'rss': rss,
+                    'retire': retire,
+                })
+                if retire:
+                    break
+        finally:
+            await browser.close()
+            if job_store:
+                job_store.close()
+
+
+def _worker_entry(worker_id, task_queue, result_queue, options):
+    asyncio.run(_worker_main(worker_id, task_queue, result_queue, options))
+
+
+class WorkerFarm:
+    """Spreads board jobs over N worker processes
+
+    - Admission: a job is only handed to an idle worker if the system still
+      has at least max_rss of memory available (if it can be measured), so
+      parallel exports don't push the host into swapping or OOM kills.
+    - Recycling: a worker exits after jobs_per_worker jobs, or as soon as its
+      RSS (Python plus its Chromium processes) exceeds max_rss, and is
+      replaced by a fresh one.
+    """
+
+    def __init__(self, workers, options):
+        self.worker_count = workers
+        self.options = options
+        self.context = multiprocessing.get_context('spawn')
+        self.result_queue = self.context.Queue()
+        self.workers = {}
+        self.next_worker_id = 0
+        self.recycled = 0
+        self.peak_rss = 0
+
+    def _spawn_worker(self):
+        worker_id = self.next_worker_id
+        self.next_worker_id += 1
+        task_queue = self.context.Queue()
+        process = self.context.Process(
+            target=_worker_entry,
+            args=(worker_id, task_queue, self.result_queue, self.options),
+            daemon=True
+        )
+        process.start()
+        self.workers[worker_id] = {'process': process, 'tasks': task_queue, 'job': None}
+
+    def _retire_worker(self, worker_id):
+        worker = self.workers.pop(worker_id)
+        worker['tasks'].put(None)
+        worker['process'].join(timeout=30)
+        if worker['process'].is_alive():
+            worker['process'].terminate()
+
+    def _admit(self, running):
+        """Memory-aware admission: start a job only if there is room for one more worker peak"""
+        limit = self.options.get('max_rss')
+        if not limit or running == 0:
+            return True
+        available = available_memory()
+        return available is None or available >= limit
+
+    def run(self, jobs):
+        pending = list(jobs)
+        results = []
+        started = time.monotonic()
+
+        for _ in range(min(self.worker_count, len(pending))):
+            self._spawn_worker()
+
+        try:
+            while pending or any(w['job'] for w in self.workers.values()):
+                running = sum(1 for w in self.workers.values() if w['job'])
+                for worker in self.workers.values():
+                    if pending and not worker['job'] and self._admit(running):
+                        worker['job'] = pending.pop(0)
+                        worker['tasks'].put(worker['job'])
+                        running += 1
+
+                try:
+                    result = self.result_queue.get(timeout=1)
+                except queue.Empty:
+                    self._reap_crashed_workers(results, pending, len(jobs))
+                    continue
+
+                results.append(result)
+                self.peak_rss = max(self.peak_rss, result['rss'] or 0)
+                self._print_result(result, len(results), len(jobs))
+
+                worker_id = result['worker_id']
+                self.workers[worker_id]['job'] = None
+                if result['retire']:
+                    self._retire_worker(worker_id)
+                    self.recycled += 1
+                    if pending:
+                        self._spawn_worker()
+        finally:
+            for worker_id in list(self.workers):
+                self._retire_worker(worker_id)
+
+        self._print_summary(results, time.monotonic() - started)
+        return results
+
+    def _reap_crashed_workers(self, results, pending, total):
+        """Replaces workers that died mid-job (e.g. killed by the OOM killer)"""
+        for worker_id, worker in list(self.workers.items()):
+            if worker['process'].is_alive():
+                continue
+            if worker['job']:
+                job = worker['job']
+                result = {
+                    'worker_id': worker_id, 'index': job['index'], 'url': job['url'],
+                    'output_file': job['output_file'], 'duration': 0, 'rss': None, 'retire': True,
+                    'error': f"Worker-Prozess abgestürzt (Exit-Code {worker['process'].exitcode})",
+                }
+                results.append(result)
+                self._print_result(result, len(results), total)
+            self.workers.pop(worker_id)
+            self.recycled += 1
+            if pending:
+                self._spawn_worker()
+
+    @staticmethod
+    def _print_result(result, done, total):
+        status = '✓' if not result['error'] else '❌'
+        rss = f", RSS {result['rss'] / MB:.0f} MB" if result['rss'] else ''
+        print(f"  [{done}/{total}] {status} {result['url'][:60]} "
+              f"({result['duration']:.1f}s, Worker {result['worker_id']}{rss})")
+        if result['error']:
+            print(f"        {result['error']}")
+        elif result.get('latency'):
+            print_latency(result['latency'])
+
+    def _print_summary(self, results, elapsed):
+        succeeded = sum(1 for r in results if not r['error'])
+        per_minute = succeeded / (elapsed / 60) if elapsed > 0 else 0
+        print(f"\n{'='*60}")
+        print(f"📊 ZUSAMMENFASSUNG")
+        print(f"{'='*60}")
+        print(f"  Boards: {succeeded} erfolgreich, {len(results) - succeeded} fehlgeschlagen")
+        print(f"  Gesamtdauer: {elapsed:.1f}s mit {self.worker_count} Workern")
+        print(f"  Durchsatz: {per_minute:.2f} Boards/Minute")
+        if results:
+            print(f"  Ø Dauer pro Board: {sum(r['duration'] for r in results) / len(results):.1f}s")
+        if self.peak_rss:
+            print(f"  Höchster Worker-RSS: {self.peak_rss / MB:.0f} MB")
+        print(f"  Recycelte Worker: {self.recycled}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export many Taskcard boards in parallel with a pool of worker processes'
+    )
+    parser.add_argument(
+        'job_file',
+        help="Text file with one board per line: URL [output name]"
+    )
+    parser.add_argument(
+        '-o', '--output-dir',
+        help='Directory for the exported boards (default: current directory)',
+        default='.'
+    )
+    parser.add_argument(
+        '-j', '--workers',
+        help='Number of worker processes, each with its own Chromium (default: number of CPU cores)',
+        type=int,
+        default=os.cpu_count() or 1
+    )
+    parser.add_argument(
+        '--max-rss-mb',
+        help='Recycle a worker once it (incl. Chromium) exceeds this RSS; also the free memory required to start a job',
+        type=int,
+        default=1500
+    )
+    parser.add_argument(
+        '--jobs-per-worker',
+        help='Recycle a worker after this many jobs (default: 20)',
+        type=int,
+        default=20
+    )
+    parser.add_argument(
+        '--format',
+        help='Output format per board',
+        choices=['pdf', 'json', 'html', 'markdown'],
+        default='pdf'
+    )
+    parser.add_argument(
+        '--no-attachments',
+        help='Do not include PDF attachments in the output',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--job-db',
+        help='SQLite job database, so an interrupted batch can be resumed',
+        default=None
+    )
+    parser.add_argument(
+        '--deadline',
+        metavar='SECONDS',
+        type=float,
+        help='Time limit per board; what cannot be downloaded in time is skipped, so no board holds a worker for long',
+        default=None
+    )
+
+    args = parser.parse_args()
+
+    jobs = read_job_list(args.job_file)
+    if not jobs:
+        print("Keine Boards in der Job-Datei gefunden.")
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    suffix = {'pdf': '.pdf', 'json': '.json', 'html': '.html', 'markdown': '.md'}[args.format]
+    used_names = {}
+    for index, job in enumerate(jobs):
+        job['index'] = index
+        name = job.pop('name') or f"board_{index + 1:04d}"
+        # Workers must never share an output file or attachments folder
+        # (lower case: Windows and macOS file names ignore case)
+        if name.lower() in used_names:
+            print(f"❌ Ausgabename doppelt: '{name}' (Zeile {used_names[name.lower()] + 1} und {index + 1} der Boards)")
+            sys.exit(1)
+        used_names[name.lower()] = index
+        # Append the suffix: with_suffix would cut "Mathe 7.a" down to "Mathe 7"
+        job['output_file'] = str(output_dir / f"{name}{suffix}")
+
+    options = {
+        'include_attachments': not args.no_attachments,
+        'output_format': args.format,
+        'max_rss': args.max_rss_mb * MB if args.max_rss_mb else None,
+        'jobs_per_worker': max(1, args.jobs_per_worker),
+        'job_db': args.job_db,
+        'deadline': args.deadline,
+    }
+
+    workers = max(1, min(args.workers, len(jobs)))
+    print(f"Starte {workers} Worker für {len(jobs)} Boards...")
+    results = WorkerFarm(workers, options).run(jobs)
+    sys.exit(0 if all(not r['error'] for r in results) else 1)
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()